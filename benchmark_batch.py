@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Compare per-record create/write tool calls with odoo_create_batch/odoo_write_batch."""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "odoo_mcp_server"))
+
+from fake_odoo import fake_odoo_env, start_fake_odoo
+
+
+async def timed(label: str, odoo, coro) -> dict:
+    rpcs_before = odoo.rpc_count
+    start = time.perf_counter()
+    await coro
+    elapsed = time.perf_counter() - start
+    result = {"path": label, "seconds": elapsed, "rpcs": odoo.rpc_count - rpcs_before}
+    print(f"{label:<28} {elapsed:>8.2f} s {result['rpcs']:>7} RPCs")
+    return result
+
+
+async def main(args):
+    httpd, url = start_fake_odoo(records=args.count, latency=args.latency)
+    os.environ.update(fake_odoo_env(url))
+
+    import main as odoo_main
+    server = odoo_main.OdooMCPServer()
+    await server._get_odoo_connection()
+    odoo = httpd.odoo
+
+    ids = list(range(1, args.count + 1))
+    # Price updates drawn from a small set of values, as in a price-list import
+    prices = [round(10 + (i % 20) * 0.5, 2) for i in ids]
+    new_records = [{"name": f"Imported {i}", "default_code": f"IMP{i:06d}"} for i in ids]
+
+    print(f"{args.count} records, fake Odoo latency {args.latency * 1000:.0f} ms/RPC, chunk size {args.chunk_size}")
+
+    async def per_record_writes():
+        for rid, price in zip(ids, prices):
+            await server._write_records("product.template", [rid], {"list_price": price})
+
+    async def per_record_creates():
+        for values in new_records:
+            await server._create_record("product.template", values)
+
+    updates = [{"ids": [rid], "values": {"list_price": price}} for rid, price in zip(ids, prices)]
+    await timed("write: per record", odoo, per_record_writes())
+    await timed("write: odoo_write_batch", odoo, server._write_batch("product.template", updates, args.chunk_size))
+    await timed("create: per record", odoo, per_record_creates())
+    await timed("create: odoo_create_batch", odoo, server._create_batch("product.template", new_records, args.chunk_size))
+    httpd.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=500, help="Records to create and update")
+    parser.add_argument("--latency", type=float, default=0.01, help="Seconds of latency per fake RPC")
+    parser.add_argument("--chunk-size", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
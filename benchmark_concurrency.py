@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Measure tool-call throughput as client concurrency grows, against a fake Odoo."""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "odoo_mcp_server"))
+
+from fake_odoo import fake_odoo_env, start_fake_odoo
+
+
+async def _probe_loop_lag(stop: asyncio.Event, samples: list):
+    """Record how late a 10ms sleep wakes up while RPCs are running."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        samples.append(time.perf_counter() - start - 0.01)
+
+
+async def run_level(server, concurrency: int, calls: int) -> dict:
+    queue = asyncio.Queue()
+    for i in range(calls):
+        queue.put_nowait(i)
+
+    async def worker():
+        while True:
+            try:
+                i = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await server._read_records("res.partner", [i % 100 + 1], ["name", "email"])
+
+    stop, lag = asyncio.Event(), []
+    probe = asyncio.create_task(_probe_loop_lag(stop, lag))
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe
+    return {
+        "concurrency": concurrency,
+        "calls": calls,
+        "seconds": elapsed,
+        "calls_per_second": calls / elapsed,
+        "max_loop_lag_ms": max(lag, default=0.0) * 1000,
+    }
+
+
+async def main(args):
+    httpd, url = start_fake_odoo(records=200, latency=args.latency)
+    os.environ.update(fake_odoo_env(url))
+    # Every call must reach Odoo: no record cache, no merged or shared reads
+    os.environ["ODOO_RECORD_CACHE_TTL"] = "0"
+    os.environ["ODOO_COALESCE"] = "false"
+    os.environ.setdefault("ODOO_MAX_CONCURRENCY", str(max(args.levels)))
+    os.environ.setdefault("ODOO_POOL_SIZE", str(max(args.levels)))
+
+    import main as odoo_main
+    server = odoo_main.OdooMCPServer()
+    await server._get_odoo_connection()
+
+    print(f"Fake Odoo latency: {args.latency * 1000:.0f} ms/RPC, "
+          f"server concurrency limit: {server.executor.max_concurrency}")
+    print(f"{'concurrency':>11} {'calls':>6} {'seconds':>8} {'calls/s':>8} {'loop lag ms':>12}")
+    for level in args.levels:
+        result = await run_level(server, level, args.calls)
+        print(f"{result['concurrency']:>11} {result['calls']:>6} {result['seconds']:>8.2f} "
+              f"{result['calls_per_second']:>8.1f} {result['max_loop_lag_ms']:>12.1f}")
+    httpd.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds of latency per fake RPC")
+    parser.add_argument("--calls", type=int, default=64, help="Tool calls per concurrency level")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""End-to-end benchmark: drive the MCP server over stdio against a fake Odoo.
+
+Runs a weighted mix of tool calls and reports p50/p95/p99 latency, Odoo RPCs
+per tool call and response size per tool. Results are written as JSON; pass a
+previous result file as --baseline to print the change.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from fake_odoo import fake_odoo_env, start_fake_odoo
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SERVER = os.path.join(ROOT, "odoo_mcp_server", "main.py")
+
+# Named workload mixes: tool -> weight
+MIXES = {
+    "mixed": "search:50,read:30,write:10,aggregate:10",
+    "read-heavy": "search:60,read:38,write:2",
+    "write-heavy": "search:20,read:20,write:60",
+}
+
+
+def parse_mix(spec: str) -> dict:
+    """Parse 'search:60,read:30,write:10' into {'search': 60, ...}."""
+    mix = {}
+    for item in filter(None, (part.strip() for part in MIXES.get(spec, spec).split(","))):
+        op, _, weight = item.partition(":")
+        if op not in OPERATIONS:
+            raise SystemExit(f"Unknown operation {op!r}, expected one of {', '.join(OPERATIONS)}")
+        mix[op] = float(weight or 1)
+    return mix
+
+
+def op_search(rng: random.Random, records: int) -> tuple:
+    return "odoo_search", {
+        "model": "res.partner",
+        "domain": [["name", "ilike", f"Partner {rng.randint(1, 99)}"]],
+        "fields": ["name", "email", "is_company"],
+        "limit": 20,
+    }
+
+
+def op_read(rng: random.Random, records: int) -> tuple:
+    # Reads cluster on a small hot set, as agents re-read the records they work on
+    hot = max(1, records // 20)
+    ids = sorted({rng.randint(1, hot) for _ in range(rng.randint(1, 5))})
+    return "odoo_read", {"model": "product.template", "ids": ids, "fields": ["name", "list_price", "default_code"]}
+
+
+def op_write(rng: random.Random, records: int) -> tuple:
+    return "odoo_write", {
+        "model": "product.template",
+        "ids": [rng.randint(1, records)],
+        "values": {"list_price": round(rng.uniform(1, 500), 2)},
+    }
+
+
+def op_aggregate(rng: random.Random, records: int) -> tuple:
+    return "odoo_aggregate", {
+        "model": "sale.order",
+        "domain": [["state", "=", rng.choice(["draft", "sent", "sale"])]],
+        "groupby": ["user_id", "date_order:month"],
+        "aggregates": ["amount_total:sum"],
+    }
+
+
+OPERATIONS = {"search": op_search, "read": op_read, "write": op_write, "aggregate": op_aggregate}
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def summarize(samples: list) -> dict:
+    latencies = [s["ms"] for s in samples]
+    sizes = [s["bytes"] for s in samples]
+    summary = {
+        "calls": len(samples),
+        "errors": sum(s["error"] for s in samples),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "mean_bytes": sum(sizes) / len(sizes),
+        "max_bytes": max(sizes),
+    }
+    rpcs = [s["rpcs"] for s in samples if s["rpcs"] is not None]
+    if rpcs:
+        summary["rpcs_per_call"] = sum(rpcs) / len(rpcs)
+    return summary
+
+
+async def run(args) -> dict:
+    httpd, url = start_fake_odoo(records=args.records, latency=args.latency, image_size=0)
+    odoo = httpd.odoo
+    env = {**os.environ, **fake_odoo_env(url)}
+    for item in args.env:
+        key, _, value = item.partition("=")
+        env[key] = value
+    mix = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+    ops = rng.choices(list(mix), weights=list(mix.values()), k=args.warmup + args.calls)
+    warmup, measured_ops = ops[:args.warmup], ops[args.warmup:]
+    samples = []
+
+    params = StdioServerParameters(command=sys.executable, args=[SERVER], env=env)
+    async with stdio_client(params) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            for op in warmup:
+                await session.call_tool(*OPERATIONS[op](rng, args.records))
+            queue = asyncio.Queue()
+            for op in measured_ops:
+                queue.put_nowait(op)
+
+            async def worker():
+                while not queue.empty():
+                    op = queue.get_nowait()
+                    tool, arguments = OPERATIONS[op](rng, args.records)
+                    rpcs_before = odoo.rpc_count
+                    start = time.perf_counter()
+                    result = await session.call_tool(tool, arguments)
+                    elapsed = (time.perf_counter() - start) * 1000
+                    text = "".join(c.text for c in result.content if getattr(c, "text", None))
+                    samples.append({
+                        "op": op,
+                        "ms": elapsed,
+                        "bytes": len(text.encode()),
+                        # RPCs can only be attributed to a call when calls do not overlap
+                        "rpcs": odoo.rpc_count - rpcs_before if args.concurrency == 1 else None,
+                        "error": bool(result.isError) or text.startswith(("Error:", '{"error"')),
+                    })
+
+            rpcs_before, bytes_before = odoo.rpc_count, odoo.bytes_sent
+            start = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+            wall = time.perf_counter() - start
+    httpd.shutdown()
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": {
+            "records": args.records, "latency": args.latency, "mix": mix, "calls": args.calls,
+            "concurrency": args.concurrency, "seed": args.seed, "env": args.env,
+        },
+        "throughput_calls_per_s": len(samples) / wall,
+        "odoo_rpcs": odoo.rpc_count - rpcs_before,
+        "odoo_bytes_sent": odoo.bytes_sent - bytes_before,
+        "overall": summarize(samples),
+        "tools": {op: summarize([s for s in samples if s["op"] == op]) for op in mix
+                  if any(s["op"] == op for s in samples)},
+    }
+
+
+def report(results: dict, baseline: dict = None):
+    config = results["config"]
+    print(f"{config['calls']} calls, mix {config['mix']}, concurrency {config['concurrency']}, "
+          f"{config['records']} records, fake Odoo latency {config['latency'] * 1000:.0f} ms/RPC")
+    print(f"{'tool':<10} {'calls':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'RPCs/call':>10} {'bytes':>9}")
+    rows = [*results["tools"].items(), ("overall", results["overall"])]
+    for name, stats in rows:
+        rpcs = stats.get("rpcs_per_call")
+        print(f"{name:<10} {stats['calls']:>6} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} "
+              f"{stats['p99_ms']:>9.2f} {'-' if rpcs is None else f'{rpcs:.2f}':>10} {stats['mean_bytes']:>9.0f}")
+        if stats["errors"]:
+            print(f"{'':<10} {stats['errors']} calls returned errors")
+    print(f"throughput {results['throughput_calls_per_s']:.1f} calls/s, "
+          f"{results['odoo_rpcs']} Odoo RPCs, {results['odoo_bytes_sent']:,} bytes from Odoo")
+
+    if baseline:
+        print("\nchange against baseline (negative is faster)")
+        for name, stats in rows:
+            before = baseline["overall"] if name == "overall" else baseline.get("tools", {}).get(name)
+            if not before:
+                continue
+            deltas = "  ".join(
+                f"{key[:-3]} {100 * (stats[key] - before[key]) / before[key]:+.1f}%"
+                for key in ("p50_ms", "p95_ms", "p99_ms") if before.get(key)
+            )
+            print(f"{name:<10} {deltas}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mix", default="mixed",
+                        help=f"Named mix ({', '.join(MIXES)}) or weights like 'search:60,read:30,write:10'")
+    parser.add_argument("--calls", type=int, default=500, help="Measured tool calls")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured calls before measuring")
+    parser.add_argument("--concurrency", type=int, default=1, help="Tool calls in flight at once")
+    parser.add_argument("--records", type=int, default=2000, help="Records per model in the fake Odoo")
+    parser.add_argument("--latency", type=float, default=0.01, help="Seconds of latency per fake RPC")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="Server setting for this run, e.g. --env ODOO_COALESCE=false (repeatable)")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to save the JSON results")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+    report(results, baseline)
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(results, handle, indent=2)
+    print(f"\nresults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
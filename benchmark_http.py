@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Load test: many MCP client sessions against one HTTP server, against a fake Odoo.
+
+Starts main.py with ODOO_MCP_TRANSPORT=http. For each concurrency level,
+clients open a session, initialize, make a few tool calls and close,
+with that many sessions in flight. The test reports sessions per second,
+initialize and tool-call latency, and Odoo RPCs per session. A short run of
+stdio sessions, one process each, is the baseline.
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import socket
+import sys
+import time
+import urllib.request
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.sse import sse_client
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamable_http_client
+
+from fake_odoo import fake_odoo_env, start_fake_odoo
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SERVER = os.path.join(ROOT, "odoo_mcp_server", "main.py")
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)] if ordered else 0.0
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def tool_call(rng: random.Random, records: int) -> tuple:
+    if rng.random() < 0.5:
+        return "odoo_search", {
+            "model": "res.partner",
+            "domain": [["name", "ilike", f"Partner {rng.randint(1, 99)}"]],
+            "fields": ["name", "email"],
+            "limit": 10,
+        }
+    ids = sorted({rng.randint(1, max(1, records // 10)) for _ in range(3)})
+    return "odoo_read", {"model": "product.template", "ids": ids, "fields": ["name", "list_price"]}
+
+
+async def run_session(connect, calls: int, rng: random.Random, records: int, stats: dict):
+    start = time.perf_counter()
+    async with connect() as streams:
+        async with ClientSession(streams[0], streams[1]) as session:
+            await session.initialize()
+            stats["init_ms"].append((time.perf_counter() - start) * 1000)
+            for _ in range(calls):
+                call_start = time.perf_counter()
+                result = await session.call_tool(*tool_call(rng, records))
+                stats["call_ms"].append((time.perf_counter() - call_start) * 1000)
+                stats["errors"] += bool(result.isError) or result.content[0].text.startswith(("Error:", '{"error"'))
+    stats["session_ms"].append((time.perf_counter() - start) * 1000)
+
+
+async def run_level(connect, sessions: int, concurrency: int, calls: int, rng: random.Random,
+                    records: int, odoo) -> dict:
+    stats = {"init_ms": [], "call_ms": [], "session_ms": [], "errors": 0}
+    queue = asyncio.Queue()
+    for _ in range(sessions):
+        queue.put_nowait(None)
+
+    async def client():
+        while not queue.empty():
+            queue.get_nowait()
+            await run_session(connect, calls, rng, records, stats)
+
+    rpcs_before = odoo.rpc_count
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+    return {
+        "concurrency": concurrency,
+        "sessions": sessions,
+        "sessions_per_s": sessions / wall,
+        "init_p50_ms": percentile(stats["init_ms"], 50),
+        "init_p95_ms": percentile(stats["init_ms"], 95),
+        "call_p50_ms": percentile(stats["call_ms"], 50),
+        "call_p95_ms": percentile(stats["call_ms"], 95),
+        "rpcs_per_session": (odoo.rpc_count - rpcs_before) / sessions,
+        "errors": stats["errors"],
+    }
+
+
+def print_row(label: str, result: dict):
+    print(f"{label:<18} {result['concurrency']:>5} {result['sessions']:>8} {result['sessions_per_s']:>10.1f} "
+          f"{result['init_p50_ms']:>9.1f} {result['init_p95_ms']:>9.1f} {result['call_p50_ms']:>9.1f} "
+          f"{result['call_p95_ms']:>9.1f} {result['rpcs_per_session']:>9.2f}"
+          + (f"  {result['errors']} errors" if result["errors"] else ""))
+
+
+async def main(args):
+    httpd, url = start_fake_odoo(records=args.records, latency=args.latency, image_size=0)
+    odoo = httpd.odoo
+    env = {**os.environ, **fake_odoo_env(url)}
+    for item in args.env:
+        key, _, value = item.partition("=")
+        env[key] = value
+    rng = random.Random(args.seed)
+
+    port = free_port()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, SERVER,
+        env={**env, "ODOO_MCP_TRANSPORT": "http", "ODOO_MCP_PORT": str(port)},
+    )
+    base = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(f"{base}/health", timeout=1).read()
+            break
+        except OSError:
+            await asyncio.sleep(0.1)
+    else:
+        raise SystemExit("HTTP server did not start")
+
+    print(f"fake Odoo latency {args.latency * 1000:.0f} ms/RPC, {args.calls} tool calls per session")
+    print(f"{'transport':<18} {'conc':>5} {'sessions':>8} {'sessions/s':>10} {'init p50':>9} {'init p95':>9} "
+          f"{'call p50':>9} {'call p95':>9} {'RPCs/sess':>9}")
+    try:
+        if args.stdio_sessions:
+            params = StdioServerParameters(command=sys.executable, args=[SERVER], env=env)
+            result = await run_level(lambda: stdio_client(params), args.stdio_sessions, 1,
+                                     args.calls, rng, args.records, odoo)
+            print_row("stdio (1 proc/ses)", result)
+        for level in args.levels:
+            result = await run_level(lambda: streamable_http_client(f"{base}/mcp"), max(args.sessions, level),
+                                     level, args.calls, rng, args.records, odoo)
+            print_row("streamable HTTP", result)
+        if args.sse:
+            level = max(args.levels)
+            result = await run_level(lambda: sse_client(f"{base}/sse"), max(args.sessions, level),
+                                     level, args.calls, rng, args.records, odoo)
+            print_row("SSE", result)
+    finally:
+        process.terminate()
+        await process.wait()
+        httpd.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 4, 16, 64],
+                        help="Client sessions in flight at once")
+    parser.add_argument("--sessions", type=int, default=64, help="Sessions per level (at least the level)")
+    parser.add_argument("--calls", type=int, default=5, help="Tool calls per session")
+    parser.add_argument("--stdio-sessions", type=int, default=5,
+                        help="Sequential stdio sessions for the baseline (0 skips it)")
+    parser.add_argument("--sse", action="store_true", help="Also run the highest level over SSE")
+    parser.add_argument("--records", type=int, default=1000, help="Records per model in the fake Odoo")
+    parser.add_argument("--latency", type=float, default=0.01, help="Seconds of latency per fake RPC")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="Server setting for this run, e.g. --env ODOO_MCP_SESSION_CONCURRENCY=1 (repeatable)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Compare odoo_search/odoo_read latency against Odoo with answers from the local SQLite mirror."""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "odoo_mcp_server"))
+
+from fake_odoo import fake_odoo_env, start_fake_odoo
+
+
+async def timed(label: str, odoo, calls: list) -> dict:
+    rpcs_before = odoo.rpc_count
+    latencies = []
+    for call in calls:
+        start = time.perf_counter()
+        result = await call()
+        latencies.append(time.perf_counter() - start)
+        if "error" in result:
+            raise RuntimeError(result["error"])
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+    rpcs = odoo.rpc_count - rpcs_before
+    print(f"{label:<24} p50 {p50:>8.3f} ms   p95 {p95:>8.3f} ms {rpcs:>6} RPCs")
+    return {"path": label, "p50_ms": p50, "p95_ms": p95, "rpcs": rpcs}
+
+
+async def main(args):
+    httpd, url = start_fake_odoo(records=args.records, latency=args.latency, image_size=0)
+    os.environ.update(fake_odoo_env(url))
+    os.environ["ODOO_MIRROR_MODELS"] = "product.template"
+    os.environ["ODOO_MIRROR_PATH"] = os.path.join(tempfile.mkdtemp(), "mirror.sqlite3")
+    os.environ["ODOO_MIRROR_INDEXES"] = "product.template:default_code"
+    os.environ["ODOO_RECORD_CACHE_TTL"] = "0"
+
+    import main as odoo_main
+    server = odoo_main.OdooMCPServer()
+    await server._get_odoo_connection()
+    odoo = httpd.odoo
+
+    print(f"{args.records} product.template records, fake Odoo latency {args.latency * 1000:.0f} ms/RPC, "
+          f"{args.calls} calls per path")
+    start = time.perf_counter()
+    rpcs_before = odoo.rpc_count
+    await server.mirror.sync("product.template")
+    print(f"{'initial sync':<24} {time.perf_counter() - start:>8.2f} s {odoo.rpc_count - rpcs_before:>21} RPCs")
+
+    codes = [f"P{i % args.records + 1:06d}" for i in range(args.calls)]
+    fields = ["name", "default_code", "list_price"]
+
+    def search(code, **kwargs):
+        return lambda: server._search_records("product.template", [["default_code", "=", code]], fields, 1, **kwargs)
+
+    def read(rid, **kwargs):
+        return lambda: server._read_records("product.template", [rid], fields, **kwargs)
+
+    await timed("search: Odoo", odoo, [search(code) for code in codes])
+    await timed("search: mirror", odoo, [search(code, max_staleness=3600) for code in codes])
+    await timed("read: Odoo", odoo, [read(i % args.records + 1) for i in range(args.calls)])
+    await timed("read: mirror", odoo, [read(i % args.records + 1, max_staleness=3600) for i in range(args.calls)])
+    server.mirror.close()
+    httpd.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=10000, help="Records in the mirrored model")
+    parser.add_argument("--calls", type=int, default=200, help="Calls per path")
+    parser.add_argument("--latency", type=float, default=0.1, help="Seconds of latency per fake RPC")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Compare one big odoo_read with chunked, parallel reads of the same id list."""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "odoo_mcp_server"))
+
+from fake_odoo import fake_odoo_env, start_fake_odoo
+
+FIELDS = ["name", "default_code", "list_price", "description", "description_sale", "write_date"]
+
+
+async def timed(label: str, odoo, coro, ids: list) -> dict:
+    rpcs_before, bytes_before = odoo.rpc_count, odoo.bytes_sent
+    start = time.perf_counter()
+    result = await coro
+    elapsed = time.perf_counter() - start
+    if "error" in result:
+        raise SystemExit(f"{label}: {result['error']}")
+    in_order = [record["id"] for record in result["records"]] == ids
+    rpcs = odoo.rpc_count - rpcs_before
+    per_response = (odoo.bytes_sent - bytes_before) / max(rpcs, 1) / 1e6
+    print(f"{label:<30} {elapsed:>8.2f} s {rpcs:>6} RPCs {per_response:>8.2f} MB/response"
+          + ("" if in_order else "  OUT OF ORDER"))
+    return {"path": label, "seconds": elapsed, "rpcs": rpcs}
+
+
+async def main(args):
+    httpd, url = start_fake_odoo(records=args.count, latency=args.latency, image_size=0)
+    os.environ.update(fake_odoo_env(url))
+    # Every run must reach Odoo, not the record cache
+    os.environ["ODOO_RECORD_CACHE_TTL"] = "0"
+    os.environ["ODOO_READ_PARALLEL"] = str(args.parallel)
+
+    import main as odoo_main
+    server = odoo_main.OdooMCPServer()
+    await server._get_odoo_connection()
+    odoo = httpd.odoo
+
+    ids = list(range(1, args.count + 1))
+    random.Random(1).shuffle(ids)
+    print(f"{args.count} ids, fake Odoo latency {args.latency * 1000:.0f} ms/RPC, "
+          f"chunk size {args.chunk_size}, {args.parallel} in flight")
+
+    await timed("one read call", odoo, server._read_records("product.template", ids, FIELDS,
+                                                              chunk_size=len(ids)), ids)
+    await timed("chunked", odoo, server._read_records("product.template", ids, FIELDS,
+                                                      chunk_size=args.chunk_size), ids)
+    odoo.fail_requests = 1
+    await timed("chunked, one chunk fails once", odoo,
+                server._read_records("product.template", ids, FIELDS, chunk_size=args.chunk_size), ids)
+    httpd.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=50000, help="Records to read")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds of latency per fake RPC")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--parallel", type=int, default=4, help="Chunks in flight at once")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Cold start benchmark: time from spawning main.py to its first responses, against a fake Odoo.
+
+Each run starts a fresh server process over stdio, the way the product
+editor's server.js and most MCP clients do, and records the time until the
+`initialize` response, the `tools/list` response and the first tool result.
+It also checks that no Odoo RPC is made before the first tool call.
+Starting a bare interpreter and importing the MCP SDK are timed as floors
+the server cannot go below.
+"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from fake_odoo import fake_odoo_env, start_fake_odoo
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SERVER = os.path.join(ROOT, "odoo_mcp_server", "main.py")
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)] if ordered else 0.0
+
+
+def request(process, message: dict) -> dict:
+    """Send a JSON-RPC message and wait for the response with the same id."""
+    process.stdin.write(json.dumps(message) + "\n")
+    process.stdin.flush()
+    while True:
+        line = process.stdout.readline()
+        if not line:
+            raise SystemExit(f"Server exited before answering {message['method']}")
+        reply = json.loads(line)
+        if reply.get("id") == message["id"]:
+            return reply
+
+
+def run_once(env: dict, odoo) -> dict:
+    rpcs_before = odoo.rpc_count
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, SERVER], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL, env=env, text=True)
+    try:
+        request(process, {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {
+            "protocolVersion": "2025-06-18", "capabilities": {},
+            "clientInfo": {"name": "benchmark-startup", "version": "1.0.0"},
+        }})
+        initialize = time.perf_counter() - start
+        process.stdin.write(json.dumps({"jsonrpc": "2.0", "method": "notifications/initialized"}) + "\n")
+        request(process, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        tools_list = time.perf_counter() - start
+        rpcs_before_call = odoo.rpc_count - rpcs_before
+        reply = request(process, {"jsonrpc": "2.0", "id": 3, "method": "tools/call", "params": {
+            "name": "odoo_read",
+            "arguments": {"model": "res.partner", "ids": [1, 2, 3], "fields": ["name", "email"]},
+        }})
+        first_call = time.perf_counter() - start
+        if reply.get("error") or reply["result"].get("isError"):
+            raise SystemExit(f"Tool call failed: {reply}")
+    finally:
+        process.stdin.close()
+        process.wait()
+    return {"initialize": initialize, "tools_list": tools_list, "first_call": first_call,
+            "rpcs_before_call": rpcs_before_call}
+
+
+def time_command(code: str, runs: int) -> list:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def print_row(label: str, samples: list):
+    ms = [s * 1000 for s in samples]
+    print(f"{label:<32} {min(ms):>8.1f} {statistics.median(ms):>8.1f} {percentile(ms, 95):>8.1f}")
+
+
+def main(args):
+    httpd, url = start_fake_odoo(records=args.records, latency=args.latency, image_size=0)
+    env = {**os.environ, **fake_odoo_env(url)}
+    for item in args.env:
+        key, _, value = item.partition("=")
+        env[key] = value
+
+    runs = [run_once(env, httpd.odoo) for _ in range(args.runs)]
+    print(f"{args.runs} cold starts, fake Odoo latency {args.latency * 1000:.0f} ms/RPC")
+    print(f"{'':<32} {'min ms':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    print_row("python -c pass", time_command("pass", args.runs))
+    print_row("import mcp.server (SDK floor)", time_command("import mcp.server, mcp.server.stdio", args.runs))
+    print_row("initialize response", [r["initialize"] for r in runs])
+    print_row("tools/list response", [r["tools_list"] for r in runs])
+    print_row("first tool result", [r["first_call"] for r in runs])
+    early = max(r["rpcs_before_call"] for r in runs)
+    print(f"Odoo RPCs before the first tool call: {early}")
+    httpd.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="Cold starts to time")
+    parser.add_argument("--records", type=int, default=100, help="Records per model in the fake Odoo")
+    parser.add_argument("--latency", type=float, default=0.01, help="Seconds of latency per fake RPC")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="Server setting for this run (repeatable)")
+    main(parser.parse_args())
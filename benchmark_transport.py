@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Compare the XML-RPC and JSON-RPC transports on a large search_read against a fake Odoo."""
+
+import argparse
+import gzip
+import http.client
+import json
+import os
+import statistics
+import sys
+import time
+import xmlrpc.client
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "odoo_mcp_server"))
+
+import serialization
+from fake_odoo import FAKE_DB, FAKE_PASSWORD, FAKE_UID, FAKE_USERNAME, start_fake_odoo
+from transports import make_transport
+
+FIELDS = ["name", "default_code", "list_price", "description", "active", "write_date"]
+
+
+def raw_body(url: str, transport: str, rows: int) -> bytes:
+    """Fetch the undecoded response body of the benchmark query."""
+    args = (FAKE_DB, FAKE_UID, FAKE_PASSWORD, "product.template", "search_read", [[]],
+            {"fields": FIELDS, "limit": rows})
+    if transport == "xmlrpc":
+        path, body = "/xmlrpc/2/object", xmlrpc.client.dumps(args, "execute_kw").encode()
+    else:
+        path = "/jsonrpc"
+        body = json.dumps({"jsonrpc": "2.0", "method": "call", "id": 1, "params": {
+            "service": "object", "method": "execute_kw", "args": list(args)}}).encode()
+    conn = http.client.HTTPConnection(url.split("://", 1)[1])
+    conn.request("POST", path, body=body, headers={"Accept-Encoding": "gzip"})
+    response = conn.getresponse()
+    data = response.read()
+    conn.close()
+    return gzip.decompress(data) if response.getheader("Content-Encoding") == "gzip" else data
+
+
+def parse(transport: str, body: bytes):
+    if transport == "xmlrpc":
+        return xmlrpc.client.loads(body)[0][0]
+    return serialization.loads(body)["result"]
+
+
+def bench(httpd, url: str, name: str, rows: int, repeat: int) -> dict:
+    transport = make_transport(name, url)
+    uid = transport.authenticate(FAKE_DB, FAKE_USERNAME, FAKE_PASSWORD)
+
+    def call():
+        return transport.execute_kw(FAKE_DB, uid, FAKE_PASSWORD, "product.template", "search_read",
+                                    [[]], {"fields": FIELDS, "limit": rows})
+
+    call()  # warm up the connection
+    totals, wire = [], []
+    for _ in range(repeat):
+        sent_before = httpd.odoo.bytes_sent
+        start = time.perf_counter()
+        records = call()
+        totals.append(time.perf_counter() - start)
+        wire.append(httpd.odoo.bytes_sent - sent_before)
+    assert len(records) == rows
+
+    body = raw_body(url, name, rows)
+    parse_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(name, body)
+        parse_times.append(time.perf_counter() - start)
+    transport.close()
+    return {
+        "transport": name,
+        "rows": rows,
+        "call_ms": statistics.median(totals) * 1000,
+        "parse_ms": statistics.median(parse_times) * 1000,
+        "wire_bytes": int(statistics.median(wire)),
+        "payload_bytes": len(body),
+    }
+
+
+def main(args):
+    httpd, url = start_fake_odoo(records=args.rows, compress=not args.no_gzip, image_size=0)
+    print(f"search_read of {args.rows} product.template rows, {len(FIELDS)} fields, "
+          f"gzip {'off' if args.no_gzip else 'on'}, median of {args.repeat} runs"
+          f" (JSON parser: {'orjson' if serialization.orjson else 'json'})")
+    print(f"{'transport':<10} {'call ms':>9} {'parse ms':>9} {'wire bytes':>12} {'payload bytes':>14}")
+    for name in ("xmlrpc", "jsonrpc"):
+        result = bench(httpd, url, name, args.rows, args.repeat)
+        print(f"{result['transport']:<10} {result['call_ms']:>9.1f} {result['parse_ms']:>9.1f} "
+              f"{result['wire_bytes']:>12,} {result['payload_bytes']:>14,}")
+    httpd.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-gzip", action="store_true", help="Serve uncompressed responses")
+    main(parser.parse_args())
@@ -0,0 +1,641 @@
+#!/usr/bin/env python3
+"""In-process stand-in for an Odoo instance, used by the benchmark scripts.
+
+Serves /xmlrpc/2/common, /xmlrpc/2/object and /jsonrpc over keep-alive
+HTTP/1.1 with a configurable per-call latency and a generated in-memory
+dataset.
+"""
+
+import argparse
+import base64
+import gzip
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import xmlrpc.client
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FAKE_DB = "fake"
+FAKE_USERNAME = "admin"
+FAKE_PASSWORD = "admin"
+FAKE_UID = 2
+
+# field name -> (type, relation or None)
+MODEL_FIELDS = {
+    "res.users": {
+        "name": ("char", None),
+        "login": ("char", None),
+    },
+    "res.partner": {
+        "name": ("char", None),
+        "email": ("char", None),
+        "is_company": ("boolean", None),
+        "user_id": ("many2one", "res.users"),
+    },
+    "product.template": {
+        "name": ("char", None),
+        "default_code": ("char", None),
+        "list_price": ("float", None),
+        "description": ("text", None),
+        "description_sale": ("html", None),
+        "image_1920": ("binary", None),
+        "active": ("boolean", None),
+    },
+    "sale.order": {
+        "name": ("char", None),
+        "partner_id": ("many2one", "res.partner"),
+        "user_id": ("many2one", "res.users"),
+        "date_order": ("datetime", None),
+        "amount_total": ("float", None),
+        "state": ("selection", None),
+        "order_line": ("one2many", "sale.order.line"),
+    },
+    "sale.order.line": {
+        "order_id": ("many2one", "sale.order"),
+        "product_id": ("many2one", "product.template"),
+        "product_uom_qty": ("float", None),
+        "price_unit": ("float", None),
+    },
+    "ir.attachment": {
+        "name": ("char", None),
+        "res_model": ("char", None),
+        "res_field": ("char", None),
+        "res_id": ("integer", None),
+        "mimetype": ("char", None),
+        "file_size": ("integer", None),
+        "checksum": ("char", None),
+        "datas": ("binary", None),
+    },
+    "ir.model": {
+        "model": ("char", None),
+        "name": ("char", None),
+        "order": ("char", None),
+    },
+    "ir.model.fields": {
+        "model": ("char", None),
+        "name": ("char", None),
+        "ttype": ("char", None),
+    },
+}
+for _fields in MODEL_FIELDS.values():
+    _fields.update({
+        "id": ("integer", None),
+        "create_date": ("datetime", None),
+        "write_date": ("datetime", None),
+        "display_name": ("char", None),
+    })
+
+
+SALESPEOPLE = 4
+LINES_PER_ORDER = 2
+ORDER_STATES = ("draft", "sent", "sale", "cancel")
+NUMERIC_TYPES = ("integer", "float", "monetary")
+# read_group aggregate spec: "field", "field:func" or "alias:func(field)"
+AGGREGATE_SPEC = re.compile(r"(\w+)(?::(\w+)(?:\((\w+)\))?)?")
+
+
+def _now() -> str:
+    return _timestamp(datetime.utcnow())
+
+
+def _timestamp(when: datetime) -> str:
+    """Stored form of a datetime: like PostgreSQL, keep microseconds; read() returns whole seconds."""
+    return when.strftime("%Y-%m-%d %H:%M:%S.%f" if when.microsecond else "%Y-%m-%d %H:%M:%S")
+
+
+def _date_group(value: str, granularity: str) -> tuple:
+    """Return (start, end, label) of the period containing a date or datetime string."""
+    moment = datetime.strptime(value[:10], "%Y-%m-%d")
+    if granularity == "day":
+        start, end = moment, moment + timedelta(days=1)
+        label = start.strftime("%d %b %Y")
+    elif granularity == "week":
+        start = moment - timedelta(days=moment.weekday())
+        end = start + timedelta(days=7)
+        label = f"W{start.isocalendar()[1]} {start.isocalendar()[0]}"
+    elif granularity == "quarter":
+        quarter = (moment.month - 1) // 3
+        start = moment.replace(month=quarter * 3 + 1, day=1)
+        end = start.replace(year=start.year + 1, month=1) if quarter == 3 else start.replace(month=start.month + 3)
+        label = f"Q{quarter + 1} {start.year}"
+    elif granularity == "year":
+        start = moment.replace(month=1, day=1)
+        end = start.replace(year=start.year + 1)
+        label = str(start.year)
+    else:
+        start = moment.replace(day=1)
+        end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+        label = start.strftime("%B %Y")
+    return start.strftime("%Y-%m-%d %H:%M:%S"), end.strftime("%Y-%m-%d %H:%M:%S"), label
+
+
+class FakeOdoo:
+    """In-memory Odoo data model answering a subset of the ORM API."""
+
+    def __init__(self, records: int = 1000, latency: float = 0.0, seed: int = 42, image_size: int = 16384):
+        self.image_size = image_size
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.data = {model: {} for model in MODEL_FIELDS}
+        self.rpc_count = 0
+        self.bytes_sent = 0
+        self.calls = {}
+        # Object calls still to be failed with HTTP 502
+        self.fail_requests = 0
+        self._populate(records, random.Random(seed))
+
+    def _populate(self, records: int, rng: random.Random):
+        base = datetime(2024, 1, 1)
+        self.data["res.users"][FAKE_UID] = self._stamp({
+            "id": FAKE_UID, "name": "Administrator", "login": FAKE_USERNAME,
+        }, base)
+        for uid in range(FAKE_UID + 1, FAKE_UID + SALESPEOPLE):
+            self.data["res.users"][uid] = self._stamp({
+                "id": uid, "name": f"Salesperson {uid}", "login": f"sales{uid}",
+            }, base)
+        field_id = 0
+        for model_id, (model, spec) in enumerate(MODEL_FIELDS.items(), 1):
+            self.data["ir.model"][model_id] = self._stamp({
+                "id": model_id, "model": model, "name": model.replace(".", " ").title(),
+                # The fake sorts every model by id when no order is given
+                "order": "id",
+            }, base)
+            for name, (ftype, _relation) in spec.items():
+                field_id += 1
+                self.data["ir.model.fields"][field_id] = self._stamp({
+                    "id": field_id, "model": model, "name": name, "ttype": ftype,
+                }, base)
+        for i in range(1, records + 1):
+            stamp = base + timedelta(minutes=i, microseconds=i * 7919 % 1000000)
+            self.data["res.partner"][i] = self._stamp({
+                "id": i,
+                "name": f"Partner {i}",
+                "email": f"partner{i}@example.com",
+                "is_company": i % 3 == 0,
+                "user_id": FAKE_UID,
+            }, stamp)
+            self.data["product.template"][i] = self._stamp({
+                "id": i,
+                "name": f"Product {i}",
+                "default_code": f"P{i:06d}",
+                "list_price": round(rng.uniform(1, 500), 2),
+                "description": f"Description of product {i}",
+                "description_sale": f"<p>Sales description of <b>product {i}</b></p>",
+                "active": True,
+            }, stamp)
+            self.data["sale.order"][i] = self._stamp({
+                "id": i,
+                "name": f"S{i:05d}",
+                "partner_id": rng.randint(1, i),
+                "user_id": FAKE_UID + i % SALESPEOPLE,
+                "date_order": (base + timedelta(hours=7 * i)).strftime("%Y-%m-%d %H:%M:%S"),
+                "amount_total": round(rng.uniform(10, 5000), 2),
+                "state": ORDER_STATES[i % len(ORDER_STATES)],
+                "order_line": [],
+            }, stamp)
+            for _line in range(LINES_PER_ORDER):
+                line_id = len(self.data["sale.order.line"]) + 1
+                self.data["sale.order.line"][line_id] = self._stamp({
+                    "id": line_id,
+                    "order_id": i,
+                    "product_id": rng.randint(1, i),
+                    "product_uom_qty": float(rng.randint(1, 10)),
+                    "price_unit": round(rng.uniform(1, 500), 2),
+                }, stamp)
+                self.data["sale.order"][i]["order_line"].append(line_id)
+            if i % 2 and self.image_size:
+                self._attach("product.template", i, "image_1920", rng.randbytes(self.image_size), stamp)
+
+    def _attach(self, model: str, res_id: int, field: str, content: bytes, when: datetime):
+        """Store binary content as an ir.attachment, the way attachment=True fields are."""
+        table = self.data["ir.attachment"]
+        att_id = len(table) + 1
+        datas = base64.b64encode(content).decode()
+        table[att_id] = self._stamp({
+            "id": att_id, "name": field, "res_model": model, "res_field": field, "res_id": res_id,
+            "mimetype": "image/png", "file_size": len(content),
+            "checksum": hashlib.sha1(content).hexdigest(), "datas": datas,
+        }, when)
+        self.data[model][res_id][field] = datas
+
+    def _stamp(self, record: dict, when: datetime) -> dict:
+        record["create_date"] = record["write_date"] = _timestamp(when)
+        record["display_name"] = record.get("name", "")
+        return record
+
+    # -- ORM helpers --------------------------------------------------------
+
+    def _table(self, model: str) -> dict:
+        if model not in self.data:
+            raise xmlrpc.client.Fault(2, f"Object {model} doesn't exist")
+        return self.data[model]
+
+    def _match(self, record: dict, domain: list) -> bool:
+        stack = []
+        for term in reversed(domain):
+            if term == "!":
+                stack.append(not stack.pop())
+            elif term == "&":
+                a, b = stack.pop(), stack.pop()
+                stack.append(a and b)
+            elif term == "|":
+                a, b = stack.pop(), stack.pop()
+                stack.append(a or b)
+            else:
+                stack.append(self._match_term(record, term))
+        return all(stack)
+
+    def _match_term(self, record: dict, term) -> bool:
+        field, op, value = term
+        current = record.get(field, False)
+        if isinstance(current, (list, tuple)) and len(current) == 2:
+            current = current[0]
+        if op in ("=", "=="):
+            return current == value
+        if op in ("!=", "<>"):
+            return current != value
+        if op == ">":
+            return current > value
+        if op == ">=":
+            return current >= value
+        if op == "<":
+            return current < value
+        if op == "<=":
+            return current <= value
+        if op == "in":
+            return current in value
+        if op == "not in":
+            return current not in value
+        if op in ("like", "ilike", "not like", "not ilike"):
+            haystack, needle = str(current or ""), str(value)
+            if op.endswith("ilike"):
+                haystack, needle = haystack.lower(), needle.lower()
+            if op.startswith("not"):
+                return not current or needle not in haystack
+            return bool(current) and needle in haystack
+        if op in ("=like", "=ilike"):
+            haystack, pattern = str(current or ""), str(value)
+            if op == "=ilike":
+                haystack, pattern = haystack.lower(), pattern.lower()
+            if pattern.endswith("%"):
+                return haystack.startswith(pattern[:-1])
+            return haystack == pattern
+        raise xmlrpc.client.Fault(1, f"Invalid operator {op!r}")
+
+    def _search(self, model: str, domain: list, offset: int = 0, limit=None, order=None) -> list:
+        table = self._table(model)
+        rows = [r for r in table.values() if self._match(r, domain)]
+        if "active" in MODEL_FIELDS[model] and not any(
+                isinstance(term, (list, tuple)) and term[0] == "active" for term in domain):
+            rows = [r for r in rows if r.get("active", True)]
+        for part in reversed((order or "id").split(",")):
+            bits = part.strip().split()
+            if not bits:
+                continue
+            reverse = len(bits) > 1 and bits[1].lower() == "desc"
+            rows.sort(key=lambda r, f=bits[0]: (r.get(f) is False, r.get(f)), reverse=reverse)
+        rows = rows[offset:]
+        if limit:
+            rows = rows[:limit]
+        return [r["id"] for r in rows]
+
+    def _read(self, model: str, ids, fields=None) -> list:
+        table = self._table(model)
+        if isinstance(ids, int):
+            ids = [ids]
+        spec = MODEL_FIELDS[model]
+        fields = fields or list(spec)
+        out = []
+        for rid in ids:
+            if rid not in table:
+                raise xmlrpc.client.Fault(2, f"Record does not exist or has been deleted. ({model}({rid},))")
+            record = table[rid]
+            row = {"id": rid}
+            for f in fields:
+                if f not in spec:
+                    raise xmlrpc.client.Fault(2, f"Invalid field {f!r} on model {model!r}")
+                value = record.get(f, False)
+                ftype, relation = spec[f]
+                if ftype == "many2one" and value:
+                    value = [value, self.data[relation][value].get("display_name", "")]
+                elif ftype == "datetime" and value:
+                    value = value[:19]
+                row[f] = value
+            out.append(row)
+        return out
+
+    def _read_group(self, model: str, domain: list, fields: list, groupby, offset: int = 0, limit=None,
+                    orderby=None, lazy: bool = True) -> list:
+        spec = MODEL_FIELDS[model]
+        table = self._table(model)
+        groupby = [groupby] if isinstance(groupby, str) else list(groupby or [])
+        if lazy:
+            groupby, remaining = groupby[:1], groupby[1:]
+        group_specs = []
+        for item in groupby:
+            name, _, granularity = item.partition(":")
+            if name not in spec:
+                raise xmlrpc.client.Fault(2, f"Invalid field {name!r} on model {model!r}")
+            if spec[name][0] in ("date", "datetime"):
+                granularity = granularity or "month"
+            group_specs.append((item, name, granularity))
+        group_names = {name for _, name, _ in group_specs}
+
+        aggregates = []
+        for item in fields or []:
+            match = AGGREGATE_SPEC.fullmatch(item)
+            if not match:
+                raise xmlrpc.client.Fault(2, f"Invalid field specification {item!r}")
+            key, func, field = match.groups()
+            field = field or key
+            if field not in spec:
+                raise xmlrpc.client.Fault(2, f"Invalid field {field!r} on model {model!r}")
+            if field in group_names or field == "id":
+                continue
+            if not func:
+                if spec[field][0] not in NUMERIC_TYPES:
+                    continue
+                func = "sum"
+            aggregates.append((key, func, field))
+
+        groups = {}
+        for rid in self._search(model, domain):
+            record = table[rid]
+            key, values, terms = [], {}, []
+            for item, name, granularity in group_specs:
+                value = record.get(name, False)
+                if granularity and value:
+                    start, end, label = _date_group(value, granularity)
+                    key.append(start)
+                    values[item] = label
+                    terms += [[name, ">=", start], [name, "<", end]]
+                elif spec[name][0] == "many2one" and value:
+                    key.append(value)
+                    values[item] = [value, self.data[spec[name][1]][value].get("display_name", "")]
+                    terms.append([name, "=", value])
+                else:
+                    key.append(value)
+                    values[item] = value
+                    terms.append([name, "=", value])
+            group = groups.setdefault(tuple(key), {"values": values, "terms": terms, "records": []})
+            group["records"].append(record)
+
+        count_key = f"{groupby[0].partition(':')[0]}_count" if lazy and groupby else "__count"
+        rows = []
+        for sort_key in sorted(groups, key=lambda k: [(v is False, v) for v in k]):
+            group = groups[sort_key]
+            row = dict(group["values"])
+            row[count_key] = len(group["records"])
+            for key, func, field in aggregates:
+                row[key] = self._aggregate(func, [r.get(field, False) for r in group["records"]])
+            row["__domain"] = group["terms"] + list(domain)
+            if lazy and remaining:
+                row["__context"] = {"group_by": remaining}
+            rows.append(row)
+        for part in reversed((orderby or "").split(",")):
+            bits = part.strip().split()
+            if bits:
+                reverse = len(bits) > 1 and bits[1].lower() == "desc"
+                rows.sort(key=lambda r, f=bits[0]: (r.get(f) is False, r.get(f)), reverse=reverse)
+        rows = rows[offset:]
+        return rows[:limit] if limit else rows
+
+    def _aggregate(self, func: str, values: list):
+        present = [v for v in values if v is not False and v is not None]
+        if func == "sum":
+            return sum(present)
+        if func == "avg":
+            return sum(present) / len(present) if present else False
+        if func == "min":
+            return min(present, default=False)
+        if func == "max":
+            return max(present, default=False)
+        if func == "count":
+            return len(present)
+        if func == "count_distinct":
+            return len(set(present))
+        if func == "array_agg":
+            return values
+        if func == "bool_and":
+            return all(values)
+        if func == "bool_or":
+            return any(values)
+        raise xmlrpc.client.Fault(2, f"Invalid aggregation function {func!r}")
+
+    def _check_fields(self, model: str, vals: dict):
+        unknown = [f for f in vals if f not in MODEL_FIELDS[model]]
+        if unknown:
+            raise xmlrpc.client.Fault(1, f"Invalid field {unknown[0]!r} on model {model!r}")
+
+    def _fields_get(self, model: str, attributes=None) -> dict:
+        spec = MODEL_FIELDS[model]
+        result = {}
+        for name, (ftype, relation) in spec.items():
+            info = {"type": ftype, "string": name.replace("_", " ").title(), "store": True}
+            if relation:
+                info["relation"] = relation
+            if attributes:
+                info = {k: v for k, v in info.items() if k in attributes}
+            result[name] = info
+        return result
+
+    # -- RPC dispatch -------------------------------------------------------
+
+    def common(self, method: str, params: tuple):
+        if method == "version":
+            return {"server_version": "17.0", "server_version_info": [17, 0, 0, "final", 0, ""]}
+        if method in ("authenticate", "login"):
+            db, login, password = params[:3]
+            return FAKE_UID if (db, login, password) == (FAKE_DB, FAKE_USERNAME, FAKE_PASSWORD) else False
+        raise xmlrpc.client.Fault(1, f"Unknown method {method}")
+
+    def object(self, method: str, params: tuple):
+        if method not in ("execute_kw", "execute"):
+            raise xmlrpc.client.Fault(1, f"Unknown method {method}")
+        db, uid, password, model, orm_method = params[:5]
+        args = list(params[5]) if len(params) > 5 else []
+        kwargs = dict(params[6]) if len(params) > 6 and method == "execute_kw" else {}
+        if (db, uid, password) != (FAKE_DB, FAKE_UID, FAKE_PASSWORD):
+            raise xmlrpc.client.Fault(3, "Access Denied")
+        with self.lock:
+            key = f"{model}.{orm_method}"
+            self.calls[key] = self.calls.get(key, 0) + 1
+            return self.execute(model, orm_method, args, kwargs)
+
+    def execute(self, model: str, method: str, args: list, kwargs: dict):
+        if method == "search":
+            domain = args[0] if args else kwargs.get("domain", [])
+            return self._search(model, domain, kwargs.get("offset", 0), kwargs.get("limit"), kwargs.get("order"))
+        if method == "search_count":
+            domain = args[0] if args else kwargs.get("domain", [])
+            return len(self._search(model, domain))
+        if method == "read":
+            return self._read(model, args[0], args[1] if len(args) > 1 else kwargs.get("fields"))
+        if method == "search_read":
+            domain = args[0] if args else kwargs.get("domain", [])
+            ids = self._search(model, domain, kwargs.get("offset", 0), kwargs.get("limit"), kwargs.get("order"))
+            return self._read(model, ids, kwargs.get("fields"))
+        if method == "read_group":
+            names = ("domain", "fields", "groupby", "offset", "limit", "orderby", "lazy")
+            params = dict(zip(names, args), **kwargs)
+            params.setdefault("domain", [])
+            params.setdefault("fields", [])
+            params.setdefault("groupby", [])
+            return self._read_group(model, **params)
+        if method == "fields_get":
+            return self._fields_get(model, kwargs.get("attributes"))
+        if method == "create":
+            table = self._table(model)
+            vals_list = args[0] if isinstance(args[0], list) else [args[0]]
+            for vals in vals_list:
+                self._check_fields(model, vals)
+            new_ids = []
+            for vals in vals_list:
+                rid = max(table, default=0) + 1
+                table[rid] = self._stamp(dict(vals, id=rid), datetime.utcnow())
+                new_ids.append(rid)
+            return new_ids if isinstance(args[0], list) else new_ids[0]
+        if method == "write":
+            table = self._table(model)
+            ids, vals = args[0], args[1]
+            ids = [ids] if isinstance(ids, int) else ids
+            self._check_fields(model, vals)
+            missing = [rid for rid in ids if rid not in table]
+            if missing:
+                raise xmlrpc.client.Fault(2, f"Record does not exist or has been deleted. ({model}{tuple(missing)})")
+            for rid in ids:
+                table[rid].update(vals)
+                table[rid]["write_date"] = _now()
+                table[rid]["display_name"] = table[rid].get("name", "")
+            return True
+        if method == "unlink":
+            table = self._table(model)
+            for rid in args[0]:
+                table.pop(rid, None)
+            return True
+        if method == "name_search":
+            names = ("name", "args", "operator", "limit")
+            params = dict(zip(names, args), **kwargs)
+            domain = list(params.get("args") or [])
+            if params.get("name"):
+                domain.append(["name", params.get("operator", "ilike"), params["name"]])
+            ids = self._search(model, domain, limit=params.get("limit", 100))
+            return [[rid, self.data[model][rid].get("display_name", "")] for rid in ids]
+        if method == "default_get":
+            fields = args[0] if args else kwargs.get("fields_list", [])
+            return {f: False for f in fields if f in MODEL_FIELDS[model] and MODEL_FIELDS[model][f][0] == "boolean"}
+        if method == "action_confirm" and model == "sale.order":
+            return self.execute(model, "write", [args[0], {"state": "sale"}], {})
+        raise xmlrpc.client.Fault(1, f"Method {method} not supported on {model}")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        odoo = self.server.odoo
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if odoo.latency:
+            time.sleep(odoo.latency)
+        path = self.path.rstrip("/")
+        with odoo.lock:
+            failing = odoo.fail_requests > 0 and not path.endswith("/common")
+            odoo.fail_requests -= failing
+        if failing:
+            # What a reverse proxy answers when Odoo is too slow
+            self.send_error(502)
+            return
+        if path.endswith("/jsonrpc"):
+            data, content_type = self._jsonrpc(odoo, body), "application/json"
+        elif path.endswith("/xmlrpc/2/common") or path.endswith("/xmlrpc/2/object"):
+            data, content_type = self._xmlrpc(odoo, path, body), "text/xml"
+        else:
+            self.send_error(404)
+            return
+        gzipped = self.server.compress and "gzip" in self.headers.get("Accept-Encoding", "")
+        if gzipped:
+            data = gzip.compress(data, compresslevel=5)
+        with odoo.lock:
+            odoo.rpc_count += 1
+            odoo.bytes_sent += len(data)
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _xmlrpc(self, odoo: FakeOdoo, path: str, body: bytes) -> bytes:
+        try:
+            params, method = xmlrpc.client.loads(body)
+            service = odoo.common if path.endswith("/common") else odoo.object
+            payload = xmlrpc.client.dumps((service(method, params),), methodresponse=True, allow_none=True)
+        except xmlrpc.client.Fault as fault:
+            payload = xmlrpc.client.dumps(fault, allow_none=True)
+        except Exception as e:
+            payload = xmlrpc.client.dumps(xmlrpc.client.Fault(1, str(e)), allow_none=True)
+        return payload.encode("utf-8")
+
+    def _jsonrpc(self, odoo: FakeOdoo, body: bytes) -> bytes:
+        request = json.loads(body)
+        params = request.get("params", {})
+        try:
+            service = odoo.common if params.get("service") == "common" else odoo.object
+            reply = {"result": service(params.get("method"), tuple(params.get("args", [])))}
+        except Exception as e:
+            code, message = (e.faultCode, e.faultString) if isinstance(e, xmlrpc.client.Fault) else (1, str(e))
+            name = "odoo.exceptions.AccessDenied" if code == 3 else "odoo.exceptions.UserError"
+            reply = {"error": {"code": 200, "message": "Odoo Server Error",
+                               "data": {"name": name, "message": message}}}
+        return json.dumps({"jsonrpc": "2.0", "id": request.get("id"), **reply}).encode("utf-8")
+
+
+def start_fake_odoo(host: str = "127.0.0.1", port: int = 0, records: int = 1000, latency: float = 0.0,
+                    compress: bool = False, image_size: int = 16384):
+    """Start a fake Odoo in a background thread and return (server, url).
+
+    With compress=True responses are gzipped for clients that accept it, as a
+    reverse proxy in front of Odoo typically does.
+    """
+    httpd = ThreadingHTTPServer((host, port), _Handler)
+    httpd.daemon_threads = True
+    httpd.compress = compress
+    httpd.odoo = FakeOdoo(records=records, latency=latency, image_size=image_size)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    return httpd, f"http://{host}:{httpd.server_address[1]}"
+
+
+def fake_odoo_env(url: str) -> dict:
+    """Environment variables pointing odoo_mcp_server at a fake Odoo."""
+    return {
+        "ODOO_URL": url,
+        "ODOO_DB": FAKE_DB,
+        "ODOO_USERNAME": FAKE_USERNAME,
+        "ODOO_PASSWORD": FAKE_PASSWORD,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a fake Odoo XML-RPC server")
+    parser.add_argument("--port", type=int, default=8069)
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of latency added to every RPC")
+    parser.add_argument("--gzip", action="store_true", help="Gzip responses for clients that accept it")
+    args = parser.parse_args()
+    httpd, url = start_fake_odoo(port=args.port, records=args.records, latency=args.latency, compress=args.gzip)
+    print(f"Fake Odoo listening on {url} (db={FAKE_DB}, login={FAKE_USERNAME}, password={FAKE_PASSWORD})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        httpd.shutdown()
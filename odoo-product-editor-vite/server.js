@@ -25,8 +25,94 @@ app.use((req, res, next) => {
 })
 
 // MCP Server communication
+// With MCP_SERVER_URL set (e.g. http://127.0.0.1:8808/mcp) requests go to a shared
+// HTTP MCP server instead of a Python child process started by this bridge
+const MCP_SERVER_URL = process.env.MCP_SERVER_URL
+// Bearer token of the HTTP MCP server (its ODOO_MCP_AUTH_TOKEN)
+const MCP_SERVER_TOKEN = process.env.MCP_SERVER_TOKEN
 let mcpProcess = null
 let isInitialized = false
+let mcpSessionId = null
+
+const postToMCPServer = async (message) => {
+  const headers = {
+    'Content-Type': 'application/json',
+    Accept: 'application/json, text/event-stream'
+  }
+  if (mcpSessionId) {
+    headers['Mcp-Session-Id'] = mcpSessionId
+  }
+  if (MCP_SERVER_TOKEN) {
+    headers.Authorization = `Bearer ${MCP_SERVER_TOKEN}`
+  }
+  const response = await fetch(MCP_SERVER_URL, {
+    method: 'POST',
+    headers,
+    body: JSON.stringify(message)
+  })
+  if (response.status === 404 && mcpSessionId) {
+    // The server dropped our session (restart or idle timeout)
+    const error = new Error('MCP session expired')
+    error.sessionExpired = true
+    throw error
+  }
+  if (!response.ok && response.status !== 202) {
+    throw new Error(`MCP server returned HTTP ${response.status}`)
+  }
+  mcpSessionId = response.headers.get('mcp-session-id') || mcpSessionId
+  if (response.status === 202) {
+    return null
+  }
+  const body = await response.text()
+  if (!(response.headers.get('content-type') || '').includes('text/event-stream')) {
+    return JSON.parse(body)
+  }
+  // Streamed response: pick our JSON-RPC reply out of the SSE data lines
+  for (const line of body.split('\n')) {
+    if (line.startsWith('data:')) {
+      const reply = JSON.parse(line.slice(5))
+      if (reply.id === message.id) {
+        return reply
+      }
+    }
+  }
+  throw new Error('No response from MCP server')
+}
+
+const initializeHTTPSession = async () => {
+  mcpSessionId = null
+  await postToMCPServer({
+    jsonrpc: '2.0',
+    id: 'initialize',
+    method: 'initialize',
+    params: {
+      protocolVersion: '2024-11-05',
+      capabilities: {
+        tools: {}
+      },
+      clientInfo: {
+        name: 'odoo-product-editor',
+        version: '1.0.0'
+      }
+    }
+  })
+  await postToMCPServer({ jsonrpc: '2.0', method: 'notifications/initialized', params: {} })
+}
+
+const proxyOverHTTP = async (request) => {
+  if (!mcpSessionId) {
+    await initializeHTTPSession()
+  }
+  try {
+    return await postToMCPServer(request)
+  } catch (error) {
+    if (!error.sessionExpired) {
+      throw error
+    }
+    await initializeHTTPSession()
+    return await postToMCPServer(request)
+  }
+}
 
 const startMCPServer = () => {
   const mcpServerPath = path.join(__dirname, '..', 'odoo_mcp_server', 'main.py')
@@ -113,10 +199,15 @@ const initializeMCP = async () => {
 // Proxy requests to MCP server
 app.post('/api', async (req, res) => {
   try {
+    if (MCP_SERVER_URL) {
+      res.json(await proxyOverHTTP(req.body))
+      return
+    }
+
     if (!mcpProcess) {
+      // No need to wait for the process: stdin is buffered until the server
+      // reads it, and initializeMCP() waits for the initialize response
       startMCPServer()
-      // Give the server a moment to start
-      await new Promise(resolve => setTimeout(resolve, 2000))
     }
 
     if (!isInitialized) {
@@ -179,7 +270,7 @@ app.post('/api', async (req, res) => {
 app.get('/health', (req, res) => {
   res.json({ 
     status: 'ok', 
-    mcpServer: mcpProcess ? 'running' : 'stopped',
+    mcpServer: MCP_SERVER_URL || (mcpProcess ? 'running' : 'stopped'),
     timestamp: new Date().toISOString()
   })
 })
@@ -187,6 +278,10 @@ app.get('/health', (req, res) => {
 // Start the bridge server
 app.listen(PORT, () => {
   console.log(`Bridge server running on http://localhost:${PORT}`)
+  if (MCP_SERVER_URL) {
+    console.log(`Using MCP server at ${MCP_SERVER_URL}`)
+    return
+  }
   console.log('Starting MCP server...')
   startMCPServer()
 })
@@ -12,6 +12,25 @@ class MCPClient {
     })
   }
 
+  // Tool results are JSON: use structuredContent when the server sent it,
+  // otherwise parse the first text content part
+  parseToolResult(result) {
+    if (!result) {
+      return result
+    }
+    if (result.structuredContent) {
+      return result.structuredContent
+    }
+    const text = result.content && result.content[0] && result.content[0].text
+    if (text === undefined) {
+      return result
+    }
+    if (text.startsWith('Error: ')) {
+      throw new Error(text.slice('Error: '.length))
+    }
+    return JSON.parse(text)
+  }
+
   // Test connection to MCP server
   async testConnection() {
     try {
@@ -29,13 +48,7 @@ class MCPClient {
         throw new Error(response.data.error.message)
       }
       
-      // Parse the text content from MCP response
-      const result = response.data.result
-      if (result && result[0] && result[0].text) {
-        return JSON.parse(result[0].text)
-      }
-      
-      return result
+      return this.parseToolResult(response.data.result)
     } catch (error) {
       console.error('Connection test failed:', error)
       throw error
@@ -64,13 +77,7 @@ class MCPClient {
         throw new Error(response.data.error.message)
       }
       
-      // Parse the text content from MCP response
-      const result = response.data.result
-      if (result && result[0] && result[0].text) {
-        return JSON.parse(result[0].text)
-      }
-      
-      return result
+      return this.parseToolResult(response.data.result)
     } catch (error) {
       console.error('Product search failed:', error)
       throw error
@@ -98,13 +105,7 @@ class MCPClient {
         throw new Error(response.data.error.message)
       }
       
-      // Parse the text content from MCP response
-      const result = response.data.result
-      if (result && result[0] && result[0].text) {
-        return JSON.parse(result[0].text)
-      }
-      
-      return result
+      return this.parseToolResult(response.data.result)
     } catch (error) {
       console.error('Product read failed:', error)
       throw error
@@ -132,13 +133,7 @@ class MCPClient {
         throw new Error(response.data.error.message)
       }
       
-      // Parse the text content from MCP response
-      const result = response.data.result
-      if (result && result[0] && result[0].text) {
-        return JSON.parse(result[0].text)
-      }
-      
-      return result
+      return this.parseToolResult(response.data.result)
     } catch (error) {
       console.error('Product update failed:', error)
       throw error
@@ -165,13 +160,7 @@ class MCPClient {
         throw new Error(response.data.error.message)
       }
       
-      // Parse the text content from MCP response
-      const result = response.data.result
-      if (result && result[0] && result[0].text) {
-        return JSON.parse(result[0].text)
-      }
-      
-      return result
+      return this.parseToolResult(response.data.result)
     } catch (error) {
       console.error('Product creation failed:', error)
       throw error
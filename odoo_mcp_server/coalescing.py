@@ -0,0 +1,116 @@
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+# ORM methods without side effects; identical concurrent calls may share one RPC
+READ_ONLY_METHODS = frozenset({
+    "search", "search_read", "search_count", "read", "read_group",
+    "fields_get", "name_search", "default_get", "check_access_rights",
+})
+
+
+def call_key(model: str, method: str, args: list, kwargs: dict) -> str:
+    """Stable identity of an ORM call."""
+    return json.dumps([model, method, args, kwargs or {}], sort_keys=True, default=str)
+
+
+class SingleFlight:
+    """Lets concurrent identical calls share one in-flight upstream call.
+
+    Callers receive the same result object and must treat it as read-only.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        else:
+            self.shared += 1
+        # Shield so one caller giving up does not cancel the call for the others
+        return await asyncio.shield(task)
+
+
+class _PendingRead:
+    __slots__ = ("waiters",)
+
+    def __init__(self):
+        self.waiters: List[Tuple[list, asyncio.Future]] = []
+
+
+class ReadBatcher:
+    """Merges concurrent ``read`` calls on the same model and fields.
+
+    Reads arriving within ``window`` seconds of each other are sent as one
+    ``read`` over the union of their ids; each caller gets its own records back
+    in its own order. If the merged read fails (e.g. one caller asked for a
+    deleted id), every caller's read is retried on its own so the error stays
+    with the caller that caused it.
+    """
+
+    def __init__(self, execute_kw: Callable[..., Awaitable[Any]], window: float = 0.002):
+        self._execute_kw = execute_kw
+        self.window = window
+        self._pending: Dict[Tuple[str, str], _PendingRead] = {}
+        self.reads = 0
+        self.batches = 0
+
+    async def read(self, model: str, ids: list, kwargs: dict) -> list:
+        key = (model, json.dumps(kwargs or {}, sort_keys=True, default=str))
+        loop = asyncio.get_running_loop()
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = _PendingRead()
+            loop.call_later(self.window, lambda: asyncio.ensure_future(self._flush(key, batch)))
+        future = loop.create_future()
+        batch.waiters.append((list(ids), future))
+        self.reads += 1
+        return await future
+
+    async def _flush(self, key: Tuple[str, str], batch: _PendingRead):
+        if self._pending.get(key) is batch:
+            del self._pending[key]
+        model, kwargs = key[0], json.loads(key[1])
+        waiters = [(ids, future) for ids, future in batch.waiters if not future.done()]
+        if not waiters:
+            return
+        self.batches += 1
+
+        union = list(dict.fromkeys(rid for ids, _ in waiters for rid in ids))
+        try:
+            rows = await self._execute_kw(model, 'read', [union], kwargs)
+        except Exception as e:
+            if len(waiters) == 1:
+                _settle(waiters[0][1], error=e)
+                return
+            await asyncio.gather(*(self._read_alone(model, ids, kwargs, future) for ids, future in waiters))
+            return
+
+        by_id = {row['id']: row for row in rows}
+        for ids, future in waiters:
+            _settle(future, [by_id[rid] for rid in dict.fromkeys(ids) if rid in by_id])
+
+    async def _read_alone(self, model: str, ids: list, kwargs: dict, future: asyncio.Future):
+        try:
+            _settle(future, await self._execute_kw(model, 'read', [ids], kwargs))
+        except Exception as e:
+            _settle(future, error=e)
+
+    def stats(self) -> dict:
+        return {"window": self.window, "reads": self.reads, "batches": self.batches}
+
+
+def _settle(future: asyncio.Future, result: Any = None, error: BaseException = None):
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
@@ -0,0 +1,254 @@
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Set
+
+# Odoo's constant leaves
+TRUE_LEAF = [1, "=", 1]
+FALSE_LEAF = [0, "=", 1]
+
+TERM_OPERATORS = frozenset({
+    "=", "!=", "<=", "<", ">", ">=", "=?", "=like", "=ilike", "like", "not like",
+    "ilike", "not ilike", "in", "not in", "child_of", "parent_of", "any", "not any",
+})
+OPERATOR_ALIASES = {"==": "=", "<>": "!="}
+# Operator of the negated term, as in Odoo's expression.distribute_not
+NEGATED_OPERATORS = {
+    "=": "!=", "!=": "=", "<": ">=", ">=": "<", ">": "<=", "<=": ">",
+    "in": "not in", "not in": "in", "like": "not like", "not like": "like",
+    "ilike": "not ilike", "not ilike": "ilike", "any": "not any", "not any": "any",
+}
+RELATIONAL_TYPES = frozenset({"many2one", "one2many", "many2many"})
+
+# Internal tree nodes: ("leaf", field, operator, value), ("&", [children]),
+# ("|", [children]), ("!", child) and the two constants below
+_TRUE = ("true",)
+_FALSE = ("false",)
+
+
+class DomainError(ValueError):
+    """Raised when a domain is malformed or refers to unknown fields or operators."""
+
+
+def compile_domain(domain: Any, model: str = "", fields: Optional[Dict[str, dict]] = None,
+                   prefix_fields: Iterable[str] = ()) -> list:
+    """Validate and normalize an Odoo search domain.
+
+    ``fields`` is the model's fields_get index; without it field names are not
+    checked. Terms are normalized (``in [x]`` becomes ``= x``, ``!`` is pushed
+    into the terms, tuples become lists), duplicate terms are dropped and
+    constant branches are folded, so equivalent domains compile to the same
+    list. ``ilike`` on a field listed in ``prefix_fields`` becomes a prefix
+    ``=ilike`` match. A domain that can match nothing compiles to
+    ``[FALSE_LEAF]`` (see is_false_domain) and one that matches everything to
+    ``[]``.
+    """
+    tree = _parse(domain)
+    tree = _prepare(tree, model, fields, set(prefix_fields))
+    tree = _simplify(tree)
+    if tree == _TRUE:
+        return []
+    if tree[0] == "&":
+        return [term for child in tree[1] for term in _emit(child)]
+    return _emit(tree)
+
+
+def is_false_domain(domain: list) -> bool:
+    """Return True for a compiled domain that cannot match any record."""
+    return domain == [FALSE_LEAF]
+
+
+def watermark_domain(write_date: str, seen: list) -> list:
+    """Domain of records written at or after a write_date watermark, except the ids already seen at it.
+
+    read() returns write_date truncated to the second while Odoo stores and
+    compares it with microseconds, so the watermark's second is matched as a
+    range and never by equality with the truncated value.
+    """
+    if not seen:
+        return [["write_date", ">=", write_date]]
+    return ["|", ["write_date", ">=", _next_second(write_date)],
+            "&", ["write_date", ">=", write_date], ["id", "not in", seen]]
+
+
+def second_domain(write_date: str) -> list:
+    """Domain of records written within the second of a write_date read back from Odoo."""
+    return [["write_date", ">=", write_date], ["write_date", "<", _next_second(write_date)]]
+
+
+def _next_second(write_date: str) -> str:
+    moment = datetime.strptime(write_date[:19], "%Y-%m-%d %H:%M:%S") + timedelta(seconds=1)
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def parse_model_fields(spec: str) -> Dict[str, Set[str]]:
+    """Parse 'res.partner:ref,product.template:default_code' into {model: {field, ...}}."""
+    model_fields: Dict[str, Set[str]] = {}
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        model, _, field = item.rpartition(":")
+        model_fields.setdefault(model, set()).add(field)
+    return model_fields
+
+
+def _parse(domain: Any):
+    if not isinstance(domain, (list, tuple)):
+        raise DomainError(f"Domain must be a list, got {type(domain).__name__}")
+    tokens = list(domain)
+    pos = 0
+
+    def expression():
+        nonlocal pos
+        if pos >= len(tokens):
+            raise DomainError("Domain ends before every '&', '|' and '!' has its operands")
+        token = tokens[pos]
+        pos += 1
+        if token in ("&", "|"):
+            return (token, [expression(), expression()])
+        if token == "!":
+            return ("!", expression())
+        return _parse_term(token)
+
+    children = []
+    while pos < len(tokens):
+        children.append(expression())
+    return ("&", children)
+
+
+def _parse_term(term: Any):
+    if not isinstance(term, (list, tuple)) or len(term) != 3:
+        raise DomainError(f"Invalid domain term {term!r}: expected [field, operator, value], '&', '|' or '!'")
+    if list(term) == TRUE_LEAF:
+        return _TRUE
+    if list(term) == FALSE_LEAF:
+        return _FALSE
+    field, operator, value = term
+    if not isinstance(field, str) or not field:
+        raise DomainError(f"Invalid field name in domain term {list(term)!r}")
+    if not isinstance(operator, str):
+        raise DomainError(f"Invalid operator in domain term {list(term)!r}")
+    operator = operator.lower()
+    operator = OPERATOR_ALIASES.get(operator, operator)
+    if operator not in TERM_OPERATORS:
+        raise DomainError(f"Invalid operator {term[1]!r} in domain term {list(term)!r}")
+    return ("leaf", field, operator, _plain(value))
+
+
+def _plain(value: Any) -> Any:
+    """Turn tuples into lists so equal values serialize identically."""
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
+
+
+def _prepare(node, model: str, fields: Optional[Dict[str, dict]], prefix_fields: Set[str]):
+    """Check every term against the model's fields and normalize it."""
+    kind = node[0]
+    if kind in ("&", "|"):
+        return (kind, [_prepare(child, model, fields, prefix_fields) for child in node[1]])
+    if kind == "!":
+        return ("!", _prepare(node[1], model, fields, prefix_fields))
+    if kind != "leaf":
+        return node
+    _, field, operator, value = node
+    if fields is not None:
+        _check_field(model, fields, field, operator)
+    return _normalize_term(field, operator, value, field in prefix_fields)
+
+
+def _check_field(model: str, fields: Dict[str, dict], path: str, operator: str):
+    name, _, related = path.partition(".")
+    if name not in fields and name != "id":
+        import difflib  # only needed on the error path
+
+        suggestions = difflib.get_close_matches(name, list(fields), n=3)
+        hint = f"; did you mean {', '.join(suggestions)}?" if suggestions else ""
+        raise DomainError(f"Unknown field {name!r} on {model or 'model'}{hint}")
+    field_type = fields.get(name, {}).get("type")
+    if related and field_type not in RELATIONAL_TYPES:
+        raise DomainError(f"Cannot follow {path!r}: {name!r} on {model or 'model'} is a {field_type} field")
+    if operator in ("any", "not any") and field_type not in RELATIONAL_TYPES:
+        raise DomainError(f"Operator {operator!r} needs a relational field, {name!r} is a {field_type} field")
+
+
+def _normalize_term(field: str, operator: str, value: Any, prefix_match: bool):
+    if operator == "=?":
+        if value is None or value is False:
+            return _TRUE
+        operator = "="
+    if operator in ("in", "not in"):
+        values = _unique(value if isinstance(value, list) else [value])
+        if not values:
+            return _FALSE if operator == "in" else _TRUE
+        if len(values) == 1:
+            return ("leaf", field, "=" if operator == "in" else "!=", values[0])
+        return ("leaf", field, operator, values)
+    if (prefix_match and operator == "ilike" and isinstance(value, str)
+            and value and "%" not in value):
+        # A prefix match can use a btree/trigram index, a substring match cannot
+        return ("leaf", field, "=ilike", f"{value}%")
+    return ("leaf", field, operator, value)
+
+
+def _unique(values: list) -> list:
+    unique = list({json.dumps(v, sort_keys=True, default=str): v for v in values}.values())
+    try:
+        return sorted(unique)
+    except TypeError:
+        return unique
+
+
+def _key(node) -> str:
+    return json.dumps(node, sort_keys=True, default=str)
+
+
+def _simplify(node):
+    kind = node[0]
+    if kind == "!":
+        return _negate(_simplify(node[1]))
+    if kind not in ("&", "|"):
+        return node
+    absorbing, neutral = (_FALSE, _TRUE) if kind == "&" else (_TRUE, _FALSE)
+    children, seen = [], set()
+    for child in map(_simplify, node[1]):
+        for part in child[1] if child[0] == kind else [child]:
+            if part == absorbing:
+                return absorbing
+            key = _key(part)
+            if part != neutral and key not in seen:
+                seen.add(key)
+                children.append(part)
+    if not children:
+        return neutral
+    if len(children) == 1:
+        return children[0]
+    return (kind, sorted(children, key=_key))
+
+
+def _negate(node):
+    if node == _TRUE:
+        return _FALSE
+    if node == _FALSE:
+        return _TRUE
+    kind = node[0]
+    if kind == "!":
+        return node[1]
+    if kind == "leaf":
+        _, field, operator, value = node
+        if operator in NEGATED_OPERATORS:
+            return ("leaf", field, NEGATED_OPERATORS[operator], value)
+        return ("!", node)
+    # De Morgan
+    return _simplify(("|" if kind == "&" else "&", [_negate(child) for child in node[1]]))
+
+
+def _emit(node) -> list:
+    """Serialize a tree node in Odoo's prefix notation."""
+    if node == _TRUE:
+        return [list(TRUE_LEAF)]
+    if node == _FALSE:
+        return [list(FALSE_LEAF)]
+    kind = node[0]
+    if kind == "leaf":
+        return [[node[1], node[2], node[3]]]
+    if kind == "!":
+        return ["!", *_emit(node[1])]
+    return [kind] * (len(node[1]) - 1) + [term for child in node[1] for term in _emit(child)]
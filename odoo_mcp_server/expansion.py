@@ -0,0 +1,117 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from domain import RELATIONAL_TYPES
+
+# field -> (fields to read on the related model, nested spec)
+ExpandSpec = Dict[str, Tuple[List[str], "ExpandSpec"]]
+
+
+class ExpandError(ValueError):
+    """Raised when an expand argument is malformed or names a field that cannot be expanded."""
+
+
+def parse_expand(spec: Any, max_depth: int, depth: int = 0) -> ExpandSpec:
+    """Normalize an expand argument to {field: (fields, nested spec)}.
+
+    Each field maps to the list of fields to read on the related model, or to
+    {"fields": [...], "expand": {...}} to expand that model's relations too.
+    An empty field list reads the related model's default fields.
+    """
+    if not isinstance(spec, dict):
+        raise ExpandError("expand must map relational fields to a field list or {fields, expand}")
+    if depth >= max_depth:
+        raise ExpandError(f"expand is nested deeper than {max_depth} levels")
+    parsed = {}
+    for field, sub in spec.items():
+        if isinstance(sub, list):
+            fields, nested = sub, {}
+        elif isinstance(sub, dict) and set(sub) <= {"fields", "expand"}:
+            fields, nested = sub.get("fields", []), sub.get("expand", {})
+        else:
+            raise ExpandError(f"expand[{field!r}] must be a field list or {{'fields': [...], 'expand': {{...}}}}")
+        if not isinstance(fields, list) or not all(isinstance(name, str) for name in fields):
+            raise ExpandError(f"expand[{field!r}] fields must be a list of field names")
+        parsed[field] = (fields, parse_expand(nested, max_depth, depth + 1) if nested else {})
+    return parsed
+
+
+async def expand_records(model: str, records: List[dict], spec: ExpandSpec,
+                         fields_get: Callable[[str], Awaitable[Dict[str, dict]]],
+                         read: Callable[[str, list, list], Awaitable[List[dict]]]) -> List[dict]:
+    """Return copies of records with the relational fields in spec replaced by the related records.
+
+    A many2one becomes the related record (or stays False), a one2many or
+    many2many becomes the list of related records. The tree is resolved
+    level by level: the ids wanted from each related model are collected
+    across every record and field of a level and fetched with one read per
+    model, so N orders with their lines and products cost one read per model
+    and level instead of one per record. ``read(model, ids, fields)`` must
+    return the records it found; records it does not return are left out.
+    """
+    top = [dict(record) for record in records]
+    level = [(model, top, spec)]
+    while level:
+        # related model -> (ids in first-seen order, fields to read; None reads the defaults)
+        wanted: Dict[str, Tuple[dict, Any]] = {}
+        jobs = []
+        for current_model, rows, current_spec in level:
+            definitions = await fields_get(current_model)
+            for field, (fields, nested) in current_spec.items():
+                info = definitions.get(field)
+                if info is None:
+                    raise ExpandError(f"Cannot expand unknown field {field!r} on {current_model}")
+                if info.get("type") not in RELATIONAL_TYPES or not info.get("relation"):
+                    raise ExpandError(
+                        f"Cannot expand {current_model}.{field}: it is a {info.get('type')} field, not a relation"
+                    )
+                related = info["relation"]
+                ids, read_fields = wanted.setdefault(related, ({}, set()))
+                for row in rows:
+                    ids.update(dict.fromkeys(_related_ids(row.get(field), info["type"])))
+                if fields and read_fields is not None:
+                    # Nested relations must be read to be expanded in turn
+                    read_fields.update(fields, nested)
+                else:
+                    wanted[related] = (ids, None)
+                jobs.append((rows, field, info["type"], related, fields, nested))
+
+        models = [related for related, (ids, _fields) in wanted.items() if ids]
+        results = await asyncio.gather(*(
+            read(related, list(wanted[related][0]), sorted(wanted[related][1] or ())) for related in models
+        ))
+        fetched = {related: {row["id"]: row for row in rows} for related, rows in zip(models, results)}
+
+        next_level = []
+        for rows, field, field_type, related, fields, nested in jobs:
+            by_id = fetched.get(related, {})
+            keep = set(fields) | set(nested) | {"id"}
+            # One copy per related record, shared by every row that points to it
+            shown: Dict[int, dict] = {}
+
+            def show(rid: int):
+                if rid not in shown and rid in by_id:
+                    record = by_id[rid]
+                    shown[rid] = {k: v for k, v in record.items() if k in keep} if fields else dict(record)
+                return shown.get(rid)
+
+            for row in rows:
+                ids = _related_ids(row.get(field), field_type)
+                if field_type == "many2one":
+                    if ids and show(ids[0]) is not None:
+                        row[field] = show(ids[0])
+                else:
+                    row[field] = [record for record in map(show, ids) if record is not None]
+            if nested and shown:
+                next_level.append((related, list(shown.values()), nested))
+        level = next_level
+    return top
+
+
+def _related_ids(value: Any, field_type: str) -> list:
+    """Ids held by a relational field value: [id, name] or id for many2one, a list of ids otherwise."""
+    if not value:
+        return []
+    if field_type == "many2one":
+        return [value[0] if isinstance(value, (list, tuple)) else value]
+    return [rid for rid in value if isinstance(rid, int)]
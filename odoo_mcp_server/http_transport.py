@@ -0,0 +1,133 @@
+import contextlib
+import hmac
+from typing import Any, Iterable, Optional
+
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "[::1]")
+# Paths served without the bearer token, for load balancer and orchestrator probes
+PUBLIC_PATHS = frozenset({"/health"})
+
+
+def allowed_hosts(host: str, port: int, extra: Iterable[str] = ()) -> list:
+    """Host header values accepted for a server listening on host:port.
+
+    A loopback or wildcard address accepts the loopback names; any other
+    public name must be listed in ``extra``.
+    """
+    names = list(LOOPBACK_HOSTS) if host in ("127.0.0.1", "localhost", "::1", "0.0.0.0", "::") else [host]
+    return list(dict.fromkeys([f"{name}:{port}" for name in names] + list(extra)))
+
+
+class _BearerAuth:
+    """ASGI middleware refusing HTTP requests without ``Authorization: Bearer <token>``."""
+
+    def __init__(self, app: Any, token: str):
+        self.app = app
+        self.expected = f"Bearer {token}".encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] not in PUBLIC_PATHS:
+            supplied = dict(scope["headers"]).get(b"authorization", b"")
+            if not hmac.compare_digest(supplied, self.expected):
+                from starlette.responses import JSONResponse
+
+                response = JSONResponse({"error": "Missing or invalid bearer token"}, status_code=401,
+                                        headers={"WWW-Authenticate": "Bearer"})
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+class _StreamableHTTPEndpoint:
+    """ASGI app forwarding /mcp requests to the session manager (a class, so Starlette passes raw ASGI)."""
+
+    def __init__(self, manager: Any):
+        self.manager = manager
+
+    async def __call__(self, scope, receive, send):
+        await self.manager.handle_request(scope, receive, send)
+
+
+def build_http_app(server: Any, initialization_options: Any, metrics: Optional[Any] = None,
+                   json_response: bool = False, session_idle_timeout: Optional[float] = 1800,
+                   max_sessions: Optional[int] = 1000, hosts: Iterable[str] = (),
+                   origins: Iterable[str] = (), auth_token: Optional[str] = None):
+    """Serve an MCP server to many concurrent clients over HTTP.
+
+    - ``/mcp``: streamable HTTP, one MCP session per ``Mcp-Session-Id``.
+    - ``/sse`` and ``/messages/``: the older HTTP+SSE transport.
+    - ``/health``: liveness check with the number of open sessions.
+    - ``/metrics``: Prometheus text, when ``metrics`` is given.
+
+    All sessions share the server object, so they share its Odoo connection
+    pools and caches. The MCP endpoints only accept the ``hosts`` Host
+    headers and ``origins`` Origin headers, which keeps web pages from
+    reaching a local server through DNS rebinding. With ``auth_token`` every
+    endpoint except ``/health`` requires it as a bearer token.
+    """
+    # Imported here so stdio mode never loads the HTTP stack
+    from mcp.server.sse import SseServerTransport
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    from mcp.server.transport_security import TransportSecuritySettings
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse, PlainTextResponse, Response
+    from starlette.routing import Mount, Route
+
+    security = TransportSecuritySettings(
+        enable_dns_rebinding_protection=True,
+        allowed_hosts=list(hosts),
+        allowed_origins=list(origins),
+    )
+    manager = StreamableHTTPSessionManager(
+        app=server,
+        json_response=json_response,
+        security_settings=security,
+        session_idle_timeout=session_idle_timeout,
+        max_sessions=max_sessions,
+    )
+    sse = SseServerTransport("/messages/", security_settings=security)
+    sse_sessions = 0
+
+    async def handle_sse(request):
+        nonlocal sse_sessions
+        sse_sessions += 1
+        try:
+            async with sse.connect_sse(request.scope, request.receive, request._send) as (read_stream, write_stream):
+                await server.run(read_stream, write_stream, initialization_options)
+        finally:
+            sse_sessions -= 1
+        return Response()
+
+    async def health(request):
+        return JSONResponse({
+            "status": "ok",
+            "streamable_http_sessions": len(getattr(manager, "_server_instances", ())),
+            "sse_sessions": sse_sessions,
+        })
+
+    async def prometheus(request):
+        return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+    routes = [
+        Route("/mcp", endpoint=_StreamableHTTPEndpoint(manager)),
+        Route("/sse", endpoint=handle_sse, methods=["GET"]),
+        Mount("/messages/", app=sse.handle_post_message),
+        Route("/health", endpoint=health, methods=["GET"]),
+    ]
+    if metrics is not None:
+        routes.append(Route("/metrics", endpoint=prometheus, methods=["GET"]))
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        async with manager.run():
+            yield
+
+    app = Starlette(routes=routes, lifespan=lifespan)
+    return _BearerAuth(app, auth_token) if auth_token else app
+
+
+async def serve_http(app: Any, host: str, port: int):
+    """Run an ASGI app with uvicorn until cancelled."""
+    import uvicorn
+
+    config = uvicorn.Config(app, host=host, port=port, log_level="warning", access_log=False)
+    await uvicorn.Server(config).serve()
@@ -1,13 +1,39 @@
 import os
+import sys
+import csv
+import json
+import base64
+import hashlib
 import asyncio
-import xmlrpc.client
-from typing import Any, Dict, List, Optional
+import contextlib
+import contextvars
+import time
+import weakref
+from urllib.parse import parse_qs
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+import jsonschema
 from dotenv import load_dotenv
 from mcp.server.models import InitializationOptions
 from mcp.server import NotificationOptions, Server
 from mcp.types import Resource, Tool, TextContent, ImageContent, EmbeddedResource
 from pydantic import AnyUrl
 import mcp.types as types
+from rpc_executor import RpcExecutor
+from metadata_cache import MetadataCache
+from record_cache import RecordCache, parse_model_limits
+import serialization
+from coalescing import READ_ONLY_METHODS, ReadBatcher, SingleFlight, call_key
+from domain import compile_domain, is_false_domain, parse_model_fields, second_domain, watermark_domain
+from mirror import LocalMirror, MirrorUnsupported
+from metrics import Metrics, serve_prometheus, write_prometheus_file
+from profiles import DEFAULT_PROFILE, ProfileConfig, ProfileRegistry, load_profiles
+from expansion import expand_records, parse_expand
+from operations import NON_MUTATING_METHODS, OperationError, plan_operations, resolve_references
+import resultsets
+from resultsets import AGGREGATE_FUNCTIONS, GROUPBY_GRANULARITIES, ResultSet, ResultSetStore
+
+if TYPE_CHECKING:
+    from session_pool import OdooSession
 
 # Load environment variables from the root .env file
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
@@ -18,11 +44,295 @@ ODOO_DB = os.getenv("ODOO_DB")
 ODOO_USERNAME = os.getenv("ODOO_USERNAME", "admin")
 ODOO_PASSWORD = os.getenv("ODOO_PASSWORD")
 
+# Wire protocol: "xmlrpc" or "jsonrpc"
+ODOO_TRANSPORT = os.getenv("ODOO_TRANSPORT", "xmlrpc")
+
+# Named profiles (ODOO_PROFILES plus ODOO_PROFILE_<NAME>_* settings), see profiles.py
+ODOO_PROFILES = load_profiles(os.environ, ProfileConfig(
+    DEFAULT_PROFILE, ODOO_URL, ODOO_DB, ODOO_USERNAME, ODOO_PASSWORD, ODOO_TRANSPORT
+))
+ODOO_DEFAULT_PROFILE = os.getenv("ODOO_DEFAULT_PROFILE", DEFAULT_PROFILE)
+# Seconds before an unused profile's connections and caches are released (0 keeps them)
+ODOO_PROFILE_IDLE_TIMEOUT = float(os.getenv("ODOO_PROFILE_IDLE_TIMEOUT", "0"))
+
+# Session pool settings
+ODOO_POOL_SIZE = int(os.getenv("ODOO_POOL_SIZE", "8"))
+ODOO_POOL_IDLE_TIMEOUT = float(os.getenv("ODOO_POOL_IDLE_TIMEOUT", "60"))
+ODOO_POOL_MAX_LIFETIME = float(os.getenv("ODOO_POOL_MAX_LIFETIME", "600"))
+
+# Concurrency settings
+ODOO_MAX_CONCURRENCY = int(os.getenv("ODOO_MAX_CONCURRENCY", "8"))
+ODOO_CALL_TIMEOUT = float(os.getenv("ODOO_CALL_TIMEOUT", "60"))
+
+# Request coalescing settings
+ODOO_COALESCE = os.getenv("ODOO_COALESCE", "true").lower() in ("1", "true", "yes")
+ODOO_READ_BATCH_WINDOW = float(os.getenv("ODOO_READ_BATCH_WINDOW", "0.002"))
+
+# Metadata cache settings
+ODOO_METADATA_TTL = float(os.getenv("ODOO_METADATA_TTL", "300"))
+
+# Record cache settings (a size limit of 0 disables caching for a model)
+ODOO_RECORD_CACHE_TTL = float(os.getenv("ODOO_RECORD_CACHE_TTL", "60"))
+ODOO_RECORD_CACHE_SIZE = int(os.getenv("ODOO_RECORD_CACHE_SIZE", "1000"))
+ODOO_RECORD_CACHE_MODEL_LIMITS = parse_model_limits(os.getenv("ODOO_RECORD_CACHE_MODEL_LIMITS", ""))
+
+# Fields whose ilike terms are sent as prefix (=ilike 'value%') matches, e.g. "res.partner:ref"
+ODOO_DOMAIN_PREFIX_FIELDS = parse_model_fields(os.getenv("ODOO_DOMAIN_PREFIX_FIELDS", ""))
+
+# Local SQLite mirror of read-heavy models (disabled when no models are listed)
+ODOO_MIRROR_MODELS = [m.strip() for m in os.getenv("ODOO_MIRROR_MODELS", "").split(",") if m.strip()]
+ODOO_MIRROR_PATH = os.getenv("ODOO_MIRROR_PATH") or os.path.join(os.path.dirname(__file__), '..', 'odoo_mirror.sqlite3')
+ODOO_MIRROR_INDEXES = parse_model_fields(os.getenv("ODOO_MIRROR_INDEXES", ""))
+# Seconds between background syncs; 0 syncs only when a read needs fresher data
+ODOO_MIRROR_SYNC_INTERVAL = float(os.getenv("ODOO_MIRROR_SYNC_INTERVAL", "0"))
+
+# MCP transport: "stdio" (one client per process) or "http" (streamable HTTP and SSE for many clients)
+ODOO_MCP_TRANSPORT = os.getenv("ODOO_MCP_TRANSPORT", "stdio").lower()
+ODOO_MCP_HOST = os.getenv("ODOO_MCP_HOST", "127.0.0.1")
+ODOO_MCP_PORT = int(os.getenv("ODOO_MCP_PORT", "8808"))
+# Tool calls one client session may run at once (0 for no limit)
+ODOO_MCP_SESSION_CONCURRENCY = int(os.getenv("ODOO_MCP_SESSION_CONCURRENCY", "4"))
+ODOO_MCP_MAX_SESSIONS = int(os.getenv("ODOO_MCP_MAX_SESSIONS", "1000"))
+ODOO_MCP_SESSION_IDLE_TIMEOUT = float(os.getenv("ODOO_MCP_SESSION_IDLE_TIMEOUT", "1800"))
+# Answer streamable HTTP requests with plain JSON instead of an SSE stream
+ODOO_MCP_JSON_RESPONSE = os.getenv("ODOO_MCP_JSON_RESPONSE", "false").lower() in ("1", "true", "yes")
+# Bearer token HTTP clients must send (empty: no authentication)
+ODOO_MCP_AUTH_TOKEN = os.getenv("ODOO_MCP_AUTH_TOKEN", "")
+# Host and Origin headers accepted over HTTP besides the listening address, e.g. behind a proxy
+ODOO_MCP_ALLOWED_HOSTS = [h.strip() for h in os.getenv("ODOO_MCP_ALLOWED_HOSTS", "").split(",") if h.strip()]
+ODOO_MCP_ALLOWED_ORIGINS = [o.strip() for o in os.getenv("ODOO_MCP_ALLOWED_ORIGINS", "").split(",") if o.strip()]
+# Directory output_path must stay in over HTTP; unset, tools cannot write files in HTTP mode
+ODOO_EXPORT_DIR = os.getenv("ODOO_EXPORT_DIR", "")
+
+# Prometheus export of the odoo://metrics data (both disabled by default)
+ODOO_METRICS_PORT = int(os.getenv("ODOO_METRICS_PORT", "0"))
+ODOO_METRICS_HOST = os.getenv("ODOO_METRICS_HOST", "127.0.0.1")
+ODOO_METRICS_FILE = os.getenv("ODOO_METRICS_FILE")
+ODOO_METRICS_INTERVAL = float(os.getenv("ODOO_METRICS_INTERVAL", "15"))
+
+# Output settings
+ODOO_COMPACT_OUTPUT = os.getenv("ODOO_COMPACT_OUTPUT", "false").lower() in ("1", "true", "yes")
+# Default record layout of search/read/export/changes results: "records" or "columnar"
+ODOO_OUTPUT_FORMAT = os.getenv("ODOO_OUTPUT_FORMAT", "records").lower()
+# First MCP protocol revision with structuredContent in tool results
+STRUCTURED_CONTENT_PROTOCOL = "2025-06-18"
+
+# Export settings
+EXPORT_CHUNK_SIZE = int(os.getenv("ODOO_EXPORT_CHUNK_SIZE", "500"))
+EXPORT_INLINE_LIMIT = int(os.getenv("ODOO_EXPORT_INLINE_LIMIT", "5000"))
+
+# odoo_read splits id lists longer than READ_CHUNK_SIZE into chunks, reads
+# READ_PARALLEL of them at once and retries a chunk that fails in transport
+READ_CHUNK_SIZE = int(os.getenv("ODOO_READ_CHUNK_SIZE", "1000"))
+READ_PARALLEL = int(os.getenv("ODOO_READ_PARALLEL", "4"))
+READ_RETRIES = int(os.getenv("ODOO_READ_RETRIES", "2"))
+
+# Deepest nesting of the expand argument of odoo_search/odoo_read
+EXPAND_MAX_DEPTH = int(os.getenv("ODOO_EXPAND_MAX_DEPTH", "3"))
+
+# Records per odoo_changes page / odoo://changes read
+CHANGES_LIMIT = int(os.getenv("ODOO_CHANGES_LIMIT", "200"))
+
+# Batch mutation settings
+BATCH_CHUNK_SIZE = int(os.getenv("ODOO_BATCH_CHUNK_SIZE", "100"))
+
+# odoo_execute settings: operations per call and methods it refuses to run
+EXECUTE_MAX_OPERATIONS = int(os.getenv("ODOO_EXECUTE_MAX_OPERATIONS", "50"))
+EXECUTE_DENIED_METHODS = frozenset(
+    m.strip() for m in os.getenv("ODOO_EXECUTE_DENIED_METHODS", "unlink").split(",") if m.strip()
+)
+
+# Memory budget of result sets stored with "store": true, in MiB
+RESULTSET_MEMORY = float(os.getenv("ODOO_RESULTSET_MEMORY", "64"))
+
+# Input schema properties shared by several tools
+FORMAT_PROPERTY = {
+    "type": "string",
+    "enum": ["records", "columnar"],
+    "description": "'columnar' returns {fields, columns} with one value list per field, many2one split "
+                   "into id and name columns and repetitive strings dictionary-encoded",
+    "default": ODOO_OUTPUT_FORMAT
+}
+COMPACT_PROPERTY = {
+    "type": "boolean",
+    "description": "Omit null/false values and flatten many2one pairs to save tokens",
+    "default": ODOO_COMPACT_OUTPUT
+}
+EXPAND_PROPERTY = {
+    "type": "object",
+    "description": "Replace relational fields with the related records, read in one batch per model and level. "
+                   "Map a field to the fields to read, or to {'fields': [...], 'expand': {...}} to go deeper, "
+                   "e.g. {'partner_id': ['name', 'email'], 'order_line': {'fields': ['product_uom_qty', 'product_id'], "
+                   "'expand': {'product_id': ['name', 'default_code']}}}",
+    "additionalProperties": {"type": ["array", "object"]}
+}
+
+def _resolve_output_path(path: str) -> str:
+    """Check where a tool may write: anywhere over stdio, only inside ODOO_EXPORT_DIR over HTTP."""
+    if ODOO_MCP_TRANSPORT != "http":
+        return path
+    if not ODOO_EXPORT_DIR:
+        raise ValueError("output_path is disabled over HTTP; set ODOO_EXPORT_DIR to allow writing files there")
+    root = os.path.realpath(ODOO_EXPORT_DIR)
+    target = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, target]) != root:
+        raise ValueError(f"output_path must be inside {root}")
+    return target
+
+def _csv_row(record: dict) -> dict:
+    """Flatten relational values so a record fits in one CSV row."""
+    return {
+        key: json.dumps(value) if isinstance(value, (list, dict)) else value
+        for key, value in record.items()
+    }
+
+
+def _write_base64_file(data: str, path: str, chunk_chars: int = 1 << 20) -> tuple:
+    """Decode base64 text into a file chunk by chunk; return (size, sha1 hex digest)."""
+    digest = hashlib.sha1()
+    size = 0
+    chunk_chars -= chunk_chars % 4
+    with open(path, "wb") as handle:
+        for start in range(0, len(data), chunk_chars):
+            chunk = base64.b64decode(data[start:start + chunk_chars])
+            digest.update(chunk)
+            handle.write(chunk)
+            size += len(chunk)
+    return size, digest.hexdigest()
+
+
+def _encode_cursor(state: dict) -> str:
+    """Encode a search continuation as an opaque URL-safe token."""
+    return base64.urlsafe_b64encode(json.dumps(state, separators=(",", ":")).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> dict:
+    """Decode a token produced by _encode_cursor."""
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def _with_expanded(fields: list, spec: Optional[dict]) -> list:
+    """Add the fields named in an expand spec to an explicit field list, so they are read."""
+    if not fields or not spec:
+        return fields
+    return fields + [field for field in spec if field not in fields]
+
+
+# Profile used by the tool call or resource read being handled
+_current_profile: contextvars.ContextVar[str] = contextvars.ContextVar("odoo_profile", default=ODOO_DEFAULT_PROFILE)
+
+
+def _mirror_path(profile: str) -> str:
+    """SQLite mirror file of a profile; the default profile keeps ODOO_MIRROR_PATH itself."""
+    if profile == DEFAULT_PROFILE:
+        return ODOO_MIRROR_PATH
+    root, ext = os.path.splitext(ODOO_MIRROR_PATH)
+    return f"{root}.{profile}{ext}"
+
+
+class OdooProfile:
+    """One Odoo database: its pooled session, RPC executor, coalescing and caches."""
+
+    def __init__(self, config: ProfileConfig, metrics: Metrics):
+        # Imported on first use of a profile, keeping xmlrpc.client and
+        # http.client out of the path to the initialize response
+        from session_pool import OdooSession
+        from transports import make_transport
+
+        self.config = config
+        self.metrics = metrics
+        transport = make_transport(
+            config.transport, config.url,
+            pool_size=ODOO_POOL_SIZE,
+            idle_timeout=ODOO_POOL_IDLE_TIMEOUT,
+            max_lifetime=ODOO_POOL_MAX_LIFETIME,
+            timeout=ODOO_CALL_TIMEOUT,
+            metrics=metrics,
+        )
+        self.session = OdooSession(transport, config.db, config.username, config.password, metrics=metrics)
+        self.executor = RpcExecutor(ODOO_MAX_CONCURRENCY, ODOO_CALL_TIMEOUT)
+        self.single_flight = SingleFlight() if ODOO_COALESCE else None
+        self.read_batcher = (
+            ReadBatcher(self.call_odoo, ODOO_READ_BATCH_WINDOW)
+            if ODOO_COALESCE and ODOO_READ_BATCH_WINDOW > 0 else None
+        )
+        self.metadata = MetadataCache(self.execute_kw, ttl=ODOO_METADATA_TTL)
+        self.record_cache = RecordCache(
+            ttl=ODOO_RECORD_CACHE_TTL,
+            default_limit=ODOO_RECORD_CACHE_SIZE,
+            model_limits=ODOO_RECORD_CACHE_MODEL_LIMITS,
+        )
+        self.mirror = LocalMirror(
+            _mirror_path(config.name), ODOO_MIRROR_MODELS, self.execute_kw, self.metadata.fields,
+            indexes=ODOO_MIRROR_INDEXES,
+        ) if ODOO_MIRROR_MODELS else None
+        # Watermark token of each model's odoo://changes resource
+        self.change_tokens: Dict[str, str] = {}
+
+    async def connection(self) -> "OdooSession":
+        """Get the pooled Odoo session, authenticating on first use."""
+        try:
+            if not self.session.uid:
+                await self.executor.run(self.session.authenticate)
+            return self.session
+        except Exception as e:
+            raise Exception(f"Failed to connect to Odoo: {str(e)}")
+
+    async def execute_kw(self, model: str, method: str, args: list, kwargs: Optional[dict] = None) -> Any:
+        """Run an Odoo ORM call, sharing identical in-flight read-only calls."""
+        if (self.read_batcher and method == 'read' and len(args) == 1
+                and isinstance(args[0], list) and set(kwargs or {}) <= {'fields'}):
+            return await self.read_batcher.read(model, args[0], kwargs or {})
+        if self.single_flight and method in READ_ONLY_METHODS:
+            return await self.single_flight.do(
+                call_key(model, method, args, kwargs),
+                lambda: self.call_odoo(model, method, args, kwargs)
+            )
+        return await self.call_odoo(model, method, args, kwargs)
+
+    async def call_odoo(self, model: str, method: str, args: list, kwargs: Optional[dict] = None) -> Any:
+        """Run an Odoo ORM call on the RPC executor without blocking the event loop."""
+        session = await self.connection()
+        start = time.perf_counter()
+        try:
+            result = await self.executor.run(session.execute_kw, model, method, args, kwargs)
+        except Exception:
+            self.metrics.record_rpc(model, method, time.perf_counter() - start, error=True)
+            raise
+        self.metrics.record_rpc(model, method, time.perf_counter() - start)
+        return result
+
+    def close(self):
+        """Release the profile's connections, worker threads and mirror file."""
+        self.session.close()
+        self.executor.shutdown()
+        if self.mirror:
+            self.mirror.close()
+
+
 class OdooMCPServer:
     def __init__(self):
-        self.server = Server("odoo-mcp-server")
-        self.odoo_url = ODOO_URL
-        self.odoo_db = ODOO_DB
+        self.server = Server("odoo-mcp-server", version="1.0.0")
+        self.metrics = Metrics()
+        # Tool-call slots of each connected client session
+        self.session_slots: "weakref.WeakKeyDictionary[Any, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        # Tool and resource listings, built on first request; their schemas never change
+        self.tools: Optional[tuple] = None
+        self.resources: Optional[tuple] = None
+        # Compiled inputSchema validator of each tool, built on its first call
+        self.tool_validators: Dict[str, Any] = {}
+        # Result sets stored by odoo_search/odoo_export with "store": true, queried with odoo_resultset
+        self.resultsets = ResultSetStore(int(RESULTSET_MEMORY * 1024 * 1024))
+        # Each profile's session and caches are built on its first use
+        self.profiles = ProfileRegistry(
+            ODOO_PROFILES,
+            lambda config: OdooProfile(config, self.metrics),
+            OdooProfile.close,
+            idle_timeout=ODOO_PROFILE_IDLE_TIMEOUT,
+        )
         
         # Setup MCP server handlers
         self.setup_handlers()
@@ -31,7 +341,9 @@ class OdooMCPServer:
         @self.server.list_resources()
         async def handle_list_resources() -> list[Resource]:
             """List available Odoo resources."""
-            return [
+            if self.resources is not None:
+                return list(self.resources)
+            self.resources = (
                 Resource(
                     uri=AnyUrl("odoo://connection"),
                     name="Odoo Connection Status",
@@ -44,30 +356,96 @@ class OdooMCPServer:
                     description="List of available Odoo models",
                     mimeType="application/json",
                 ),
+                Resource(
+                    uri=AnyUrl("odoo://cache"),
+                    name="Odoo Cache Statistics",
+                    description="Hit/miss counts and sizes of the metadata and record caches",
+                    mimeType="application/json",
+                ),
+                Resource(
+                    uri=AnyUrl("odoo://metrics"),
+                    name="Odoo Call Metrics",
+                    description="Latency per stage, per model/method and per tool, with response sizes",
+                    mimeType="application/json",
+                ),
+                Resource(
+                    uri=AnyUrl("odoo://profiles"),
+                    name="Odoo Profiles",
+                    description="Configured Odoo profiles and which of them are active",
+                    mimeType="application/json",
+                ),
+            )
+            return list(self.resources)
+
+        @self.server.list_resource_templates()
+        async def handle_list_resource_templates() -> list[types.ResourceTemplate]:
+            """List parameterized Odoo resources."""
+            return [
+                types.ResourceTemplate(
+                    uriTemplate="odoo://models/{model}/fields",
+                    name="Odoo Model Fields",
+                    description="Cached field definitions (fields_get) of an Odoo model",
+                    mimeType="application/json",
+                ),
+                types.ResourceTemplate(
+                    uriTemplate="odoo://changes/{model}",
+                    name="Odoo Model Changes",
+                    description="Records of a model created or modified since this resource was last read",
+                    mimeType="application/json",
+                ),
             ]
 
         @self.server.read_resource()
         async def handle_read_resource(uri: AnyUrl) -> str:
-            """Read a specific Odoo resource."""
+            """Read a specific Odoo resource, of the profile named by a ?profile= query."""
             if uri.scheme != "odoo":
                 raise ValueError(f"Unsupported URI scheme: {uri.scheme}")
             
-            path = str(uri).replace("odoo://", "")
-            
+            path, _, query = str(uri).replace("odoo://", "").partition("?")
+            profile = parse_qs(query).get("profile", [ODOO_DEFAULT_PROFILE])[0]
+            self.profiles.acquire(profile)
+            token = _current_profile.set(profile)
+            try:
+                return await read_resource(path)
+            finally:
+                _current_profile.reset(token)
+                self.profiles.release(profile)
+
+        async def read_resource(path: str) -> str:
+            """Read a resource of the current profile."""
             if path == "connection":
                 return await self._check_connection()
             elif path == "models":
                 return await self._get_models()
+            elif path == "cache":
+                return serialization.dumps(self._cache_stats())
+            elif path == "metrics":
+                return serialization.dumps(self.metrics.snapshot())
+            elif path == "profiles":
+                return serialization.dumps({
+                    "default": ODOO_DEFAULT_PROFILE,
+                    "profiles": {
+                        name: {"url": config.url, "db": config.db, "username": config.username,
+                               "transport": config.transport, **self.profiles.stats()[name]}
+                        for name, config in self.profiles.configs.items()
+                    },
+                })
+            elif path.startswith("models/") and path.endswith("/fields"):
+                return await self._get_model_fields(path[len("models/"):-len("/fields")])
+            elif path.startswith("changes/"):
+                return await self._read_changes_resource(path[len("changes/"):])
             else:
                 raise ValueError(f"Unknown resource path: {path}")
 
         @self.server.list_tools()
         async def handle_list_tools() -> list[Tool]:
             """List available Odoo tools."""
-            return [
+            if self.tools is not None:
+                return list(self.tools)
+            tools = [
                 Tool(
                     name="odoo_search",
-                    description="Search for records in an Odoo model",
+                    description="Search for records in an Odoo model. Returns a next_cursor to fetch the following page",
                     inputSchema={
                         "type": "object",
                         "properties": {
@@ -90,7 +468,38 @@ class OdooMCPServer:
                                 "type": "integer",
                                 "description": "Maximum number of records to return",
                                 "default": 10
-                            }
+                            },
+                            "offset": {
+                                "type": "integer",
+                                "description": "Number of matching records to skip",
+                                "default": 0
+                            },
+                            "order": {
+                                "type": "string",
+                                "description": "Sort order (e.g., 'name asc, id desc')"
+                            },
+                            "count": {
+                                "type": "boolean",
+                                "description": "Also return the total number of matching records",
+                                "default": False
+                            },
+                            "cursor": {
+                                "type": "string",
+                                "description": "next_cursor from a previous odoo_search call; fetches the next page with the same query"
+                            },
+                            "max_staleness": {
+                                "type": "number",
+                                "description": "For models in the local mirror, accept data synced up to this many seconds ago and answer locally"
+                            },
+                            "expand": EXPAND_PROPERTY,
+                            "store": {
+                                "type": "boolean",
+                                "description": "Keep the records on the server and return a result set handle instead; "
+                                               "filter, sort, slice and group them with odoo_resultset",
+                                "default": False
+                            },
+                            "format": FORMAT_PROPERTY,
+                            "compact": COMPACT_PROPERTY
                         },
                         "required": ["model"]
                     }
@@ -115,11 +524,199 @@ class OdooMCPServer:
                                 "description": "Fields to retrieve",
                                 "items": {"type": "string"},
                                 "default": []
-                            }
+                            },
+                            "validate": {
+                                "type": "boolean",
+                                "description": "Check cached records against Odoo's write_date before serving them",
+                                "default": False
+                            },
+                            "max_staleness": {
+                                "type": "number",
+                                "description": "For models in the local mirror, accept data synced up to this many seconds ago and answer locally"
+                            },
+                            "expand": EXPAND_PROPERTY,
+                            "chunk_size": {
+                                "type": "integer",
+                                "description": "Record ids per read call; longer id lists are read in parallel chunks",
+                                "default": READ_CHUNK_SIZE
+                            },
+                            "format": FORMAT_PROPERTY,
+                            "compact": COMPACT_PROPERTY
                         },
                         "required": ["model", "ids"]
                     }
                 ),
+                Tool(
+                    name="odoo_export",
+                    description="Export many records in fixed-size chunks, inline or to a local NDJSON/CSV file",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "model": {
+                                "type": "string",
+                                "description": "The Odoo model to export"
+                            },
+                            "domain": {
+                                "type": "array",
+                                "description": "Search domain as list of tuples",
+                                "default": []
+                            },
+                            "fields": {
+                                "type": "array",
+                                "description": "Fields to export",
+                                "items": {"type": "string"},
+                                "default": []
+                            },
+                            "chunk_size": {
+                                "type": "integer",
+                                "description": "Records fetched per round trip",
+                                "default": EXPORT_CHUNK_SIZE
+                            },
+                            "max_records": {
+                                "type": "integer",
+                                "description": f"Stop after this many records (inline exports are capped at {EXPORT_INLINE_LIMIT})"
+                            },
+                            "output_path": {
+                                "type": "string",
+                                "description": "Write records to this local file instead of returning them"
+                            },
+                            "file_format": {
+                                "type": "string",
+                                "enum": ["ndjson", "csv"],
+                                "description": "Format of output_path",
+                                "default": "ndjson"
+                            },
+                            "store": {
+                                "type": "boolean",
+                                "description": "Keep every exported record on the server, without the inline cap, and return "
+                                               "a result set handle to query with odoo_resultset",
+                                "default": False
+                            },
+                            "format": FORMAT_PROPERTY,
+                            "compact": COMPACT_PROPERTY
+                        },
+                        "required": ["model"]
+                    }
+                ),
+                Tool(
+                    name="odoo_aggregate",
+                    description="Count, sum or average records per group with Odoo's read_group and return a compact table",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "model": {
+                                "type": "string",
+                                "description": "The Odoo model to aggregate (e.g., 'sale.order')"
+                            },
+                            "domain": {
+                                "type": "array",
+                                "description": "Search domain selecting the records to aggregate",
+                                "default": []
+                            },
+                            "groupby": {
+                                "type": "array",
+                                "description": "Fields to group by; date fields take a granularity (e.g., ['user_id', 'date_order:month'])",
+                                "items": {"type": "string"},
+                                "default": []
+                            },
+                            "aggregates": {
+                                "type": "array",
+                                "description": f"Values to compute per group as 'field:function' or 'field' for the field's default ({', '.join(AGGREGATE_FUNCTIONS)}); a record count is always included",
+                                "items": {"type": "string"},
+                                "default": []
+                            },
+                            "lazy": {
+                                "type": "boolean",
+                                "description": "Group by the first groupby field only, like Odoo's list view; otherwise every combination is returned",
+                                "default": False
+                            },
+                            "orderby": {
+                                "type": "string",
+                                "description": "Sort groups (e.g., 'amount_total desc')"
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "description": "Maximum number of groups to return"
+                            },
+                            "offset": {
+                                "type": "integer",
+                                "description": "Number of groups to skip",
+                                "default": 0
+                            }
+                        },
+                        "required": ["model"]
+                    }
+                ),
+                Tool(
+                    name="odoo_changes",
+                    description="Fetch records created or modified since a watermark token; returns next_token for the following call",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "model": {
+                                "type": "string",
+                                "description": "The Odoo model to watch (e.g., 'sale.order')"
+                            },
+                            "token": {
+                                "type": "string",
+                                "description": "next_token from a previous odoo_changes call; omit to start from 'since' or from the oldest record"
+                            },
+                            "since": {
+                                "type": "string",
+                                "description": "Start from this write_date (e.g., '2024-05-01 00:00:00') when no token is given"
+                            },
+                            "domain": {
+                                "type": "array",
+                                "description": "Only report changed records matching this domain",
+                                "default": []
+                            },
+                            "fields": {
+                                "type": "array",
+                                "description": "Fields to retrieve",
+                                "items": {"type": "string"},
+                                "default": []
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "description": "Maximum number of records to return; has_more tells whether to call again",
+                                "default": CHANGES_LIMIT
+                            },
+                            "format": FORMAT_PROPERTY,
+                            "compact": COMPACT_PROPERTY
+                        },
+                        "required": ["model"]
+                    }
+                ),
+                Tool(
+                    name="odoo_fetch_binary",
+                    description="Save one binary field or attachment (e.g. a product image) to a local file",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "model": {
+                                "type": "string",
+                                "description": "The Odoo model holding the binary field"
+                            },
+                            "id": {
+                                "type": "integer",
+                                "description": "Record ID"
+                            },
+                            "field": {
+                                "type": "string",
+                                "description": "Binary field name (e.g., 'image_1920')"
+                            },
+                            "attachment_id": {
+                                "type": "integer",
+                                "description": "Fetch this ir.attachment directly instead of looking it up by model/id/field"
+                            },
+                            "output_path": {
+                                "type": "string",
+                                "description": "Local file to write the decoded content to"
+                            }
+                        },
+                        "required": ["output_path"]
+                    }
+                ),
                 Tool(
                     name="odoo_create",
                     description="Create a new record in an Odoo model",
@@ -161,6 +758,184 @@ class OdooMCPServer:
                         "required": ["model", "ids", "values"]
                     }
                 ),
+                Tool(
+                    name="odoo_create_batch",
+                    description="Create many records in an Odoo model with a few multi-create calls",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "model": {
+                                "type": "string",
+                                "description": "The Odoo model to create records in"
+                            },
+                            "records": {
+                                "type": "array",
+                                "description": "Field values for each new record",
+                                "items": {"type": "object"}
+                            },
+                            "chunk_size": {
+                                "type": "integer",
+                                "description": "Records sent per create call",
+                                "default": BATCH_CHUNK_SIZE
+                            }
+                        },
+                        "required": ["model", "records"]
+                    }
+                ),
+                Tool(
+                    name="odoo_write_batch",
+                    description="Apply many updates to an Odoo model; updates with identical values are merged into one write",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "model": {
+                                "type": "string",
+                                "description": "The Odoo model to update"
+                            },
+                            "updates": {
+                                "type": "array",
+                                "description": "List of {ids, values} groups (e.g., [{'ids': [1, 2], 'values': {'list_price': 9.5}}])",
+                                "items": {
+                                    "type": "object",
+                                    "properties": {
+                                        "ids": {"type": "array", "items": {"type": "integer"}},
+                                        "values": {"type": "object"}
+                                    },
+                                    "required": ["ids", "values"]
+                                }
+                            },
+                            "chunk_size": {
+                                "type": "integer",
+                                "description": "Record ids sent per write call",
+                                "default": BATCH_CHUNK_SIZE
+                            }
+                        },
+                        "required": ["model", "updates"]
+                    }
+                ),
+                Tool(
+                    name="odoo_execute",
+                    description="Run several Odoo model methods in one call (e.g. name_search, default_get, onchange, "
+                                "action_confirm); independent operations run concurrently and "
+                                "{'$ref': 'step.path'} arguments use results of earlier operations",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "operations": {
+                                "type": "array",
+                                "description": "Operations in order, e.g. [{'id': 'so', 'model': 'sale.order', "
+                                               "'method': 'search', 'args': [[['state', '=', 'draft']]], "
+                                               "'kwargs': {'limit': 5}}, {'model': 'sale.order', 'method': "
+                                               "'action_confirm', 'args': [{'$ref': 'so'}]}]. A $ref path walks "
+                                               "into the result: 'partners.0.id', 'partners.*.id'",
+                                "minItems": 1,
+                                "maxItems": EXECUTE_MAX_OPERATIONS,
+                                "items": {
+                                    "type": "object",
+                                    "properties": {
+                                        "id": {
+                                            "type": "string",
+                                            "description": "Name later operations use in $ref (default: the position)"
+                                        },
+                                        "model": {"type": "string"},
+                                        "method": {"type": "string"},
+                                        "args": {"type": "array", "default": []},
+                                        "kwargs": {"type": "object", "default": {}}
+                                    },
+                                    "required": ["model", "method"]
+                                }
+                            },
+                            "compact": COMPACT_PROPERTY
+                        },
+                        "required": ["operations"]
+                    }
+                ),
+                Tool(
+                    name="odoo_resultset",
+                    description="Filter, sort, project, slice or group a result set stored by odoo_search or odoo_export "
+                                "with 'store': true, locally and without calling Odoo",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "handle": {
+                                "type": "string",
+                                "description": "Result set handle returned by a search or export with 'store': true"
+                            },
+                            "where": {
+                                "type": "array",
+                                "description": "Domain over the stored fields, e.g. [['state', '=', 'sale'], ['amount_total', '>', 1000]]; "
+                                               "supports '&', '|', '!', comparisons, in/not in and the like operators",
+                                "default": []
+                            },
+                            "order": {
+                                "type": "string",
+                                "description": "Sort order (e.g., 'amount_total desc, name')"
+                            },
+                            "fields": {
+                                "type": "array",
+                                "description": "Fields to return (default: every stored field)",
+                                "items": {"type": "string"},
+                                "default": []
+                            },
+                            "offset": {
+                                "type": "integer",
+                                "description": "Number of matching rows or groups to skip",
+                                "default": 0
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "description": "Maximum number of rows or groups to return (default 10; every match when storing)"
+                            },
+                            "groupby": {
+                                "type": "array",
+                                "description": "Group the matching rows by these fields, with 'field:granularity' for dates "
+                                               f"({', '.join(GROUPBY_GRANULARITIES)})",
+                                "items": {"type": "string"},
+                                "default": []
+                            },
+                            "aggregates": {
+                                "type": "array",
+                                "description": f"Values to compute per group as 'field:function' or 'field' for a sum ({', '.join(AGGREGATE_FUNCTIONS)}); "
+                                               "a row count is always included",
+                                "items": {"type": "string"},
+                                "default": []
+                            },
+                            "store": {
+                                "type": "boolean",
+                                "description": "Store the matching rows as a new result set and return its handle",
+                                "default": False
+                            },
+                            "drop": {
+                                "type": "boolean",
+                                "description": "Release the result set and its memory",
+                                "default": False
+                            },
+                            "format": FORMAT_PROPERTY,
+                            "compact": COMPACT_PROPERTY
+                        },
+                        "required": ["handle"]
+                    }
+                ),
+                Tool(
+                    name="odoo_invalidate_cache",
+                    description="Drop cached model metadata and/or records so they are reloaded from Odoo",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "model": {
+                                "type": "string",
+                                "description": "Only invalidate this model (default: everything)"
+                            },
+                            "cache": {
+                                "type": "string",
+                                "enum": ["all", "metadata", "records"],
+                                "description": "Which cache to invalidate",
+                                "default": "all"
+                            }
+                        },
+                        "required": []
+                    }
+                ),
                 Tool(
                     name="odoo_test_connection",
                     description="Test the connection to Odoo instance",
@@ -171,23 +946,127 @@ class OdooMCPServer:
                     }
                 )
             ]
+            for tool in tools:
+                tool.inputSchema["properties"]["profile"] = {
+                    "type": "string",
+                    "description": f"Odoo profile to use: {', '.join(ODOO_PROFILES)} (default: {ODOO_DEFAULT_PROFILE})"
+                }
+            self.tools = tuple(tools)
+            return list(self.tools)
 
-        @self.server.call_tool()
-        async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent]:
-            """Handle tool calls."""
+        # Input validation is done here with validators compiled once per tool;
+        # the SDK's jsonschema.validate() rebuilds the validator on every call
+        @self.server.call_tool(validate_input=False)
+        async def handle_call_tool(name: str, arguments: dict):
+            """Handle tool calls on the requested profile, recording their latency and response size."""
+            start = time.perf_counter()
+            validator = self.tool_validators.get(name)
+            if validator is None:
+                tool = next((tool for tool in await handle_list_tools() if tool.name == name), None)
+                if tool is not None:
+                    validator = self.tool_validators[name] = (
+                        jsonschema.validators.validator_for(tool.inputSchema)(tool.inputSchema)
+                    )
+            error = next(validator.iter_errors(arguments), None) if validator else None
+            if error is not None:
+                return types.CallToolResult(
+                    content=[types.TextContent(type="text", text=f"Input validation error: {error.message}")],
+                    isError=True,
+                )
+            profile = arguments.get("profile") or ODOO_DEFAULT_PROFILE
             try:
+                self.profiles.acquire(profile)
+            except Exception as e:
+                output = [types.TextContent(type="text", text=f"Error: {str(e)}")]
+            else:
+                token = _current_profile.set(profile)
+                try:
+                    async with self._session_slot():
+                        output = await dispatch_tool(name, arguments)
+                finally:
+                    _current_profile.reset(token)
+                    self.profiles.release(profile)
+            content = output[0] if isinstance(output, tuple) else output
+            texts = [c.text for c in content if isinstance(c, types.TextContent)]
+            self.metrics.record_tool(
+                name, time.perf_counter() - start, sum(len(text.encode()) for text in texts),
+                error=bool(texts) and texts[0].startswith(("Error:", '{"error"'))
+            )
+            return output
+
+        async def dispatch_tool(name: str, arguments: dict):
+            """Run a tool and build its output."""
+            try:
+                compact = arguments.get("compact", ODOO_COMPACT_OUTPUT)
+                columnar = arguments.get("format", ODOO_OUTPUT_FORMAT) == "columnar"
                 if name == "odoo_search":
                     result = await self._search_records(
                         arguments["model"],
                         arguments.get("domain", []),
                         arguments.get("fields", []),
-                        arguments.get("limit", 10)
+                        arguments.get("limit", 10),
+                        offset=arguments.get("offset", 0),
+                        order=arguments.get("order"),
+                        count=arguments.get("count", False),
+                        cursor=arguments.get("cursor"),
+                        max_staleness=arguments.get("max_staleness"),
+                        expand=arguments.get("expand"),
+                        store=arguments.get("store", False)
+                    )
+                elif name == "odoo_export":
+                    result = await self._export_records(
+                        arguments["model"],
+                        arguments.get("domain", []),
+                        arguments.get("fields", []),
+                        chunk_size=arguments.get("chunk_size", EXPORT_CHUNK_SIZE),
+                        max_records=arguments.get("max_records"),
+                        output_path=arguments.get("output_path"),
+                        file_format=arguments.get("file_format", "ndjson"),
+                        compact=compact,
+                        columnar=columnar,
+                        store=arguments.get("store", False)
+                    )
+                    chunks = result.pop("chunks", [])
+                    return self._tool_output(result, compact, [
+                        types.TextContent(type="text", text=chunk) for chunk in chunks
+                    ])
+                elif name == "odoo_aggregate":
+                    result = await self._aggregate_records(
+                        arguments["model"],
+                        arguments.get("domain", []),
+                        arguments.get("groupby", []),
+                        arguments.get("aggregates", []),
+                        lazy=arguments.get("lazy", False),
+                        orderby=arguments.get("orderby"),
+                        limit=arguments.get("limit"),
+                        offset=arguments.get("offset", 0)
+                    )
+                elif name == "odoo_changes":
+                    result = await self._fetch_changes(
+                        arguments["model"],
+                        token=arguments.get("token"),
+                        since=arguments.get("since"),
+                        domain=arguments.get("domain", []),
+                        fields=arguments.get("fields", []),
+                        limit=arguments.get("limit", CHANGES_LIMIT)
                     )
                 elif name == "odoo_read":
                     result = await self._read_records(
                         arguments["model"],
                         arguments["ids"],
-                        arguments.get("fields", [])
+                        arguments.get("fields", []),
+                        validate=arguments.get("validate", False),
+                        max_staleness=arguments.get("max_staleness"),
+                        chunk_size=arguments.get("chunk_size", READ_CHUNK_SIZE),
+                        expand=arguments.get("expand")
+                    )
+                elif name == "odoo_fetch_binary":
+                    result = await self._fetch_binary(
+                        arguments.get("model"),
+                        arguments.get("id"),
+                        arguments.get("field"),
+                        arguments["output_path"],
+                        attachment_id=arguments.get("attachment_id")
                     )
                 elif name == "odoo_create":
                     result = await self._create_record(
@@ -200,117 +1079,770 @@ class OdooMCPServer:
                         arguments["ids"],
                         arguments["values"]
                     )
+                elif name == "odoo_create_batch":
+                    result = await self._create_batch(
+                        arguments["model"],
+                        arguments["records"],
+                        arguments.get("chunk_size", BATCH_CHUNK_SIZE)
+                    )
+                elif name == "odoo_write_batch":
+                    result = await self._write_batch(
+                        arguments["model"],
+                        arguments["updates"],
+                        arguments.get("chunk_size", BATCH_CHUNK_SIZE)
+                    )
+                elif name == "odoo_execute":
+                    result = await self._execute_operations(arguments["operations"])
+                elif name == "odoo_resultset":
+                    result = await self._query_resultset(
+                        arguments["handle"],
+                        where=arguments.get("where", []),
+                        order=arguments.get("order"),
+                        fields=arguments.get("fields", []),
+                        offset=arguments.get("offset", 0),
+                        limit=arguments.get("limit"),
+                        groupby=arguments.get("groupby", []),
+                        aggregates=arguments.get("aggregates", []),
+                        store=arguments.get("store", False),
+                        drop=arguments.get("drop", False)
+                    )
+                elif name == "odoo_invalidate_cache":
+                    result = self._invalidate_cache(arguments.get("model"), arguments.get("cache", "all"))
                 elif name == "odoo_test_connection":
                     result = await self._test_connection()
                 else:
                     raise ValueError(f"Unknown tool: {name}")
-                
-                return [types.TextContent(type="text", text=str(result))]
+
+                if columnar and "records" in result:
+                    result.update(serialization.columnar(result.pop("records")))
+                    # Columns already carry many2one ids and names apart and need no key compaction
+                    compact = False
+                return self._tool_output(result, compact)
             
             except Exception as e:
                 return [types.TextContent(type="text", text=f"Error: {str(e)}")]
 
-    async def _get_odoo_connection(self):
-        """Get Odoo XML-RPC connection."""
+    def _session_slot(self):
+        """Limit the tool calls one client session runs at once, so a busy client cannot starve the others."""
         try:
-            # Test connection with common endpoint
-            common = xmlrpc.client.ServerProxy(f'{self.odoo_url}/xmlrpc/2/common')
-            version = common.version()
-            
-            # Authenticate with password
-            if not ODOO_PASSWORD:
-                raise Exception("ODOO_PASSWORD is required for authentication")
-            
-            uid = common.authenticate(self.odoo_db, ODOO_USERNAME, ODOO_PASSWORD, {})
-            
-            if not uid:
-                raise Exception("Authentication failed - check your credentials")
-            
-            # Get models proxy
-            models = xmlrpc.client.ServerProxy(f'{self.odoo_url}/xmlrpc/2/object')
-            
-            return models, uid, ODOO_PASSWORD
-        except Exception as e:
-            raise Exception(f"Failed to connect to Odoo: {str(e)}")
+            session = self.server.request_context.session
+        except LookupError:
+            return contextlib.nullcontext()
+        if ODOO_MCP_SESSION_CONCURRENCY <= 0:
+            return contextlib.nullcontext()
+        slots = self.session_slots.get(session)
+        if slots is None:
+            slots = self.session_slots[session] = asyncio.Semaphore(ODOO_MCP_SESSION_CONCURRENCY)
+        return slots
+
+    def _client_supports_structured_content(self) -> bool:
+        """Check whether the current client negotiated a protocol with structuredContent."""
+        try:
+            params = self.server.request_context.session.client_params
+        except LookupError:
+            return False
+        version = params.protocolVersion if params else None
+        return version is not None and str(version) >= STRUCTURED_CONTENT_PROTOCOL
+
+    def _tool_output(self, result: dict, compact: bool = False, extra_content: Optional[list] = None):
+        """Serialize a tool result as JSON text, plus structured content when the client supports it.
+
+        A result with extra content parts (inline export chunks) is sent as text
+        only: clients prefer structuredContent and would never see the parts.
+        """
+        with self.metrics.span("encode"):
+            if compact:
+                result = serialization.compact(result)
+            content = [types.TextContent(type="text", text=serialization.dumps(result))]
+        content.extend(extra_content or [])
+        if not extra_content and self._client_supports_structured_content():
+            return content, result
+        return content
+
+    def _profile(self) -> OdooProfile:
+        """The profile of the tool call or resource read being handled."""
+        return self.profiles.get(_current_profile.get())
+
+    # The current profile's session and caches, so tool code can stay profile-agnostic
+    session = property(lambda self: self._profile().session)
+    executor = property(lambda self: self._profile().executor)
+    metadata = property(lambda self: self._profile().metadata)
+    record_cache = property(lambda self: self._profile().record_cache)
+    mirror = property(lambda self: self._profile().mirror)
+    change_tokens = property(lambda self: self._profile().change_tokens)
+
+    async def _get_odoo_connection(self) -> "OdooSession":
+        """Get the current profile's pooled Odoo session, authenticating on first use."""
+        return await self._profile().connection()
+
+    async def _execute_kw(self, model: str, method: str, args: list, kwargs: Optional[dict] = None) -> Any:
+        """Run an Odoo ORM call on the current profile."""
+        return await self._profile().execute_kw(model, method, args, kwargs)
+
+    async def _compile_domain(self, model: str, domain: list) -> list:
+        """Validate and normalize a search domain against the model's cached fields."""
+        try:
+            fields = await self.metadata.fields(model)
+        except Exception:
+            # Without metadata only the domain's structure is checked; Odoo validates the rest
+            fields = None
+        return compile_domain(domain, model, fields, ODOO_DOMAIN_PREFIX_FIELDS.get(model, ()))
 
     async def _check_connection(self) -> str:
         """Check Odoo connection status."""
         try:
-            models, uid, auth_credential = await self._get_odoo_connection()
-            return f"✅ Connected to Odoo successfully!\nDatabase: {self.odoo_db}\nUser ID: {uid}\nURL: {self.odoo_url}"
+            session = await self._get_odoo_connection()
+            config = self._profile().config
+            return f"✅ Connected to Odoo successfully!\nProfile: {config.name}\nDatabase: {config.db}\nUser ID: {session.uid}\nURL: {config.url}"
         except Exception as e:
             return f"❌ Connection failed: {str(e)}"
 
     async def _get_models(self) -> str:
         """Get list of available Odoo models."""
         try:
-            models, uid, auth_credential = await self._get_odoo_connection()
-            model_list = models.execute_kw(
-                self.odoo_db, uid, auth_credential,
-                'ir.model', 'search_read',
-                [[]],
-                {'fields': ['model', 'name'], 'limit': 50}
-            )
-            return str(model_list)
+            model_list = await self.metadata.models()
+            return serialization.dumps(model_list)
         except Exception as e:
             return f"Error getting models: {str(e)}"
 
-    async def _search_records(self, model: str, domain: list, fields: list, limit: int) -> dict:
-        """Search for records in Odoo model."""
+    async def _get_model_fields(self, model: str) -> str:
+        """Get cached field definitions of an Odoo model."""
         try:
-            models, uid, auth_credential = await self._get_odoo_connection()
-            
-            # Search for record IDs
-            record_ids = models.execute_kw(
-                self.odoo_db, uid, auth_credential,
-                model, 'search',
-                [domain],
-                {'limit': limit}
+            fields = await self.metadata.fields(model)
+            return serialization.dumps({"model": model, "fields": fields})
+        except Exception as e:
+            return f"Error getting fields of {model}: {str(e)}"
+
+    def _invalidate_cache(self, model: Optional[str] = None, cache: str = "all") -> dict:
+        """Drop cached metadata and/or records for a model, or for every model."""
+        if cache not in ("all", "metadata", "records"):
+            return {"error": f"Unknown cache: {cache}"}
+        if cache in ("all", "metadata"):
+            self.metadata.invalidate(model)
+        if cache in ("all", "records"):
+            self.record_cache.evict(model)
+        return {"message": f"Invalidated {cache} cache for {model or 'all models'}"}
+
+    def _mark_mirror_stale(self, model: str):
+        """Make the next bounded read of a mirrored model sync first, so it sees our own writes."""
+        if self.mirror and self.mirror.mirrors(model):
+            self.mirror.mark_stale(model)
+
+    def _cache_stats(self) -> dict:
+        """Collect cache statistics."""
+        profile = self._profile()
+        stats = {
+            "profile": profile.config.name,
+            "metadata": profile.metadata.stats(),
+            "records": profile.record_cache.stats(),
+        }
+        if profile.single_flight:
+            stats["single_flight"] = {"calls": profile.single_flight.calls, "shared": profile.single_flight.shared}
+        if profile.read_batcher:
+            stats["read_batching"] = profile.read_batcher.stats()
+        if profile.mirror:
+            stats["mirror"] = profile.mirror.stats()
+        stats["resultsets"] = self.resultsets.stats()
+        return stats
+
+    async def _search_records(self, model: str, domain: list, fields: list, limit: int,
+                              offset: int = 0, order: Optional[str] = None, count: bool = False,
+                              cursor: Optional[str] = None, max_staleness: Optional[float] = None,
+                              expand: Optional[dict] = None, store: bool = False) -> dict:
+        """Search for records in Odoo model with a single search_read call."""
+        try:
+            if cursor:
+                state = _decode_cursor(cursor)
+                if state["model"] != model:
+                    raise ValueError(f"Cursor belongs to model {state['model']}, not {model}")
+                domain, fields, limit, offset, order = (
+                    state["domain"], state["fields"], state["limit"], state["offset"], state["order"]
+                )
+                expand = state.get("expand")
+            spec = parse_expand(expand, EXPAND_MAX_DEPTH) if expand else None
+
+            domain = await self._compile_domain(model, domain)
+            if is_false_domain(domain):
+                result = {"message": "No records found", "records": [], "offset": offset, "next_cursor": None}
+                if count:
+                    result["total"] = 0
+                return await self._store_records(model, result) if store else result
+            query_fields = _with_expanded(fields, spec)
+            read_fields, binary_fields, omitted = await self._resolve_fields(model, query_fields)
+
+            records, mirror_age = None, None
+            if max_staleness is not None and self.mirror and self.mirror.mirrors(model):
+                try:
+                    age = await self.mirror.ensure_fresh(model, max_staleness)
+                    records, total = self.mirror.search(model, domain, query_fields, limit, offset, order, count)
+                    mirror_age = age
+                    # The mirror holds no binary fields, so there are no attachment references to add
+                    omitted = binary_fields + omitted
+                except MirrorUnsupported:
+                    pass
+            if records is None:
+                kwargs = {'limit': limit, 'offset': offset}
+                if read_fields:
+                    kwargs['fields'] = read_fields
+                if order:
+                    kwargs['order'] = order
+
+                calls = [self._execute_kw(model, 'search_read', [domain], kwargs)]
+                if count:
+                    calls.append(self._execute_kw(model, 'search_count', [domain]))
+                results = await asyncio.gather(*calls)
+                records = results[0]
+                total = results[1] if count else None
+                if binary_fields:
+                    records = await self._attach_binary_refs(model, records, binary_fields)
+
+            has_more = bool(limit) and len(records) == limit
+            if total is not None:
+                has_more = offset + len(records) < total
+            next_cursor = _encode_cursor({
+                "model": model, "domain": domain, "fields": fields,
+                "limit": limit, "offset": offset + len(records), "order": order,
+                **({"expand": expand} if expand else {}),
+            }) if has_more else None
+            if spec:
+                records = await self._expand_records(model, records, spec)
+
+            result = {
+                "message": f"Found {len(records)} records" if records else "No records found",
+                "records": records,
+                "offset": offset,
+                "next_cursor": next_cursor,
+            }
+            if total is not None:
+                result["total"] = total
+            if omitted:
+                result["omitted_fields"] = omitted
+            if mirror_age is not None:
+                result["mirror_age"] = round(mirror_age, 3)
+            return await self._store_records(model, result) if store else result
+        
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def _store_records(self, model: str, result: dict) -> dict:
+        """Move a result's records into the result set store and return its handle in their place."""
+        result_set = await asyncio.to_thread(ResultSet, model, result.pop("records"), self._profile().config.name)
+        handle = self.resultsets.add(result_set)
+        result["message"] = f"Stored {result_set.count} records as result set {handle}"
+        result["resultset"] = resultsets.describe(handle, result_set)
+        return result
+
+    async def _query_resultset(self, handle: str, where: Optional[list] = None, order: Optional[str] = None,
+                               fields: Optional[list] = None, offset: int = 0, limit: Optional[int] = None,
+                               groupby: Optional[list] = None, aggregates: Optional[list] = None,
+                               store: bool = False, drop: bool = False) -> dict:
+        """Filter, sort, project, slice or group a stored result set without calling Odoo."""
+        try:
+            result_set = self.resultsets.get(handle)
+            profile = self._profile().config.name
+            if result_set.profile != profile:
+                raise resultsets.ResultSetError(f"Result set {handle!r} belongs to profile {result_set.profile!r}, not {profile!r}")
+            if drop:
+                self.resultsets.drop(handle)
+                return {"message": f"Dropped result set {handle}"}
+            if store and groupby:
+                raise ValueError("Grouped results cannot be stored; store the filtered rows and group those")
+            if limit is None:
+                limit = 0 if store else 10
+            offset = max(0, offset)
+
+            def run() -> dict:
+                # Plain Python over every row: keep it off the event loop for large sets
+                indices = resultsets.select(result_set, where or [], None if groupby else order)
+                end = offset + limit if limit else None
+                if groupby:
+                    columns, rows = resultsets.group(result_set, indices, groupby, aggregates or [], order)
+                    return {"message": f"Found {len(rows)} groups" if rows else "No matching records",
+                            "columns": columns, "rows": rows[offset:end],
+                            "total": len(rows), "offset": offset}
+                records = result_set.rows(indices[offset:end], fields or result_set.fields)
+                return {"message": f"Found {len(records)} of {len(indices)} matching records", "records": records,
+                        "total": len(indices), "offset": offset}
+
+            result = await asyncio.to_thread(run)
+            if store:
+                derived = await asyncio.to_thread(ResultSet.from_rows, result_set, result["records"])
+                derived_handle = self.resultsets.add(derived)
+                return {
+                    "message": f"Stored {derived.count} of {result_set.count} records as result set {derived_handle}",
+                    "resultset": resultsets.describe(derived_handle, derived),
+                }
+            return result
+
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def _aggregate_records(self, model: str, domain: list, groupby: list, aggregates: list,
+                                 lazy: bool = False, orderby: Optional[str] = None,
+                                 limit: Optional[int] = None, offset: int = 0) -> dict:
+        """Aggregate records per group with a single read_group call."""
+        try:
+            for spec in groupby:
+                granularity = spec.partition(':')[2]
+                if granularity and granularity not in GROUPBY_GRANULARITIES:
+                    raise ValueError(f"Unknown granularity {granularity!r} in {spec!r}, "
+                                     f"expected one of {', '.join(GROUPBY_GRANULARITIES)}")
+
+            # Each aggregate is requested under an alias so one field can be aggregated several ways
+            read_fields, keys = [], []
+            for spec in aggregates:
+                field, _, func = spec.partition(':')
+                if func and func not in AGGREGATE_FUNCTIONS:
+                    raise ValueError(f"Unknown aggregate function {func!r} in {spec!r}, "
+                                     f"expected one of {', '.join(AGGREGATE_FUNCTIONS)}")
+                key = f"{field}_{func}" if func else field
+                read_fields.append(f"{key}:{func}({field})" if func else field)
+                keys.append(key)
+
+            domain = await self._compile_domain(model, domain)
+            kwargs = {'lazy': lazy, 'offset': offset}
+            if limit:
+                kwargs['limit'] = limit
+            if orderby:
+                kwargs['orderby'] = orderby
+            groups = [] if is_false_domain(domain) else await self._execute_kw(
+                model, 'read_group', [domain, read_fields, groupby], kwargs
             )
-            
-            if not record_ids:
-                return {"message": "No records found", "records": []}
-            
-            # Read the records
-            records = models.execute_kw(
-                self.odoo_db, uid, auth_credential,
-                model, 'read',
-                [record_ids],
-                {'fields': fields} if fields else {}
+
+            group_columns = groupby[:1] if lazy else groupby
+            count_key = f"{groupby[0].partition(':')[0]}_count" if lazy and groupby else '__count'
+            rows = []
+            for group in groups:
+                row = [group.get(spec, group.get(spec.partition(':')[0], False)) for spec in group_columns]
+                row.append(group.get(count_key, 0))
+                row.extend(group.get(key, False) for key in keys)
+                rows.append(row)
+
+            result = {
+                "message": f"Found {len(rows)} groups" if rows else "No matching records",
+                "columns": [*group_columns, "count", *aggregates],
+                "rows": rows,
+            }
+            if lazy and len(groupby) > 1:
+                result["remaining_groupby"] = groupby[1:]
+            return result
+
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def _fetch_changes(self, model: str, token: Optional[str] = None, since: Optional[str] = None,
+                             domain: Optional[list] = None, fields: Optional[list] = None,
+                             limit: int = CHANGES_LIMIT) -> dict:
+        """Fetch records changed after a write_date watermark, oldest first."""
+        try:
+            write_date, seen = None, []
+            if token:
+                state = _decode_cursor(token)
+                if state.get("model") != model:
+                    raise ValueError(f"Token belongs to model {state.get('model')}, not {model}")
+                write_date, seen = state["write_date"], state["ids"]
+            elif since:
+                write_date = since
+
+            domain = await self._compile_domain(model, domain or [])
+            if is_false_domain(domain):
+                return {"message": "No changes", "records": [], "next_token": token, "has_more": False}
+            if write_date:
+                # Records stamped in the watermark's second may still arrive (with any id),
+                # so only the ones already returned are skipped
+                domain = domain + watermark_domain(write_date, seen)
+
+            read_fields, binary_fields, omitted = await self._resolve_fields(model, fields or [])
+            if read_fields and 'write_date' not in read_fields:
+                read_fields = read_fields + ['write_date']
+            kwargs = {'limit': limit, 'order': 'write_date asc, id asc'}
+            if read_fields:
+                kwargs['fields'] = read_fields
+            records = await self._execute_kw(model, 'search_read', [domain], kwargs)
+            if records:
+                # Whatever shows up here changed after the caller's watermark
+                self.record_cache.evict(model, [r['id'] for r in records])
+                last = records[-1]['write_date']
+                at_last = [r['id'] for r in records if r['write_date'] == last]
+                token = _encode_cursor({
+                    "model": model, "write_date": last,
+                    "ids": (seen if last == write_date else []) + at_last,
+                })
+            elif write_date and not token:
+                token = _encode_cursor({"model": model, "write_date": write_date, "ids": []})
+            if binary_fields:
+                records = await self._attach_binary_refs(model, records, binary_fields)
+
+            result = {
+                "message": f"Found {len(records)} changed records" if records else "No changes",
+                "records": records,
+                "next_token": token,
+                "has_more": bool(limit) and len(records) == limit,
+            }
+            if omitted:
+                result["omitted_fields"] = omitted
+            return result
+
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def _read_changes_resource(self, model: str) -> str:
+        """Return changes since the last read of odoo://changes/{model} and advance its watermark."""
+        token = self.change_tokens.get(model)
+        if token is None:
+            # First read: start watching from the most recent write_date
+            latest = await self._execute_kw(
+                model, 'search_read', [[]],
+                {'fields': ['write_date'], 'order': 'write_date desc', 'limit': 1}
             )
-            
-            return {"message": f"Found {len(records)} records", "records": records}
+            write_date = latest[0]['write_date'] if latest else "1970-01-01 00:00:00"
+            ids = await self._execute_kw(model, 'search', [second_domain(write_date)])
+            token = _encode_cursor({"model": model, "write_date": write_date, "ids": ids})
+            result = {"message": f"Watching {model} for changes", "records": [], "next_token": token, "has_more": False}
+        else:
+            result = await self._fetch_changes(model, token)
+        if result.get("next_token"):
+            self.change_tokens[model] = result["next_token"]
+        return serialization.dumps(result)
+
+    async def _report_progress(self, progress: float, total: Optional[float] = None, message: Optional[str] = None):
+        """Send an MCP progress notification if the caller asked for one."""
+        try:
+            ctx = self.server.request_context
+        except LookupError:
+            return
+        token = ctx.meta.progressToken if ctx.meta else None
+        if token is not None:
+            await ctx.session.send_progress_notification(token, progress, total, message)
+
+    async def _export_records(self, model: str, domain: list, fields: list, chunk_size: int = EXPORT_CHUNK_SIZE,
+                              max_records: Optional[int] = None, output_path: Optional[str] = None,
+                              file_format: str = "ndjson", compact: bool = False, columnar: bool = False,
+                              store: bool = False) -> dict:
+        """Export records chunk by chunk using id-range keyset pagination."""
+        try:
+            if file_format not in ("ndjson", "csv"):
+                raise ValueError(f"Unsupported file format: {file_format}")
+            if columnar and output_path:
+                raise ValueError("The columnar format applies to inline exports; use file_format for files")
+            if store and output_path:
+                raise ValueError("Choose either store or output_path")
+            if output_path:
+                output_path = _resolve_output_path(output_path)
+            chunk_size = max(1, chunk_size)
+            if not output_path and not store:
+                max_records = min(max_records or EXPORT_INLINE_LIMIT, EXPORT_INLINE_LIMIT)
+            domain = await self._compile_domain(model, domain)
+            matches_nothing = is_false_domain(domain)
+
+            total = None
+            try:
+                has_progress = self.server.request_context.meta.progressToken is not None
+            except (LookupError, AttributeError):
+                has_progress = False
+            if has_progress and not matches_nothing:
+                total = await self._execute_kw(model, 'search_count', [domain])
+                if max_records:
+                    total = min(total, max_records)
+
+            fields, binary_fields, _omitted = await self._resolve_fields(model, fields)
+            handle = open(output_path, "w", newline="", encoding="utf-8") if output_path else None
+            writer = None
+            chunks = []
+            stored, stored_size = [], 0
+            exported = 0
+            last_id = 0
+            try:
+                while not matches_nothing and (not max_records or exported < max_records):
+                    limit = chunk_size if not max_records else min(chunk_size, max_records - exported)
+                    kwargs = {'limit': limit, 'order': 'id asc'}
+                    if fields:
+                        kwargs['fields'] = fields
+                    records = await self._execute_kw(
+                        model, 'search_read',
+                        [list(domain) + [['id', '>', last_id]]],
+                        kwargs
+                    )
+                    if not records:
+                        break
+                    if binary_fields:
+                        records = await self._attach_binary_refs(model, records, binary_fields)
+
+                    if compact and not columnar and not store and (handle is None or file_format == "ndjson"):
+                        records = serialization.compact(records)
+                    if store:
+                        # Stop before holding more raw records than the store could ever keep
+                        stored_size += ResultSet(model, records, "").size
+                        if stored_size > self.resultsets.budget:
+                            raise resultsets.ResultSetError(
+                                f"Export exceeds the {self.resultsets.budget // 1024} KiB result set budget; "
+                                "narrow the domain, select fewer fields or set max_records"
+                            )
+                        stored.extend(records)
+                    elif handle is None:
+                        chunks.append(serialization.dumps(serialization.columnar(records) if columnar else records))
+                    elif file_format == "ndjson":
+                        handle.write("".join(serialization.dumps(r) + "\n" for r in records))
+                    else:
+                        if writer is None:
+                            writer = csv.DictWriter(handle, fieldnames=list(records[0]), extrasaction="ignore")
+                            writer.writeheader()
+                        writer.writerows(_csv_row(r) for r in records)
+
+                    exported += len(records)
+                    last_id = records[-1]["id"]
+                    await self._report_progress(exported, total, f"Exported {exported} {model} records")
+                    if len(records) < limit:
+                        break
+            finally:
+                if handle is not None:
+                    handle.close()
+
+            result = {
+                "message": f"Exported {exported} records",
+                "count": exported,
+                "last_id": last_id,
+            }
+            if output_path:
+                result["output_path"] = os.path.abspath(output_path)
+                result["file_format"] = file_format
+            elif store:
+                result["records"] = stored
+                return await self._store_records(model, result)
+            else:
+                result["chunks"] = chunks
+            return result
+
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def _read_records(self, model: str, ids: list, fields: list, validate: bool = False,
+                            max_staleness: Optional[float] = None, chunk_size: int = READ_CHUNK_SIZE,
+                            expand: Optional[dict] = None) -> dict:
+        """Read specific records by IDs, serving what it can from the mirror or the record cache."""
+        try:
+            if expand:
+                spec = parse_expand(expand, EXPAND_MAX_DEPTH)
+                result = await self._read_records(model, ids, _with_expanded(fields, spec), validate,
+                                                  max_staleness, chunk_size)
+                if "records" in result:
+                    result["records"] = await self._expand_records(model, result["records"], spec)
+                return result
+
+            if max_staleness is not None and self.mirror and self.mirror.mirrors(model):
+                try:
+                    age = await self.mirror.ensure_fresh(model, max_staleness)
+                    records = self.mirror.read(model, ids, fields)
+                    _fields, binary_fields, omitted = await self._resolve_fields(model, fields)
+                    result = {"message": f"Read {len(records)} records", "records": records,
+                              "mirror_age": round(age, 3)}
+                    if binary_fields or omitted:
+                        result["omitted_fields"] = binary_fields + omitted
+                    return result
+                except MirrorUnsupported:
+                    pass
+
+            fields, binary_fields, omitted = await self._resolve_fields(model, fields)
+            missing = ids
+            if not self.record_cache.enabled(model):
+                records = await self._read_chunked(
+                    model, ids,
+                    {'fields': fields} if fields else {},
+                    chunk_size
+                )
+            else:
+                if validate:
+                    await self._revalidate_cached(model, ids)
+
+                found, missing = self.record_cache.get_many(model, ids, fields)
+                if missing:
+                    # Always fetch write_date so cached entries carry their stamp
+                    read_fields = fields + ['write_date'] if fields and 'write_date' not in fields else fields
+                    fetched = await self._read_chunked(
+                        model, list(dict.fromkeys(missing)),
+                        {'fields': read_fields} if read_fields else {},
+                        chunk_size
+                    )
+                    self.record_cache.put_many(model, fetched, read_fields)
+                    for record in fetched:
+                        if read_fields is not fields:
+                            record = {k: v for k, v in record.items() if k != 'write_date'}
+                        found[record['id']] = record
+                records = [found[rid] for rid in ids if rid in found]
+
+            if binary_fields:
+                records = await self._attach_binary_refs(model, records, binary_fields)
+            result = {"message": f"Read {len(records)} records", "records": records}
+            if self.record_cache.enabled(model):
+                result["cache_hits"] = len(ids) - len(missing)
+            if omitted:
+                result["omitted_fields"] = omitted
+            return result
         
         except Exception as e:
             return {"error": str(e)}
 
-    async def _read_records(self, model: str, ids: list, fields: list) -> dict:
-        """Read specific records by IDs."""
+    async def _read_chunked(self, model: str, ids: list, kwargs: dict, chunk_size: int = READ_CHUNK_SIZE) -> list:
+        """Read ids in chunks of chunk_size, READ_PARALLEL at a time, returning records in the order of ids.
+
+        Each chunk is its own bounded response, so no single call risks a proxy
+        timeout or parses the whole payload at once. A chunk that fails in
+        transport (timeout, dropped connection) is retried on its own; an Odoo
+        fault such as a missing record fails the read as before.
+        """
+        chunk_size = max(1, chunk_size)
+        if len(ids) <= chunk_size:
+            return await self._execute_kw(model, 'read', [ids], kwargs)
+
+        from xmlrpc.client import Fault
+
+        # The chunks are disjoint, so they skip the read batcher that would merge them again
+        profile = self._profile()
+        slots = asyncio.Semaphore(max(1, READ_PARALLEL))
+
+        async def read_chunk(chunk: list) -> list:
+            async with slots:
+                for attempt in range(READ_RETRIES + 1):
+                    try:
+                        return await profile.call_odoo(model, 'read', [chunk], kwargs)
+                    except Fault:
+                        raise
+                    except Exception:
+                        if attempt == READ_RETRIES:
+                            raise
+                        await asyncio.sleep(0.1 * 2 ** attempt)
+
+        unique = list(dict.fromkeys(ids))
+        chunks = await asyncio.gather(*(
+            read_chunk(unique[start:start + chunk_size]) for start in range(0, len(unique), chunk_size)
+        ))
+        by_id = {record['id']: record for rows in chunks for record in rows}
+        return [by_id[rid] for rid in ids if rid in by_id]
+
+    async def _expand_records(self, model: str, records: list, spec: dict) -> list:
+        """Nest related records into records as the parsed expand spec asks, reading each level in batches."""
+        async def read(related: str, ids: list, fields: list) -> list:
+            result = await self._read_records(related, ids, fields)
+            if "error" in result:
+                raise Exception(f"Expanding {related}: {result['error']}")
+            return result["records"]
+
+        return await expand_records(model, records, spec, self.metadata.fields, read)
+
+    async def _resolve_fields(self, model: str, fields: list) -> tuple:
+        """Pick the fields to fetch when the caller asked for none.
+
+        Returns (fields, binary_fields, omitted_fields). Binary fields are left out
+        of the default set and answered with attachment references instead; HTML
+        fields are left out entirely. Explicit field lists are used unchanged.
+        """
+        if fields:
+            return fields, [], []
         try:
-            models, uid, auth_credential = await self._get_odoo_connection()
-            
-            records = models.execute_kw(
-                self.odoo_db, uid, auth_credential,
-                model, 'read',
-                [ids],
-                {'fields': fields} if fields else {}
+            index = await self.metadata.fields(model)
+        except Exception:
+            # Without metadata fall back to Odoo's own default (every field)
+            return fields, [], []
+        light, binary, html = [], [], []
+        for name, info in index.items():
+            ftype = info.get('type')
+            if ftype == 'binary':
+                binary.append(name)
+            elif ftype == 'html':
+                html.append(name)
+            else:
+                light.append(name)
+        return light, binary, html
+
+    async def _attach_binary_refs(self, model: str, records: list, binary_fields: list) -> list:
+        """Replace binary field values with {attachment_id, size, checksum, mimetype} references."""
+        if not records:
+            return records
+        attachments = await self._execute_kw(
+            'ir.attachment', 'search_read',
+            [[['res_model', '=', model],
+              ['res_field', 'in', binary_fields],
+              ['res_id', 'in', [r['id'] for r in records]]]],
+            {'fields': ['res_id', 'res_field', 'file_size', 'checksum', 'mimetype']}
+        )
+        refs = {
+            (a['res_id'], a['res_field']): {
+                "attachment_id": a['id'],
+                "size": a['file_size'],
+                "checksum": a['checksum'],
+                "mimetype": a['mimetype'],
+            }
+            for a in attachments
+        }
+        return [
+            dict(record, **{field: refs.get((record['id'], field), False) for field in binary_fields})
+            for record in records
+        ]
+
+    async def _fetch_binary(self, model: str, record_id: int, field: str, output_path: str,
+                            attachment_id: Optional[int] = None) -> dict:
+        """Decode one binary field or attachment into a local file."""
+        try:
+            if not attachment_id and not (model and record_id and field):
+                raise ValueError("Give either attachment_id or all of model, id and field")
+            output_path = _resolve_output_path(output_path)
+            if attachment_id:
+                domain = [['id', '=', attachment_id]]
+            else:
+                domain = [['res_model', '=', model], ['res_field', '=', field], ['res_id', '=', record_id]]
+            attachments = await self._execute_kw(
+                'ir.attachment', 'search_read', [domain],
+                {'fields': ['datas', 'mimetype'], 'limit': 1}
             )
-            
-            return {"message": f"Read {len(records)} records", "records": records}
-        
+            if not attachments and attachment_id:
+                return {"error": f"Attachment {attachment_id} not found"}
+            if attachments:
+                data, mimetype = attachments[0]['datas'], attachments[0]['mimetype']
+            else:
+                # Binary field stored in the model's own table rather than as an attachment
+                rows = await self._execute_kw(model, 'read', [[record_id]], {'fields': [field]})
+                data, mimetype = (rows[0][field] if rows else False), None
+            if not data:
+                return {"error": f"No binary content for {model}({record_id}).{field}"}
+
+            size, digest = await asyncio.get_running_loop().run_in_executor(
+                None, _write_base64_file, data, output_path
+            )
+            return {
+                "message": f"Wrote {size} bytes to {os.path.abspath(output_path)}",
+                "output_path": os.path.abspath(output_path),
+                "size": size,
+                "checksum": digest,
+                "mimetype": mimetype,
+            }
+
         except Exception as e:
             return {"error": str(e)}
 
+    async def _revalidate_cached(self, model: str, ids: list):
+        """Evict cached records whose write_date no longer matches Odoo."""
+        stamps = self.record_cache.write_dates(model, ids)
+        if not stamps:
+            return
+        current = await self._execute_kw(
+            model, 'search_read',
+            [[['id', 'in', list(stamps)]]],
+            {'fields': ['write_date']}
+        )
+        current = {r['id']: r['write_date'] for r in current}
+        stale = [rid for rid, stamp in stamps.items() if current.get(rid) != stamp]
+        self.record_cache.evict(model, stale)
+
     async def _create_record(self, model: str, values: dict) -> dict:
         """Create a new record."""
         try:
-            models, uid, auth_credential = await self._get_odoo_connection()
-            
-            record_id = models.execute_kw(
-                self.odoo_db, uid, auth_credential,
-                model, 'create',
-                [values]
-            )
+            try:
+                record_id = await self._execute_kw(
+                    model, 'create',
+                    [values]
+                )
+            finally:
+                self._mark_mirror_stale(model)
             
             return {"message": f"Created record with ID: {record_id}", "id": record_id}
         
@@ -320,29 +1852,184 @@ class OdooMCPServer:
     async def _write_records(self, model: str, ids: list, values: dict) -> dict:
         """Update existing records."""
         try:
-            models, uid, auth_credential = await self._get_odoo_connection()
-            
-            success = models.execute_kw(
-                self.odoo_db, uid, auth_credential,
-                model, 'write',
-                [ids, values]
-            )
+            try:
+                success = await self._execute_kw(
+                    model, 'write',
+                    [ids, values]
+                )
+            finally:
+                self.record_cache.evict(model, ids)
+                self._mark_mirror_stale(model)
             
             return {"message": f"Updated {len(ids)} records", "success": success}
         
         except Exception as e:
             return {"error": str(e)}
 
+    async def _create_batch(self, model: str, records: list, chunk_size: int = BATCH_CHUNK_SIZE) -> dict:
+        """Create records with multi-create calls, isolating failures per item."""
+        from xmlrpc.client import Fault
+
+        try:
+            chunk_size = max(1, chunk_size)
+            ids = [None] * len(records)
+            errors = []
+            unknown = 0
+            for start in range(0, len(records), chunk_size):
+                chunk = records[start:start + chunk_size]
+                try:
+                    created = await self._execute_kw(model, 'create', [chunk])
+                    ids[start:start + len(chunk)] = created
+                except Fault:
+                    # Odoo rejected the chunk and rolled it back; retry item by item to find the culprits
+                    for index, values in enumerate(chunk, start):
+                        try:
+                            ids[index] = await self._execute_kw(model, 'create', [values])
+                        except Fault as e:
+                            errors.append({"index": index, "error": str(e)})
+                        except Exception as e:
+                            errors.append({"index": index, "error": str(e), "outcome": "unknown"})
+                            unknown += 1
+                except Exception as e:
+                    # Timeout or lost connection: Odoo may have committed the chunk, and create is
+                    # not idempotent, so it is reported rather than retried
+                    errors.extend({"index": index, "error": str(e), "outcome": "unknown"}
+                                  for index in range(start, start + len(chunk)))
+                    unknown += len(chunk)
+            self._mark_mirror_stale(model)
+
+            created_count = len(records) - len(errors)
+            message = f"Created {created_count} of {len(records)} records"
+            if unknown:
+                message += f"; {unknown} may or may not have been created, check before retrying them"
+            return {
+                "message": message,
+                "ids": ids,
+                "errors": errors,
+            }
+
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def _write_batch(self, model: str, updates: list, chunk_size: int = BATCH_CHUNK_SIZE) -> dict:
+        """Apply {ids, values} updates in order, merging updates that share identical values."""
+        try:
+            chunk_size = max(1, chunk_size)
+            # Ordered write groups of (values, [(update index, ids)]). An update joins the latest
+            # group with its values unless a later group writes one of its ids, which would
+            # reorder conflicting writes.
+            groups: List[tuple] = []
+            latest: Dict[str, int] = {}
+            last_group: Dict[int, int] = {}
+            for index, update in enumerate(updates):
+                key = json.dumps(update["values"], sort_keys=True, default=str)
+                ids = list(update["ids"])
+                position = latest.get(key)
+                if position is None or any(last_group.get(rid, -1) > position for rid in ids):
+                    position = latest[key] = len(groups)
+                    groups.append((update["values"], []))
+                groups[position][1].append((index, ids))
+                for rid in ids:
+                    last_group[rid] = position
+
+            failed: Dict[int, str] = {}
+            write_calls = 0
+            try:
+                for values, members in groups:
+                    ids = list(dict.fromkeys(rid for _, member_ids in members for rid in member_ids))
+                    for start in range(0, len(ids), chunk_size):
+                        chunk = ids[start:start + chunk_size]
+                        write_calls += 1
+                        try:
+                            await self._execute_kw(model, 'write', [chunk, values])
+                        except Exception:
+                            # Retry each original update on its share of the chunk
+                            chunk_ids = set(chunk)
+                            for index, member_ids in members:
+                                own = [rid for rid in member_ids if rid in chunk_ids]
+                                if not own:
+                                    continue
+                                write_calls += 1
+                                try:
+                                    await self._execute_kw(model, 'write', [own, values])
+                                except Exception as e:
+                                    failed.setdefault(index, str(e))
+                        finally:
+                            # Even a failed write may have been committed before its response was lost;
+                            # the retried ids are all in the chunk
+                            self.record_cache.evict(model, chunk)
+            finally:
+                self._mark_mirror_stale(model)
+
+            errors = [{"index": index, "error": error} for index, error in sorted(failed.items())]
+            return {
+                "message": f"Applied {len(updates) - len(errors)} of {len(updates)} updates in {write_calls} write calls",
+                "merged_groups": len(groups),
+                "errors": errors,
+            }
+
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def _execute_operations(self, operations: list) -> dict:
+        """Run a list of ORM calls, each as soon as the operations it references have finished."""
+        try:
+            plan = plan_operations(operations)
+            for op in plan:
+                if op.method in EXECUTE_DENIED_METHODS or op.method.startswith("_"):
+                    raise OperationError(f"Operation {op.index}: method {op.method!r} is not allowed")
+
+            outcomes: Dict[str, dict] = {}
+            results: Dict[str, Any] = {}
+            tasks: Dict[int, asyncio.Task] = {}
+
+            async def run(op):
+                if op.after:
+                    await asyncio.gather(*(tasks[index] for index in op.after))
+                    failed = [plan[index].name for index in sorted(op.depends_on)
+                              if outcomes[plan[index].name]["status"] != "ok"]
+                    if failed:
+                        outcomes[op.name] = {"id": op.name, "status": "skipped",
+                                             "error": f"Depends on failed operation(s): {', '.join(failed)}"}
+                        return
+                try:
+                    args = resolve_references(op.args, results)
+                    kwargs = resolve_references(op.kwargs, results)
+                    try:
+                        result = await self._execute_kw(op.model, op.method, args, kwargs)
+                    finally:
+                        if op.method not in NON_MUTATING_METHODS:
+                            self.record_cache.evict(op.model)
+                            self._mark_mirror_stale(op.model)
+                except Exception as e:
+                    outcomes[op.name] = {"id": op.name, "status": "error", "error": str(e)}
+                    return
+                results[op.name] = results[str(op.index)] = result
+                outcomes[op.name] = {"id": op.name, "status": "ok", "result": result}
+
+            for op in plan:
+                tasks[op.index] = asyncio.create_task(run(op))
+            await asyncio.gather(*tasks.values())
+
+            done = [outcomes[op.name] for op in plan]
+            failed = sum(outcome["status"] != "ok" for outcome in done)
+            return {
+                "message": f"Ran {len(done) - failed} of {len(done)} operations",
+                "results": done,
+            }
+
+        except Exception as e:
+            return {"error": str(e)}
+
     async def _test_connection(self) -> dict:
         """Test connection to Odoo."""
         try:
-            models, uid, auth_credential = await self._get_odoo_connection()
+            session = await self._get_odoo_connection()
             
             # Try to read user info
-            user_info = models.execute_kw(
-                self.odoo_db, uid, auth_credential,
+            user_info = await self._execute_kw(
                 'res.users', 'read',
-                [uid],
+                [session.uid],
                 {'fields': ['name', 'login']}
             )
             
@@ -350,8 +2037,9 @@ class OdooMCPServer:
                 "status": "success",
                 "message": "Connection test successful!",
                 "user_info": user_info[0] if user_info else None,
-                "database": self.odoo_db,
-                "url": self.odoo_url
+                "profile": self._profile().config.name,
+                "database": self._profile().config.db,
+                "url": self._profile().config.url
             }
         
         except Exception as e:
@@ -360,24 +2048,80 @@ class OdooMCPServer:
                 "message": f"Connection test failed: {str(e)}"
             }
 
+    async def _sync_mirror_periodically(self):
+        """Keep mirrored models fresh in the background so bounded reads rarely wait for a sync."""
+        while True:
+            for profile in self.profiles.active():
+                for model in profile.mirror.models if profile.mirror else ():
+                    try:
+                        await profile.mirror.sync(model)
+                    except Exception:
+                        # Odoo may be unreachable for a while; bounded reads sync (or fail) on their own
+                        pass
+            await asyncio.sleep(ODOO_MIRROR_SYNC_INTERVAL)
+
+    async def _write_metrics_periodically(self):
+        """Rewrite the Prometheus text file every ODOO_METRICS_INTERVAL seconds."""
+        while True:
+            try:
+                await asyncio.to_thread(write_prometheus_file, self.metrics, ODOO_METRICS_FILE)
+            except OSError:
+                # A missing directory or full disk must not take the server down
+                pass
+            await asyncio.sleep(ODOO_METRICS_INTERVAL)
+
+    def _initialization_options(self) -> InitializationOptions:
+        return InitializationOptions(
+            server_name="odoo-mcp-server",
+            server_version="1.0.0",
+            capabilities=self.server.get_capabilities(
+                notification_options=NotificationOptions(),
+                experimental_capabilities={},
+            ),
+        )
+
     async def run(self):
         """Run the MCP server."""
+        if ODOO_MIRROR_MODELS and ODOO_MIRROR_SYNC_INTERVAL > 0:
+            asyncio.create_task(self._sync_mirror_periodically())
+        if ODOO_METRICS_PORT:
+            serve_prometheus(self.metrics, ODOO_METRICS_PORT, ODOO_METRICS_HOST)
+        if ODOO_METRICS_FILE:
+            asyncio.create_task(self._write_metrics_periodically())
+
+        if ODOO_MCP_TRANSPORT == "http":
+            await self._run_http()
+        elif ODOO_MCP_TRANSPORT == "stdio":
+            await self._run_stdio()
+        else:
+            raise ValueError(f"Unknown MCP transport: {ODOO_MCP_TRANSPORT} (expected stdio or http)")
+
+    async def _run_stdio(self):
+        """Serve one client over stdin/stdout."""
         # Import here to avoid issues with event loop
         from mcp.server.stdio import stdio_server
-        
+
         async with stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                InitializationOptions(
-                    server_name="odoo-mcp-server",
-                    server_version="1.0.0",
-                    capabilities=self.server.get_capabilities(
-                        notification_options=NotificationOptions(),
-                        experimental_capabilities={},
-                    ),
-                ),
-            )
+            await self.server.run(read_stream, write_stream, self._initialization_options())
+
+    async def _run_http(self):
+        """Serve many clients over streamable HTTP (/mcp) and SSE (/sse), sharing pools and caches."""
+        from http_transport import allowed_hosts, build_http_app, serve_http
+
+        hosts = allowed_hosts(ODOO_MCP_HOST, ODOO_MCP_PORT, ODOO_MCP_ALLOWED_HOSTS)
+        app = build_http_app(
+            self.server,
+            self._initialization_options(),
+            metrics=self.metrics,
+            json_response=ODOO_MCP_JSON_RESPONSE,
+            session_idle_timeout=ODOO_MCP_SESSION_IDLE_TIMEOUT or None,
+            max_sessions=ODOO_MCP_MAX_SESSIONS or None,
+            hosts=hosts,
+            origins=[f"http://{host}" for host in hosts] + [f"https://{host}" for host in hosts] + ODOO_MCP_ALLOWED_ORIGINS,
+            auth_token=ODOO_MCP_AUTH_TOKEN or None,
+        )
+        print(f"Odoo MCP server listening on http://{ODOO_MCP_HOST}:{ODOO_MCP_PORT}/mcp", file=sys.stderr)
+        await serve_http(app, ODOO_MCP_HOST, ODOO_MCP_PORT)
 
 def main():
     """Main entry point."""
@@ -0,0 +1,117 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# fields_get attributes kept in the index; everything else is dropped to stay compact
+FIELD_ATTRIBUTES = ["type", "string", "relation", "required", "readonly", "store", "selection"]
+
+
+class _Entry:
+    __slots__ = ("value", "stamp", "checked_at")
+
+    def __init__(self, value: Any, stamp: Any):
+        self.value = value
+        self.stamp = stamp
+        self.checked_at = time.monotonic()
+
+
+class MetadataCache:
+    """In-memory index of ir.model and per-model fields_get results.
+
+    Entries are served from memory until ``ttl`` seconds have passed. An expired
+    entry is revalidated with a one-row query for the latest ``write_date`` of
+    ir.model / ir.model.fields, and only reloaded when that stamp has moved.
+    """
+
+    def __init__(self, execute_kw: Callable[..., Awaitable[Any]], ttl: float = 300.0):
+        self._execute_kw = execute_kw
+        self.ttl = ttl
+        self._models: Optional[_Entry] = None
+        self._fields: Dict[str, _Entry] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _lock(self, key: str) -> asyncio.Lock:
+        if key not in self._locks:
+            self._locks[key] = asyncio.Lock()
+        return self._locks[key]
+
+    def _fresh(self, entry: Optional[_Entry]) -> bool:
+        return entry is not None and time.monotonic() - entry.checked_at < self.ttl
+
+    async def _latest_write_date(self, model: str, domain: list) -> Any:
+        rows = await self._execute_kw(
+            model, 'search_read', [domain],
+            {'fields': ['write_date'], 'order': 'write_date desc', 'limit': 1}
+        )
+        return rows[0]['write_date'] if rows else None
+
+    async def models(self) -> List[dict]:
+        """Return every installed model as {'model', 'name'} rows."""
+        if self._fresh(self._models):
+            self.hits += 1
+            return self._models.value
+        async with self._lock("ir.model"):
+            if self._fresh(self._models):
+                self.hits += 1
+                return self._models.value
+            stamp = await self._latest_write_date('ir.model', [])
+            if self._models is not None and self._models.stamp == stamp:
+                self._models.checked_at = time.monotonic()
+                self.hits += 1
+                return self._models.value
+            self.misses += 1
+            rows = await self._execute_kw(
+                'ir.model', 'search_read', [[]],
+                {'fields': ['model', 'name'], 'order': 'model'}
+            )
+            self._models = _Entry([{'model': r['model'], 'name': r['name']} for r in rows], stamp)
+            return self._models.value
+
+    async def fields(self, model: str) -> Dict[str, dict]:
+        """Return the compact fields_get index for a model."""
+        entry = self._fields.get(model)
+        if self._fresh(entry):
+            self.hits += 1
+            return entry.value
+        async with self._lock(model):
+            entry = self._fields.get(model)
+            if self._fresh(entry):
+                self.hits += 1
+                return entry.value
+            stamp = await self._latest_write_date('ir.model.fields', [['model', '=', model]])
+            if entry is not None and entry.stamp == stamp:
+                entry.checked_at = time.monotonic()
+                self.hits += 1
+                return entry.value
+            self.misses += 1
+            raw = await self._execute_kw(model, 'fields_get', [], {'attributes': FIELD_ATTRIBUTES})
+            index = {
+                name: {k: v for k, v in info.items() if v not in (None, False, "", [])}
+                for name, info in raw.items()
+            }
+            self._fields[model] = _Entry(index, stamp)
+            return index
+
+    def cached_fields(self, model: str) -> Optional[Dict[str, dict]]:
+        """Return the fields index for a model if it is already loaded, without any RPC."""
+        entry = self._fields.get(model)
+        return entry.value if entry is not None else None
+
+    def invalidate(self, model: Optional[str] = None):
+        """Drop cached metadata for one model, or everything when model is None."""
+        if model is None:
+            self._models = None
+            self._fields.clear()
+        else:
+            self._fields.pop(model, None)
+
+    def stats(self) -> dict:
+        return {
+            "ttl": self.ttl,
+            "models_loaded": self._models is not None,
+            "field_indexes": len(self._fields),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
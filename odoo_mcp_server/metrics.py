@@ -0,0 +1,217 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+# Histogram bucket upper bounds, as in Prometheus client defaults
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Stages timed around a tool call
+STAGES = ("auth", "execute_kw", "decode", "encode")
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with sum, count and max."""
+
+    __slots__ = ("buckets", "counts", "sum", "count", "max")
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile (max when it is past the last bucket)."""
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class Metrics:
+    """Thread-safe timings, counters and size histograms for Odoo calls and tool calls.
+
+    Transports record from RPC worker threads and the server from the event
+    loop, so every update takes a lock; an update costs about a microsecond.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+
+    def _observe(self, name: str, labels: Labels, value: float, buckets: tuple):
+        with self._lock:
+            histogram = self._histograms.get((name, labels))
+            if histogram is None:
+                histogram = self._histograms[(name, labels)] = Histogram(buckets)
+            histogram.observe(value)
+
+    def _inc(self, name: str, labels: Labels, value: float = 1):
+        with self._lock:
+            self._counters[(name, labels)] = self._counters.get((name, labels), 0) + value
+
+    def observe_stage(self, stage: str, seconds: float):
+        self._observe("stage_seconds", (("stage", stage),), seconds, SECONDS_BUCKETS)
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """Time the enclosed block as one of STAGES."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(stage, time.perf_counter() - start)
+
+    def record_rpc(self, model: str, method: str, seconds: float, error: bool = False):
+        """Record one execute_kw round trip as seen by the server (including queueing)."""
+        labels = (("model", model), ("method", method))
+        self.observe_stage("execute_kw", seconds)
+        self._observe("rpc_seconds", labels, seconds, SECONDS_BUCKETS)
+        if error:
+            self._inc("rpc_errors", labels)
+
+    def record_decode(self, model: str, method: str, size: int, seconds: float):
+        """Record the size and parse time of one Odoo response."""
+        self.observe_stage("decode", seconds)
+        self._observe("rpc_response_bytes", (("model", model), ("method", method)), size, BYTES_BUCKETS)
+
+    def record_tool(self, tool: str, seconds: float, size: int, error: bool = False):
+        labels = (("tool", tool),)
+        self._observe("tool_seconds", labels, seconds, SECONDS_BUCKETS)
+        self._observe("tool_response_bytes", labels, size, BYTES_BUCKETS)
+        if error:
+            self._inc("tool_errors", labels)
+
+    def snapshot(self) -> dict:
+        """Summarize everything recorded so far; RPCs are sorted by total time, slowest first."""
+        with self._lock:
+            histograms = dict(self._histograms)
+            counters = dict(self._counters)
+
+        def timing(h: Histogram) -> dict:
+            return {
+                "count": h.count,
+                "total_ms": round(h.sum * 1000, 3),
+                "mean_ms": round(h.sum / h.count * 1000, 3) if h.count else 0,
+                "p95_ms": round(h.quantile(0.95) * 1000, 3),
+                "max_ms": round(h.max * 1000, 3),
+            }
+
+        stages, rpc, tools = {}, {}, {}
+        for (name, labels), h in histograms.items():
+            label = dict(labels)
+            if name == "stage_seconds":
+                stages[label["stage"]] = timing(h)
+            elif name == "rpc_seconds":
+                key = f"{label['model']}.{label['method']}"
+                rpc.setdefault(key, {}).update(timing(h), errors=int(counters.get(("rpc_errors", labels), 0)))
+            elif name == "rpc_response_bytes":
+                key = f"{label['model']}.{label['method']}"
+                rpc.setdefault(key, {}).update(mean_response_bytes=round(h.sum / h.count), max_response_bytes=int(h.max))
+            elif name == "tool_seconds":
+                tools.setdefault(label["tool"], {}).update(
+                    timing(h), errors=int(counters.get(("tool_errors", labels), 0))
+                )
+            elif name == "tool_response_bytes":
+                tools.setdefault(label["tool"], {}).update(
+                    mean_response_bytes=round(h.sum / h.count), max_response_bytes=int(h.max)
+                )
+        return {
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "stages": stages,
+            "rpc": dict(sorted(rpc.items(), key=lambda item: -item[1].get("total_ms", 0))),
+            "tools": tools,
+        }
+
+    def render_prometheus(self, prefix: str = "odoo_mcp") -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+        lines = []
+        typed = set()
+        for (name, labels), h in histograms:
+            metric = f"{prefix}_{name}"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, count in zip(h.buckets, h.counts):
+                cumulative += count
+                lines.append(f"{metric}_bucket{_labels(labels, ('le', _number(bound)))} {cumulative}")
+            lines.append(f"{metric}_bucket{_labels(labels, ('le', '+Inf'))} {h.count}")
+            lines.append(f"{metric}_sum{_labels(labels)} {_number(h.sum)}")
+            lines.append(f"{metric}_count{_labels(labels)} {h.count}")
+        for (name, labels), value in counters:
+            metric = f"{prefix}_{name}_total"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_labels(labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def serve_prometheus(metrics: Metrics, port: int, host: str = "127.0.0.1"):
+    """Serve /metrics in the Prometheus text format from a daemon thread."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") not in ("", "/metrics"):
+                self.send_error(404)
+                return
+            body = metrics.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # stdout carries the MCP stdio protocol; keep it clean
+            pass
+
+    httpd = ThreadingHTTPServer((host, port), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def write_prometheus_file(metrics: Metrics, path: str):
+    """Atomically write the Prometheus text to path (for node_exporter's textfile collector)."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        handle.write(metrics.render_prometheus())
+    os.replace(tmp_path, path)
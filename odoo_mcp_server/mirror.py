@@ -0,0 +1,397 @@
+import asyncio
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import serialization
+from domain import watermark_domain
+
+# Field types left out of the mirror: large payloads nobody filters on
+SKIPPED_TYPES = frozenset({"binary", "html"})
+# Non-stored fields that are still worth mirroring
+EXTRA_FIELDS = ("id", "display_name")
+# Fields indexed in every mirrored model that has them
+DEFAULT_INDEXES = ("name",)
+_FIELD_NAME = re.compile(r"^\w+$")
+_LIKE_OPERATORS = ("like", "not like", "ilike", "not ilike", "=like", "=ilike")
+
+
+class MirrorUnsupported(Exception):
+    """Raised when a query cannot be answered from the mirror; the caller asks Odoo instead."""
+
+
+class LocalMirror:
+    """On-disk SQLite copy of selected Odoo models.
+
+    Each model is stored in its own table as (id, write_date, JSON record),
+    with expression indexes on commonly filtered fields. sync() fetches only
+    records whose write_date moved past the stored watermark and prunes
+    records deleted in Odoo; the watermark is kept in the database, so a
+    restarted server resumes where it stopped. search() and read() translate
+    compiled domains to SQL and raise MirrorUnsupported for anything they
+    cannot answer exactly (unmirrored fields, dotted paths, child_of, ...).
+    """
+
+    def __init__(self, path: str, models: Iterable[str], execute_kw: Callable[..., Awaitable[Any]],
+                 fields_get: Callable[[str], Awaitable[dict]], indexes: Optional[Dict[str, Set[str]]] = None,
+                 page_size: int = 1000):
+        self.path = path
+        self.models = list(models)
+        self._execute_kw = execute_kw
+        self._fields_get = fields_get
+        self.indexes = indexes or {}
+        self.page_size = page_size
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS mirror_state ("
+            "model TEXT PRIMARY KEY, fields TEXT, write_date TEXT, seen TEXT, synced_at REAL)"
+        )
+        self._db.commit()
+        self._db_lock = threading.Lock()
+        self._sync_locks: Dict[str, asyncio.Lock] = {}
+        self._state: Dict[str, dict] = {}
+        self._indexed: Set[str] = set()
+        # Each model's _order, read on its first sync in this process; None when Odoo does not expose it
+        self._orders: Dict[str, Optional[str]] = {}
+        for model, fields, write_date, seen, synced_at in self._db.execute("SELECT * FROM mirror_state"):
+            self._state[model] = {
+                "fields": serialization.loads(fields), "write_date": write_date,
+                "seen": serialization.loads(seen), "synced_at": synced_at,
+            }
+        self.local_queries = 0
+        self.syncs = 0
+
+    def mirrors(self, model: str) -> bool:
+        return model in self.models
+
+    def age(self, model: str) -> Optional[float]:
+        """Seconds since the model was last synced, or None if it never was."""
+        state = self._state.get(model)
+        if not state or not state["synced_at"]:
+            return None
+        return max(0.0, time.time() - state["synced_at"])
+
+    async def ensure_fresh(self, model: str, max_age: float) -> float:
+        """Sync the model if its copy is older than max_age seconds; return the copy's age."""
+        age = self.age(model)
+        if age is None or age > max_age:
+            await self.sync(model)
+            age = self.age(model)
+        return age
+
+    def mark_stale(self, model: str):
+        """Force a sync before the next bounded read, e.g. after writing to the model."""
+        state = self._state.get(model)
+        if state and state["synced_at"]:
+            state["synced_at"] = 0
+            with self._db_lock:
+                self._db.execute("UPDATE mirror_state SET synced_at = 0 WHERE model = ?", (model,))
+                self._db.commit()
+
+    # -- Sync ---------------------------------------------------------------
+
+    async def sync(self, model: str) -> int:
+        """Bring the model's copy up to date; return the number of records fetched."""
+        if not self.mirrors(model):
+            raise ValueError(f"{model} is not mirrored")
+        lock = self._sync_locks.setdefault(model, asyncio.Lock())
+        async with lock:
+            return await self._sync(model)
+
+    async def _sync(self, model: str) -> int:
+        index = await self._fields_get(model)
+        schema = {
+            name: info.get("type") for name, info in index.items()
+            if (info.get("store") or name in EXTRA_FIELDS) and info.get("type") not in SKIPPED_TYPES
+        }
+        state = self._state.get(model)
+        if state is None or state["fields"] != schema:
+            state = await asyncio.to_thread(self._reset, model, schema)
+        if model not in self._indexed:
+            await asyncio.to_thread(self._ensure_indexes, model, schema)
+            self._indexed.add(model)
+        if model not in self._orders:
+            self._orders[model] = await self._default_order(model)
+
+        # Mirror archived records too, so active_test can be applied locally
+        base = [["active", "in", [False, True]]] if "active" in schema else []
+        write_date, seen = state["write_date"], state["seen"]
+        fetched = 0
+        # (id, write_date) pairs fetched by this sync: a page of nothing new means the watermark is stuck
+        fetched_pairs = set()
+        while True:
+            domain = list(base)
+            if write_date:
+                domain += watermark_domain(write_date, seen)
+            rows = await self._execute_kw(
+                model, 'search_read', [domain],
+                {'fields': list(schema), 'order': 'write_date asc, id asc', 'limit': self.page_size}
+            )
+            pairs = {(row['id'], row['write_date']) for row in rows}
+            if rows and pairs <= fetched_pairs:
+                break
+            fetched_pairs |= pairs
+            if rows:
+                await asyncio.to_thread(self._upsert, model, rows)
+                last = rows[-1]['write_date']
+                at_last = [row['id'] for row in rows if row['write_date'] == last]
+                seen = (seen if last == write_date else []) + at_last
+                write_date = last
+                fetched += len(rows)
+            if len(rows) < self.page_size:
+                break
+
+        # Deletions never show up by write_date; when the counts differ, prune what Odoo no longer has
+        remote_count = await self._execute_kw(model, 'search_count', [base])
+        if remote_count != self._count(model):
+            remote_ids = await self._execute_kw(model, 'search', [base])
+            await asyncio.to_thread(self._prune, model, remote_ids)
+
+        state.update(write_date=write_date, seen=seen, synced_at=time.time())
+        with self._db_lock:
+            self._db.execute(
+                "UPDATE mirror_state SET write_date = ?, seen = ?, synced_at = ? WHERE model = ?",
+                (write_date, serialization.dumps(seen), state["synced_at"], model)
+            )
+            self._db.commit()
+        self.syncs += 1
+        return fetched
+
+    async def _default_order(self, model: str) -> Optional[str]:
+        """The model's _order, from ir.model.order (Odoo 16 and later)."""
+        from xmlrpc.client import Fault
+
+        try:
+            rows = await self._execute_kw('ir.model', 'search_read', [[['model', '=', model]]],
+                                          {'fields': ['order'], 'limit': 1})
+        except Fault:
+            return None
+        return (rows[0].get('order') or None) if rows else None
+
+    def _reset(self, model: str, schema: Dict[str, str]) -> dict:
+        """(Re)create the model's table, e.g. on first sync or after its fields changed."""
+        table = _table(model)
+        with self._db_lock:
+            self._db.execute(f'DROP TABLE IF EXISTS "{table}"')
+            self._db.execute(f'CREATE TABLE "{table}" (id INTEGER PRIMARY KEY, write_date TEXT, data TEXT NOT NULL)')
+            self._db.execute(f'CREATE INDEX "{table}__write_date" ON "{table}" (write_date)')
+            self._db.execute(
+                "INSERT OR REPLACE INTO mirror_state VALUES (?, ?, NULL, '[]', NULL)",
+                (model, serialization.dumps(schema))
+            )
+            self._db.commit()
+        self._indexed.discard(model)
+        state = self._state[model] = {"fields": schema, "write_date": None, "seen": [], "synced_at": None}
+        return state
+
+    def _ensure_indexes(self, model: str, schema: Dict[str, str]):
+        """Create the expression indexes configured for the model, if they do not exist yet."""
+        table = _table(model)
+        with self._db_lock:
+            for field in sorted(set(DEFAULT_INDEXES) | self.indexes.get(model, set())):
+                if field in schema and field not in ("id", "write_date"):
+                    self._db.execute(
+                        f'CREATE INDEX IF NOT EXISTS "{table}__{field}" ON "{table}" ({_column(field, schema[field])})'
+                    )
+            self._db.commit()
+
+    def _upsert(self, model: str, rows: List[dict]):
+        with self._db_lock:
+            self._db.executemany(
+                f'INSERT OR REPLACE INTO "{_table(model)}" (id, write_date, data) VALUES (?, ?, ?)',
+                [(row['id'], row.get('write_date'), serialization.dumps(row)) for row in rows]
+            )
+            self._db.commit()
+
+    def _prune(self, model: str, remote_ids: List[int]):
+        table = _table(model)
+        with self._db_lock:
+            self._db.execute("CREATE TEMP TABLE IF NOT EXISTS remote_ids (id INTEGER PRIMARY KEY)")
+            self._db.execute("DELETE FROM remote_ids")
+            self._db.executemany("INSERT OR IGNORE INTO remote_ids VALUES (?)", [(rid,) for rid in remote_ids])
+            self._db.execute(f'DELETE FROM "{table}" WHERE id NOT IN (SELECT id FROM remote_ids)')
+            self._db.commit()
+
+    def _count(self, model: str) -> int:
+        with self._db_lock:
+            return self._db.execute(f'SELECT COUNT(*) FROM "{_table(model)}"').fetchone()[0]
+
+    # -- Queries ------------------------------------------------------------
+
+    def _schema(self, model: str) -> Dict[str, str]:
+        state = self._state.get(model)
+        if not state or not state["synced_at"]:
+            raise MirrorUnsupported(f"{model} has not been synced")
+        return state["fields"]
+
+    def _project(self, schema: Dict[str, str], fields: List[str]) -> List[str]:
+        if not fields:
+            return ["id"] + [f for f in schema if f != "id"]
+        missing = [f for f in fields if f not in schema]
+        if missing:
+            raise MirrorUnsupported(f"Fields not mirrored: {', '.join(missing)}")
+        return ["id"] + [f for f in fields if f != "id"]
+
+    def search(self, model: str, domain: list, fields: List[str], limit: Optional[int] = None, offset: int = 0,
+               order: Optional[str] = None, count: bool = False) -> Tuple[List[dict], Optional[int]]:
+        """Answer a search_read (and optionally search_count) on a compiled domain from the mirror."""
+        schema = self._schema(model)
+        fields = self._project(schema, fields)
+        if not order:
+            # Odoo pages by the model's _order; any other order would shift offsets and cursors
+            order = self._orders.get(model)
+            if not order:
+                raise MirrorUnsupported(f"The default order of {model} is not known locally")
+        if "active" in schema and not any(isinstance(t, list) and t[0] == "active" for t in domain):
+            domain = domain + [["active", "=", True]]
+        where, params = _where(schema, domain)
+        table = _table(model)
+        sql = f'SELECT data FROM "{table}" WHERE {where} ORDER BY {_order_by(schema, order)} LIMIT ? OFFSET ?'
+        with self._db_lock:
+            rows = self._db.execute(sql, params + [limit or -1, offset or 0]).fetchall()
+            total = self._db.execute(f'SELECT COUNT(*) FROM "{table}" WHERE {where}', params).fetchone()[0] \
+                if count else None
+        self.local_queries += 1
+        return [_record(serialization.loads(data), fields) for (data,) in rows], total
+
+    def read(self, model: str, ids: List[int], fields: List[str]) -> List[dict]:
+        """Answer a read from the mirror; every id must be mirrored."""
+        schema = self._schema(model)
+        fields = self._project(schema, fields)
+        wanted = list(dict.fromkeys(ids))
+        with self._db_lock:
+            rows = self._db.execute(
+                f'SELECT id, data FROM "{_table(model)}" WHERE id IN ({", ".join("?" * len(wanted))})', wanted
+            ).fetchall() if wanted else []
+        if len(rows) < len(wanted):
+            raise MirrorUnsupported("Some ids are not in the mirror")
+        by_id = {rid: data for rid, data in rows}
+        self.local_queries += 1
+        return [_record(serialization.loads(by_id[rid]), fields) for rid in wanted]
+
+    def stats(self) -> dict:
+        models = {}
+        for model in self.models:
+            age = self.age(model)
+            models[model] = {
+                "records": self._count(model) if model in self._state else 0,
+                "age": round(age, 1) if age is not None else None,
+            }
+        return {"path": self.path, "syncs": self.syncs, "local_queries": self.local_queries, "models": models}
+
+    def close(self):
+        with self._db_lock:
+            self._db.close()
+
+
+def _table(model: str) -> str:
+    return "mirror_" + model.replace(".", "_")
+
+
+def _column(field: str, field_type: Optional[str], label: bool = False) -> str:
+    """SQL expression of a field's comparable value; many2one pairs compare on the id (or name)."""
+    if field in ("id", "write_date"):
+        return field
+    if field_type == "many2one":
+        return f"json_extract(data, '$.\"{field}\"[{1 if label else 0}]')"
+    return f"json_extract(data, '$.\"{field}\"')"
+
+
+def _record(data: dict, fields: List[str]) -> dict:
+    return {f: data.get(f, False) for f in fields}
+
+
+def _where(schema: Dict[str, str], domain: list) -> Tuple[str, list]:
+    params: list = []
+    pos = 0
+
+    def expression() -> str:
+        nonlocal pos
+        token = domain[pos]
+        pos += 1
+        if token in ("&", "|"):
+            left, right = expression(), expression()
+            return f"({left} {'AND' if token == '&' else 'OR'} {right})"
+        if token == "!":
+            return f"(NOT {expression()})"
+        return _term(schema, token, params)
+
+    clauses = []
+    while pos < len(domain):
+        clauses.append(expression())
+    return " AND ".join(clauses) or "1", params
+
+
+def _term(schema: Dict[str, str], term: list, params: list) -> str:
+    field, operator, value = term
+    if field in (0, 1):
+        return "1" if field == 1 else "0"
+    if field not in schema:
+        raise MirrorUnsupported(f"Cannot filter on {field!r} locally")
+    field_type = schema[field]
+    if field_type in ("one2many", "many2many"):
+        raise MirrorUnsupported(f"Cannot filter on {field_type} field {field!r} locally")
+    values = value if operator in ("in", "not in") else [value]
+    if any(isinstance(v, (list, dict)) for v in values):
+        raise MirrorUnsupported(f"Cannot compare {field!r} with {value!r} locally")
+    if field_type == "many2one" and operator not in _LIKE_OPERATORS and any(isinstance(v, str) for v in values):
+        # Odoo name-searches a many2one compared with text
+        raise MirrorUnsupported(f"Cannot compare many2one {field!r} with a name locally")
+    column = _column(field, field_type)
+    # Odoo's False is SQL NULL; in the mirror it is a JSON false or a missing key
+    empty = f"json_type(data, '$.\"{field}\"') IN ('false', 'null')" if field != "id" else "0"
+
+    if operator in ("=", "!="):
+        if value is False or value is None:
+            return empty if operator == "=" else f"NOT ({empty})"
+        params.append(value)
+        return f"{column} = ?" if operator == "=" else f"({empty} OR {column} != ?)"
+    if operator in ("<", "<=", ">", ">="):
+        params.append(value)
+        return f"(NOT ({empty}) AND {column} {operator} ?)"
+    if operator in ("in", "not in"):
+        values = [v for v in value if v is not False and v is not None]
+        with_empty = len(values) < len(value)
+        params.extend(values)
+        listed = f"{column} IN ({', '.join('?' * len(values))})" if values else "0"
+        if operator == "in":
+            return f"({listed} OR {empty})" if with_empty else listed
+        return f"(NOT ({empty}) AND NOT {listed})" if with_empty else f"({empty} OR NOT {listed})"
+    if operator in ("ilike", "not ilike", "=ilike") and isinstance(value, str):
+        # SQLite's LIKE is case-insensitive (for ASCII), like Postgres' ILIKE
+        column = _column(field, field_type, label=True)
+        params.append(value if operator == "=ilike" else f"%{value}%")
+        if operator == "not ilike":
+            return f"({empty} OR {column} NOT LIKE ?)"
+        return f"(NOT ({empty}) AND {column} LIKE ?)"
+    if operator in ("like", "not like") and isinstance(value, str) and not set(value) & {"%", "_"}:
+        column = _column(field, field_type, label=True)
+        params.append(value)
+        if operator == "not like":
+            return f"({empty} OR instr({column}, ?) = 0)"
+        return f"(NOT ({empty}) AND instr({column}, ?) > 0)"
+    raise MirrorUnsupported(f"Operator {operator!r} is not supported locally")
+
+
+def _order_by(schema: Dict[str, str], order: str) -> str:
+    """Translate an Odoo order spec; empty values sort last ascending and first descending, as in Postgres."""
+    terms, fields = [], set()
+    for part in order.split(","):
+        bits = part.split()
+        if not bits:
+            continue
+        field = bits[0]
+        direction = bits[1].upper() if len(bits) > 1 else "ASC"
+        # Odoo orders a many2one by the related model's _order, which the mirror does not hold
+        if not _FIELD_NAME.match(field) or field not in schema or schema[field] == "many2one" \
+                or len(bits) > 2 or direction not in ("ASC", "DESC"):
+            raise MirrorUnsupported(f"Cannot order by {part.strip()!r} locally")
+        empty = f"json_type(data, '$.\"{field}\"') IN ('false', 'null')"
+        terms.append(f"{empty} {direction}, {_column(field, schema[field], label=True)} {direction}")
+        fields.add(field)
+    if "id" not in fields:
+        terms.append("id ASC")
+    return ", ".join(terms)
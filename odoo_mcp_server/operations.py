@@ -0,0 +1,114 @@
+from typing import Any, Dict, List, NamedTuple, Set
+
+from coalescing import READ_ONLY_METHODS
+
+# Methods that never change data, on top of the coalescable READ_ONLY_METHODS;
+# any other method invalidates the cached records of its model
+NON_MUTATING_METHODS = READ_ONLY_METHODS | frozenset({
+    "onchange", "name_get", "get_views", "fields_view_get", "web_read", "web_search_read",
+    "check_access_rule", "copy_data", "has_group",
+})
+
+
+class OperationError(ValueError):
+    """Raised when an operation list is malformed or a reference cannot be resolved."""
+
+
+class Operation(NamedTuple):
+    index: int
+    name: str
+    model: str
+    method: str
+    args: list
+    kwargs: dict
+    depends_on: Set[int]  # steps whose results it references
+    after: Set[int]  # steps it waits for, including depends_on
+
+
+def plan_operations(operations: Any) -> List[Operation]:
+    """Validate an odoo_execute operation list and find what each step depends on.
+
+    A step is named by its optional "id" or by its position. {"$ref": "name.path"}
+    anywhere in args or kwargs makes it depend on the named step, which must
+    come earlier in the list, so the plan is always acyclic. Methods that may
+    change data are barriers: they wait for every earlier step, and later steps
+    wait for them, so only reads between two mutations run concurrently.
+    """
+    if not isinstance(operations, list) or not operations:
+        raise OperationError("operations must be a non-empty list")
+    names: Dict[str, int] = {}
+    plan = []
+    barrier = None
+    for index, op in enumerate(operations):
+        if not isinstance(op, dict):
+            raise OperationError(f"Operation {index} must be an object")
+        model, method = op.get("model"), op.get("method")
+        if not isinstance(model, str) or not model or not isinstance(method, str) or not method:
+            raise OperationError(f"Operation {index} needs a model and a method")
+        args, kwargs = op.get("args", []), op.get("kwargs", {})
+        if not isinstance(args, list) or not isinstance(kwargs, dict):
+            raise OperationError(f"Operation {index}: args must be a list and kwargs an object")
+        name = str(op.get("id", index))
+        if name in names or (name != str(index) and name.isdigit()):
+            raise OperationError(f"Operation {index}: id {name!r} is already used or looks like a position")
+        depends_on = set()
+        for ref in _references([args, kwargs]):
+            step = ref.split(".", 1)[0]
+            target = names.get(step, int(step) if step.isdigit() else None)
+            if target is None or target >= index:
+                raise OperationError(
+                    f"Operation {index}: $ref {ref!r} must name an earlier operation by id or position"
+                )
+            depends_on.add(target)
+        after = set(depends_on)
+        if method not in NON_MUTATING_METHODS:
+            after.update(range(index))
+            barrier = index
+        elif barrier is not None:
+            after.add(barrier)
+        names[name] = index
+        names.setdefault(str(index), index)
+        plan.append(Operation(index, name, model, method, args, kwargs, depends_on, after))
+    return plan
+
+
+def resolve_references(value: Any, results: Dict[str, Any]) -> Any:
+    """Replace every {"$ref": "name.path"} in value with the referenced result.
+
+    The path walks into the named step's result: a number indexes a list, "*"
+    maps the rest of the path over a list, anything else is a dictionary key.
+    "partners.*.id" on a search_read result is the list of ids.
+    """
+    if isinstance(value, dict):
+        if set(value) == {"$ref"}:
+            step, *path = str(value["$ref"]).split(".")
+            return _walk(results[step], path, value["$ref"])
+        return {key: resolve_references(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve_references(item, results) for item in value]
+    return value
+
+
+def _walk(value: Any, path: List[str], ref: str) -> Any:
+    for position, part in enumerate(path):
+        if part == "*":
+            if not isinstance(value, list):
+                raise OperationError(f"Cannot resolve $ref {ref!r}: '*' needs a list")
+            return [_walk(item, path[position + 1:], ref) for item in value]
+        try:
+            value = value[int(part)] if isinstance(value, list) else value[part]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise OperationError(f"Cannot resolve $ref {ref!r}: no {part!r} in {type(value).__name__} result")
+    return value
+
+
+def _references(value: Any):
+    if isinstance(value, dict):
+        if set(value) == {"$ref"}:
+            yield str(value["$ref"])
+            return
+        for item in value.values():
+            yield from _references(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _references(item)
@@ -0,0 +1,137 @@
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional
+
+DEFAULT_PROFILE = "default"
+
+
+class ProfileConfig(NamedTuple):
+    """Connection settings of one named Odoo profile."""
+
+    name: str
+    url: Optional[str]
+    db: Optional[str]
+    username: Optional[str]
+    password: Optional[str]
+    transport: str
+
+
+def profile_env_prefix(name: str) -> str:
+    """Environment prefix of a profile's settings: 'eu-shop' -> 'ODOO_PROFILE_EU_SHOP_'."""
+    return f"ODOO_PROFILE_{re.sub(r'[^A-Za-z0-9]', '_', name).upper()}_"
+
+
+def load_profiles(environ: Mapping[str, str], default: ProfileConfig) -> Dict[str, ProfileConfig]:
+    """Read the profiles listed in ODOO_PROFILES.
+
+    Each profile reads ODOO_PROFILE_<NAME>_URL, _DB, _USERNAME, _PASSWORD and
+    _TRANSPORT, falling back to the default profile's value for any that are
+    unset, so profiles on one Odoo server only need their own _DB. The
+    username and password are inherited only by profiles on the default
+    profile's URL: the default credentials are never sent to another server,
+    and a profile on its own URL without them fails on first use.
+    """
+    profiles = {default.name: default}
+    for name in filter(None, (part.strip() for part in environ.get("ODOO_PROFILES", "").split(","))):
+        prefix = profile_env_prefix(name)
+        url = environ.get(f"{prefix}URL", default.url)
+        same_server = url == default.url
+        profiles[name] = ProfileConfig(
+            name=name,
+            url=url,
+            db=environ.get(f"{prefix}DB", default.db),
+            username=environ.get(f"{prefix}USERNAME", default.username if same_server else None),
+            password=environ.get(f"{prefix}PASSWORD", default.password if same_server else None),
+            transport=environ.get(f"{prefix}TRANSPORT", default.transport),
+        )
+    return profiles
+
+
+class UnknownProfileError(ValueError):
+    """Raised when a tool or resource names a profile that is not configured."""
+
+
+class _Entry:
+    __slots__ = ("value", "last_used", "in_use")
+
+    def __init__(self, value: Any):
+        self.value = value
+        self.last_used = time.monotonic()
+        self.in_use = 0
+
+
+class ProfileRegistry:
+    """Lazily built per-profile state, closed again once a profile goes idle.
+
+    ``factory(config)`` builds a profile's sessions and caches on first use.
+    Profiles unused for ``idle_timeout`` seconds (0 keeps them forever) are
+    closed with ``close(value)`` the next time any profile is acquired, so
+    memory and open connections follow the tenants that are actually active.
+    """
+
+    def __init__(self, configs: Dict[str, ProfileConfig], factory: Callable[[ProfileConfig], Any],
+                 close: Callable[[Any], None], idle_timeout: float = 0):
+        self.configs = configs
+        self._factory = factory
+        self._close = close
+        self.idle_timeout = idle_timeout
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, name: str, hold: bool = False) -> _Entry:
+        if name not in self.configs:
+            raise UnknownProfileError(
+                f"Unknown profile {name!r} (configured: {', '.join(self.configs)})"
+            )
+        with self._lock:
+            now = time.monotonic()
+            if self.idle_timeout > 0:
+                for other, entry in list(self._entries.items()):
+                    if other != name and not entry.in_use and now - entry.last_used > self.idle_timeout:
+                        del self._entries[other]
+                        self._close(entry.value)
+            entry = self._entries.get(name)
+            if entry is None:
+                entry = self._entries[name] = _Entry(self._factory(self.configs[name]))
+            entry.last_used = now
+            entry.in_use += hold
+            return entry
+
+    def get(self, name: str) -> Any:
+        """Return the profile's state, building it on first use."""
+        return self._entry(name).value
+
+    def acquire(self, name: str) -> Any:
+        """Like get(), also keeping the profile open until release() is called."""
+        return self._entry(name, hold=True).value
+
+    def release(self, name: str):
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None:
+                entry.in_use -= 1
+                entry.last_used = time.monotonic()
+
+    def active(self) -> List[Any]:
+        """State of the profiles that are currently open."""
+        with self._lock:
+            return [entry.value for entry in self._entries.values()]
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                name: {
+                    "active": name in self._entries,
+                    "in_use": self._entries[name].in_use if name in self._entries else 0,
+                    "idle_seconds": round(now - self._entries[name].last_used, 1) if name in self._entries else None,
+                }
+                for name in self.configs
+            }
+
+    def close(self):
+        with self._lock:
+            entries, self._entries = list(self._entries.values()), {}
+        for entry in entries:
+            self._close(entry.value)
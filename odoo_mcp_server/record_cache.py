@@ -0,0 +1,154 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# None stands for "every field", i.e. a read without a fields list
+FieldSet = Optional[frozenset]
+
+
+class _ModelCache:
+    """LRU of one model's records keyed by (id, field set)."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.entries: "OrderedDict[Tuple[int, FieldSet], tuple]" = OrderedDict()
+        self.by_id: Dict[int, set] = {}
+
+    def put(self, key: Tuple[int, FieldSet], value: tuple):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        self.by_id.setdefault(key[0], set()).add(key[1])
+        while len(self.entries) > self.limit:
+            old_key, _ = self.entries.popitem(last=False)
+            self._unindex(old_key)
+
+    def pop(self, key: Tuple[int, FieldSet]):
+        self.entries.pop(key, None)
+        self._unindex(key)
+
+    def _unindex(self, key: Tuple[int, FieldSet]):
+        field_sets = self.by_id.get(key[0])
+        if field_sets is not None:
+            field_sets.discard(key[1])
+            if not field_sets:
+                del self.by_id[key[0]]
+
+
+class RecordCache:
+    """Bounded read-through cache of Odoo records.
+
+    Records are cached per (model, id, field set) together with their
+    ``write_date``. A cached entry also answers reads of any subset of its
+    fields. Entries expire after ``ttl`` seconds and are evicted explicitly when
+    the server writes to them. Each model has its own LRU size limit; a limit of
+    0 disables caching for that model.
+    """
+
+    def __init__(self, ttl: float = 60.0, default_limit: int = 1000, model_limits: Optional[Dict[str, int]] = None):
+        self.ttl = ttl
+        self.default_limit = default_limit
+        self.model_limits = model_limits or {}
+        self._models: Dict[str, _ModelCache] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def enabled(self, model: str) -> bool:
+        return self.ttl > 0 and self.model_limits.get(model, self.default_limit) > 0
+
+    def _model(self, model: str) -> _ModelCache:
+        if model not in self._models:
+            self._models[model] = _ModelCache(self.model_limits.get(model, self.default_limit))
+        return self._models[model]
+
+    def get_many(self, model: str, ids: Iterable[int], fields: List[str]) -> Tuple[Dict[int, dict], List[int]]:
+        """Split ids into cached records (projected on fields) and ids that must be fetched."""
+        wanted: FieldSet = frozenset(fields) if fields else None
+        cache = self._models.get(model)
+        now = time.monotonic()
+        found, missing = {}, []
+        for rid in ids:
+            record = self._lookup(cache, rid, wanted, fields, now) if cache else None
+            if record is None:
+                missing.append(rid)
+            else:
+                found[rid] = record
+        self.hits += len(found)
+        self.misses += len(missing)
+        return found, missing
+
+    def _lookup(self, cache: _ModelCache, rid: int, wanted: FieldSet, fields: List[str],
+                now: float) -> Optional[dict]:
+        for field_set in list(cache.by_id.get(rid, ())):
+            key = (rid, field_set)
+            record, _write_date, stored_at = cache.entries[key]
+            if now - stored_at > self.ttl:
+                cache.pop(key)
+                continue
+            if wanted is None:
+                if field_set is not None:
+                    continue
+                cache.entries.move_to_end(key)
+                return dict(record)
+            if field_set is None or wanted <= field_set:
+                cache.entries.move_to_end(key)
+                return {"id": rid, **{f: record[f] for f in fields if f in record}}
+        return None
+
+    def put_many(self, model: str, records: List[dict], fields: List[str]):
+        """Store freshly read records under the field set they were read with."""
+        if not self.enabled(model):
+            return
+        field_set: FieldSet = frozenset(fields) if fields else None
+        cache = self._model(model)
+        now = time.monotonic()
+        for record in records:
+            cache.put((record["id"], field_set), (record, record.get("write_date"), now))
+
+    def write_dates(self, model: str, ids: Iterable[int]) -> Dict[int, str]:
+        """Return the cached write_date stamp of each id that has one."""
+        cache = self._models.get(model)
+        stamps = {}
+        if cache is None:
+            return stamps
+        for rid in ids:
+            for field_set in cache.by_id.get(rid, ()):
+                write_date = cache.entries[(rid, field_set)][1]
+                if write_date:
+                    stamps[rid] = write_date
+                    break
+        return stamps
+
+    def evict(self, model: Optional[str] = None, ids: Optional[Iterable[int]] = None):
+        """Evict some ids of a model, a whole model, or everything."""
+        if model is None:
+            self._models.clear()
+            return
+        if ids is None:
+            self._models.pop(model, None)
+            return
+        cache = self._models.get(model)
+        if cache is None:
+            return
+        for rid in ids:
+            for field_set in list(cache.by_id.get(rid, ())):
+                cache.pop((rid, field_set))
+
+    def stats(self) -> dict:
+        return {
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "models": {
+                model: {"entries": len(cache.entries), "limit": cache.limit}
+                for model, cache in self._models.items()
+            },
+        }
+
+
+def parse_model_limits(spec: str) -> Dict[str, int]:
+    """Parse 'res.partner:5000,uom.uom:200' into {'res.partner': 5000, 'uom.uom': 200}."""
+    limits = {}
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        model, _, limit = item.rpartition(":")
+        limits[model] = int(limit)
+    return limits
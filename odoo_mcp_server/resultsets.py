@@ -0,0 +1,350 @@
+import re
+import secrets
+import sys
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from serialization import _is_many2one
+
+AGGREGATE_FUNCTIONS = ("sum", "avg", "min", "max", "count", "count_distinct", "bool_and", "bool_or")
+GROUPBY_GRANULARITIES = ("hour", "day", "week", "month", "quarter", "year")
+DISPLAY_NAME = ".display_name"
+
+
+class ResultSetError(ValueError):
+    """Raised for an unknown handle, an oversized set or an invalid query on a stored set."""
+
+
+class ResultSet:
+    """A stored search result, kept column by column.
+
+    A many2one field is kept as an id column plus a ``field.display_name``
+    column, so filters and groups work on plain ids. Equal strings in a
+    column share one object, which keeps repetitive columns small.
+    """
+
+    def __init__(self, model: str, records: List[dict], profile: str):
+        self.model = model
+        self.profile = profile
+        self.created = time.monotonic()
+        self.count = len(records)
+        self.fields = list(dict.fromkeys(key for record in records for key in record))
+        self.many2one = set()
+        self.columns: Dict[str, list] = {}
+        for name in self.fields:
+            values = [record.get(name) for record in records]
+            present = [value for value in values if not _empty(value)]
+            if present and all(_is_many2one(value) for value in present):
+                self.many2one.add(name)
+                self.columns[name] = [value[0] if _is_many2one(value) else None for value in values]
+                values = [value[1] if _is_many2one(value) else None for value in values]
+                name += DISPLAY_NAME
+            shared: Dict[str, str] = {}
+            self.columns[name] = [shared.setdefault(value, value) if isinstance(value, str) else value
+                                  for value in values]
+        self.size = _estimate_size(self.columns)
+
+    @classmethod
+    def from_rows(cls, parent: "ResultSet", rows: List[dict]) -> "ResultSet":
+        return cls(parent.model, rows, parent.profile)
+
+    def column(self, name: str) -> list:
+        if name not in self.columns:
+            raise ResultSetError(f"Unknown field {name!r} in result set (fields: {', '.join(self.fields)})")
+        return self.columns[name]
+
+    def value(self, name: str, index: int) -> Any:
+        """A field value in Odoo's shape, with many2one fields as [id, name] again."""
+        if name in self.many2one:
+            rid = self.columns[name][index]
+            return [rid, self.columns[name + DISPLAY_NAME][index]] if rid is not None else False
+        return self.column(name)[index]
+
+    def rows(self, indices: List[int], fields: List[str]) -> List[dict]:
+        for name in fields:
+            self.column(name)
+        return [{name: self.value(name, index) for name in fields} for index in indices]
+
+    def age(self) -> float:
+        return time.monotonic() - self.created
+
+
+class ResultSetStore:
+    """Stored result sets under random handles, within a memory budget.
+
+    Adding a set evicts the least recently used ones until the estimated
+    size of all sets fits ``budget`` bytes; a set larger than the whole
+    budget is refused.
+    """
+
+    def __init__(self, budget: int):
+        self.budget = budget
+        self._sets: "OrderedDict[str, ResultSet]" = OrderedDict()
+        self.size = 0
+        self.evictions = 0
+
+    def add(self, result_set: ResultSet) -> str:
+        if result_set.size > self.budget:
+            raise ResultSetError(
+                f"Result set of about {result_set.size // 1024} KiB exceeds the "
+                f"{self.budget // 1024} KiB result set budget; narrow the search or select fewer fields"
+            )
+        while self._sets and self.size + result_set.size > self.budget:
+            _handle, evicted = self._sets.popitem(last=False)
+            self.size -= evicted.size
+            self.evictions += 1
+        handle = f"rs_{secrets.token_urlsafe(9)}"
+        self._sets[handle] = result_set
+        self.size += result_set.size
+        return handle
+
+    def get(self, handle: str) -> ResultSet:
+        result_set = self._sets.get(handle)
+        if result_set is None:
+            raise ResultSetError(f"Unknown result set {handle!r}; it may have been evicted, store the search again")
+        self._sets.move_to_end(handle)
+        return result_set
+
+    def drop(self, handle: str) -> bool:
+        result_set = self._sets.pop(handle, None)
+        if result_set is not None:
+            self.size -= result_set.size
+        return result_set is not None
+
+    def stats(self) -> dict:
+        return {
+            "sets": len(self._sets),
+            "size_bytes": self.size,
+            "budget_bytes": self.budget,
+            "evictions": self.evictions,
+        }
+
+
+def describe(handle: str, result_set: ResultSet) -> dict:
+    """What a tool returns about a stored set."""
+    return {
+        "handle": handle,
+        "model": result_set.model,
+        "count": result_set.count,
+        "fields": result_set.fields,
+        "size_bytes": result_set.size,
+        "age": round(result_set.age(), 3),
+    }
+
+
+def select(result_set: ResultSet, where: list, order: Optional[str]) -> List[int]:
+    """Indices of the rows matching an Odoo-style domain, in the requested order."""
+    mask = _domain_mask(result_set, where) if where else None
+    indices = [index for index in range(result_set.count) if mask is None or mask[index]]
+    for name, descending in reversed(_parse_order(order)):
+        column = result_set.column(name)
+        # Empty values sort last ascending and first descending, as in PostgreSQL
+        indices.sort(key=lambda index: _sort_key(column[index]), reverse=descending)
+    return indices
+
+
+def group(result_set: ResultSet, indices: List[int], groupby: List[str], aggregates: List[str],
+          order: Optional[str]) -> Tuple[List[str], List[list]]:
+    """Group rows like odoo_aggregate: returns (columns, rows) with a count and the aggregates per group."""
+    keys = [_group_key(result_set, spec) for spec in groupby]
+    measures = [_aggregate(result_set, spec) for spec in aggregates]
+    groups: Dict[tuple, List[int]] = {}
+    for index in indices:
+        groups.setdefault(tuple(key(index) for key in keys), []).append(index)
+
+    columns = [*groupby, "count", *aggregates]
+    rows = []
+    for values, members in groups.items():
+        labels = [
+            [value, result_set.columns[spec + DISPLAY_NAME][members[0]]]
+            if spec in result_set.many2one and value is not None else (False if value is None else value)
+            for spec, value in zip(groupby, values)
+        ]
+        rows.append([*labels, len(members), *(measure(members) for measure in measures)])
+    sort = _parse_order(order) or [(name, False) for name in groupby]
+    for name, descending in reversed(sort):
+        if name not in columns:
+            raise ResultSetError(f"Cannot order groups by {name!r} (columns: {', '.join(columns)})")
+        position = columns.index(name)
+        # Many2one groups sort by name, as Odoo orders them
+        rows.sort(key=lambda row: _sort_key(row[position][1] if _is_many2one(row[position]) else row[position]),
+                  reverse=descending)
+    return columns, rows
+
+
+def _empty(value: Any) -> bool:
+    return value is None or value is False
+
+
+def _sort_key(value: Any) -> tuple:
+    return (1,) if _empty(value) else (0, value)
+
+
+def _parse_order(order: Optional[str]) -> List[Tuple[str, bool]]:
+    parsed = []
+    for part in (order or "").split(","):
+        bits = part.split()
+        if not bits:
+            continue
+        if len(bits) > 2 or (len(bits) == 2 and bits[1].lower() not in ("asc", "desc")):
+            raise ResultSetError(f"Invalid order {part.strip()!r}, expected 'field [asc|desc]'")
+        parsed.append((bits[0], len(bits) == 2 and bits[1].lower() == "desc"))
+    return parsed
+
+
+def _domain_mask(result_set: ResultSet, domain: list) -> List[bool]:
+    """Evaluate a domain in Odoo's prefix notation ('&', '|', '!') column by column."""
+    if not isinstance(domain, list):
+        raise ResultSetError("where must be a domain list, e.g. [['state', '=', 'sale']]")
+    stack = []
+    for item in reversed(domain):
+        if item == "!":
+            if not stack:
+                raise ResultSetError("'!' needs a term after it")
+            stack.append([not value for value in stack.pop()])
+        elif item in ("&", "|"):
+            if len(stack) < 2:
+                raise ResultSetError(f"{item!r} needs two terms after it")
+            first, second = stack.pop(), stack.pop()
+            combine = (lambda a, b: a and b) if item == "&" else (lambda a, b: a or b)
+            stack.append([combine(a, b) for a, b in zip(first, second)])
+        else:
+            stack.append(_term_mask(result_set, item))
+    mask = [True] * result_set.count
+    for term in stack:
+        mask = [a and b for a, b in zip(mask, term)]
+    return mask
+
+
+def _term_mask(result_set: ResultSet, term: Any) -> List[bool]:
+    if not isinstance(term, (list, tuple)) or len(term) != 3:
+        raise ResultSetError(f"Invalid domain term {term!r}, expected [field, operator, value]")
+    field, operator, value = term
+    if field in result_set.many2one and isinstance(value, str) and operator in _LIKE_OPERATORS:
+        # Like Odoo, text matched against a many2one compares with its display name
+        field += DISPLAY_NAME
+    test = _operator_test(operator, value)
+    return [test(item) for item in result_set.column(field)]
+
+
+_LIKE_OPERATORS = ("like", "ilike", "not like", "not ilike", "=like", "=ilike")
+
+
+def _operator_test(operator: str, value: Any) -> Callable[[Any], bool]:
+    if operator in ("=", "=="):
+        return _empty if value is False else (lambda item: item == value or (isinstance(item, list) and value in item))
+    if operator in ("!=", "<>"):
+        return (lambda item: not _empty(item)) if value is False else (lambda item: item != value)
+    if operator in ("<", "<=", ">", ">="):
+        compare = {
+            "<": lambda a, b: a < b, "<=": lambda a, b: a <= b,
+            ">": lambda a, b: a > b, ">=": lambda a, b: a >= b,
+        }[operator]
+
+        def ordered(item):
+            try:
+                return not _empty(item) and compare(item, value)
+            except TypeError:
+                return False
+        return ordered
+    if operator in ("in", "not in"):
+        if not isinstance(value, (list, tuple)):
+            raise ResultSetError(f"{operator!r} needs a list value")
+        members = set(value)
+        accepts_empty = False in members or None in members
+
+        def contained(item):
+            if isinstance(item, list):
+                return any(element in members for element in item)
+            return accepts_empty if _empty(item) else item in members
+        return contained if operator == "in" else (lambda item: not contained(item))
+    if operator in _LIKE_OPERATORS:
+        if not isinstance(value, str):
+            raise ResultSetError(f"{operator!r} needs a text value")
+        pattern = re.escape(value).replace("%", ".*").replace("_", ".") if operator.startswith("=") else None
+        insensitive = "ilike" in operator
+        regex = re.compile(f"^{pattern}$", re.IGNORECASE | re.DOTALL if insensitive else re.DOTALL) if pattern else None
+        needle = value.lower() if insensitive else value
+
+        def matches(item):
+            if not isinstance(item, str):
+                return False
+            if regex is not None:
+                return regex.match(item) is not None
+            return needle in (item.lower() if insensitive else item)
+        return (lambda item: not matches(item)) if operator.startswith("not") else matches
+    raise ResultSetError(f"Unsupported operator {operator!r}")
+
+
+def _group_key(result_set: ResultSet, spec: str) -> Callable[[int], Any]:
+    field, _, granularity = spec.partition(":")
+    column = result_set.column(field)
+    if not granularity:
+        return lambda index: None if _empty(column[index]) else column[index]
+    if granularity not in GROUPBY_GRANULARITIES:
+        raise ResultSetError(f"Unknown granularity {granularity!r} in {spec!r}, "
+                             f"expected one of {', '.join(GROUPBY_GRANULARITIES)}")
+    return lambda index: None if _empty(column[index]) else _period(column[index], granularity)
+
+
+def _period(value: str, granularity: str) -> str:
+    """Label of the period containing a date or datetime string, sortable as text."""
+    if granularity == "hour":
+        return f"{value[:13]}:00"
+    if granularity == "day":
+        return value[:10]
+    if granularity == "month":
+        return value[:7]
+    if granularity == "year":
+        return value[:4]
+    moment = datetime.strptime(value[:10], "%Y-%m-%d")
+    if granularity == "quarter":
+        return f"{moment.year}-Q{(moment.month - 1) // 3 + 1}"
+    year, week, _day = moment.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _aggregate(result_set: ResultSet, spec: str) -> Callable[[List[int]], Any]:
+    field, _, func = spec.partition(":")
+    func = func or "sum"
+    if func not in AGGREGATE_FUNCTIONS:
+        raise ResultSetError(f"Unknown aggregate function {func!r} in {spec!r}, "
+                             f"expected one of {', '.join(AGGREGATE_FUNCTIONS)}")
+    column = result_set.column(field)
+
+    def measure(members: List[int]) -> Any:
+        values = [column[index] for index in members]
+        if func in ("bool_and", "bool_or"):
+            return (all if func == "bool_and" else any)(bool(value) for value in values)
+        present = [value for value in values if not _empty(value)]
+        if func == "count":
+            return len(present)
+        if func == "count_distinct":
+            return len(set(present))
+        if not present:
+            return False
+        if func == "min":
+            return min(present)
+        if func == "max":
+            return max(present)
+        try:
+            total = sum(present)
+        except TypeError:
+            raise ResultSetError(f"Cannot {func} non-numeric field {field!r}")
+        return total / len(present) if func == "avg" else total
+    return measure
+
+
+def _estimate_size(columns: Dict[str, list]) -> int:
+    """Rough bytes held by the columns: the lists plus each distinct value object once."""
+    size, seen = 0, set()
+    for values in columns.values():
+        size += sys.getsizeof(values)
+        for value in values:
+            if value is None or isinstance(value, bool) or id(value) in seen:
+                continue
+            seen.add(id(value))
+            size += sys.getsizeof(value)
+    return size
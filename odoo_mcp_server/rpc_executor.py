@@ -0,0 +1,39 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class RpcTimeoutError(Exception):
+    """Raised when an Odoo call does not finish within the configured timeout."""
+
+
+class RpcExecutor:
+    """Runs blocking Odoo RPCs on a bounded thread pool.
+
+    At most ``max_concurrency`` calls are in flight at once; further calls wait
+    for a free slot without blocking the event loop. Each call is bounded by
+    ``timeout`` seconds.
+    """
+
+    def __init__(self, max_concurrency: int = 8, timeout: Optional[float] = 60.0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="odoo-rpc")
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self.in_flight = 0
+
+    async def run(self, func: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """Run func(*args) in the pool and await its result."""
+        timeout = self.timeout if timeout is None else timeout
+        async with self._slots:
+            self.in_flight += 1
+            try:
+                future = asyncio.get_running_loop().run_in_executor(self._pool, func, *args)
+                return await asyncio.wait_for(future, timeout=timeout or None)
+            except asyncio.TimeoutError:
+                raise RpcTimeoutError(f"Odoo call timed out after {timeout}s")
+            finally:
+                self.in_flight -= 1
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,88 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+
+def dumps(obj: Any) -> str:
+    """Serialize a tool result to JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, default=str, ensure_ascii=False, separators=(",", ":"))
+
+
+def loads(data: bytes) -> Any:
+    """Parse JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _is_many2one(value: Any) -> bool:
+    return (
+        isinstance(value, list) and len(value) == 2
+        and isinstance(value[0], int) and not isinstance(value[0], bool)
+        and isinstance(value[1], str)
+    )
+
+
+def compact(obj: Any) -> Any:
+    """Shrink a result for token-sensitive clients.
+
+    Keys whose value is None or False are left out, and many2one pairs such as
+    ``"partner_id": [7, "Azure"]`` become ``"partner_id": 7`` plus
+    ``"partner_id.display_name": "Azure"``.
+    """
+    if isinstance(obj, list):
+        return [compact(item) for item in obj]
+    if not isinstance(obj, dict):
+        return obj
+    out = {}
+    for key, value in obj.items():
+        if value is None or value is False:
+            continue
+        if _is_many2one(value):
+            out[key] = value[0]
+            out[f"{key}.display_name"] = value[1]
+        else:
+            out[key] = compact(value)
+    return out
+
+
+def columnar(records: list) -> dict:
+    """Turn a list of records into one list of values per field.
+
+    Returns ``{"count", "fields", "columns"}``, plus ``"dictionaries"`` when
+    some columns are dictionary-encoded. A many2one field becomes two
+    columns, ``field`` with the ids and ``field.display_name`` with the
+    names, None where the field is empty. A string column where most
+    values repeat is sent as integer codes into ``dictionaries[field]``.
+    Field names are sent once instead of once per record, which makes wide,
+    tall results several times smaller.
+    """
+    names = list(dict.fromkeys(key for record in records for key in record))
+    fields, columns, dictionaries = [], {}, {}
+    for name in names:
+        values = [record.get(name) for record in records]
+        present = [value for value in values if value is not None and value is not False]
+        if present and all(_is_many2one(value) for value in present):
+            pairs = [value if _is_many2one(value) else (None, None) for value in values]
+            columns[name] = [pair[0] for pair in pairs]
+            columns[f"{name}.display_name"] = [pair[1] for pair in pairs]
+            fields.extend((name, f"{name}.display_name"))
+            continue
+        fields.append(name)
+        if present and all(isinstance(value, str) for value in present):
+            distinct = list(dict.fromkeys(present))
+            if len(distinct) * 2 <= len(present):
+                codes = {value: code for code, value in enumerate(distinct)}
+                dictionaries[name] = distinct
+                values = [codes.get(value) if isinstance(value, str) else None for value in values]
+        columns[name] = values
+    result = {"count": len(records), "fields": fields, "columns": columns}
+    if dictionaries:
+        result["dictionaries"] = dictionaries
+    return result
@@ -0,0 +1,192 @@
+import threading
+import time
+import xmlrpc.client
+from typing import Any, Callable, List, Optional
+
+# Odoo reports rejected credentials with this fault code (odoo.service.wsgi_server)
+ACCESS_DENIED_FAULT_CODE = 3
+
+
+def _is_access_denied(fault: xmlrpc.client.Fault) -> bool:
+    """Return True when an RPC fault means Odoo rejected the credentials."""
+    return (
+        fault.faultCode == ACCESS_DENIED_FAULT_CODE
+        or "AccessDenied" in str(fault.faultString)
+        or "Access Denied" in str(fault.faultString)
+    )
+
+
+class PooledConnection:
+    """A reusable connection plus its pool bookkeeping."""
+
+    __slots__ = ("conn", "created_at", "last_used")
+
+    def __init__(self, conn: Any):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+    def close(self):
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of keep-alive connections.
+
+    Connections idle for longer than ``idle_timeout`` or older than
+    ``max_lifetime`` seconds are closed instead of being reused. When all
+    ``size`` connections are busy, callers wait for one to be released.
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int = 8,
+                 idle_timeout: float = 60.0, max_lifetime: float = 600.0):
+        self._factory = factory
+        self.size = max(1, size)
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self._idle: List[PooledConnection] = []
+        self._open = 0
+        self._cond = threading.Condition()
+
+    def _expired(self, pooled: PooledConnection, now: float) -> bool:
+        return (now - pooled.last_used > self.idle_timeout
+                or now - pooled.created_at > self.max_lifetime)
+
+    def acquire(self) -> PooledConnection:
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                while self._idle:
+                    pooled = self._idle.pop()
+                    if not self._expired(pooled, now):
+                        return pooled
+                    self._open -= 1
+                    pooled.close()
+                if self._open < self.size:
+                    self._open += 1
+                    break
+                self._cond.wait()
+        try:
+            return PooledConnection(self._factory())
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, pooled: PooledConnection):
+        pooled.last_used = time.monotonic()
+        with self._cond:
+            if pooled.last_used - pooled.created_at > self.max_lifetime:
+                self._open -= 1
+                pooled.close()
+            else:
+                self._idle.append(pooled)
+            self._cond.notify()
+
+    def discard(self, pooled: PooledConnection):
+        """Close a connection that may be broken instead of returning it."""
+        pooled.close()
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "pool_size": self.size,
+                "open_connections": self._open,
+                "idle_connections": len(self._idle),
+            }
+
+    def close(self):
+        """Close every idle connection."""
+        with self._cond:
+            while self._idle:
+                self._idle.pop().close()
+                self._open -= 1
+
+
+class OdooSession:
+    """Long-lived authenticated Odoo session.
+
+    The uid is cached after the first authenticate and only refreshed when Odoo
+    rejects the credentials. The wire protocol and connection pooling are
+    delegated to a transport (see transports.py).
+    """
+
+    def __init__(self, transport: Any, db: str, username: str, password: str, metrics: Any = None):
+        self.transport = transport
+        self.metrics = metrics
+        self.db = db
+        self.username = username
+        self.password = password
+
+        self._uid: Optional[int] = None
+        self._auth_generation = 0
+        self._auth_lock = threading.Lock()
+
+    @property
+    def uid(self) -> Optional[int]:
+        return self._uid
+
+    def authenticate(self, force: bool = False) -> int:
+        """Authenticate with Odoo, reusing the cached uid unless forced."""
+        with self._auth_lock:
+            if self._uid and not force:
+                return self._uid
+
+            if not self.username or not self.password:
+                raise Exception("A username and password are required for authentication "
+                                "(ODOO_USERNAME/ODOO_PASSWORD, or ODOO_PROFILE_<NAME>_USERNAME/_PASSWORD "
+                                "for a profile on its own URL)")
+
+            start = time.perf_counter()
+            try:
+                uid = self.transport.authenticate(self.db, self.username, self.password)
+            finally:
+                if self.metrics is not None:
+                    self.metrics.observe_stage("auth", time.perf_counter() - start)
+
+            if not uid:
+                self._uid = None
+                raise Exception("Authentication failed - check your credentials")
+
+            self._uid = uid
+            self._auth_generation += 1
+            return uid
+
+    def execute_kw(self, model: str, method: str, args: list, kwargs: Optional[dict] = None) -> Any:
+        """Call model.method on Odoo, re-authenticating once if the credentials are rejected."""
+        self.authenticate()
+        generation = self._auth_generation
+        try:
+            return self._call(model, method, args, kwargs)
+        except xmlrpc.client.Fault as e:
+            if not _is_access_denied(e):
+                raise
+            # Another thread may already have refreshed the uid for us
+            with self._auth_lock:
+                stale = generation == self._auth_generation
+            self.authenticate(force=stale)
+            return self._call(model, method, args, kwargs)
+
+    def _call(self, model: str, method: str, args: list, kwargs: Optional[dict]) -> Any:
+        return self.transport.execute_kw(
+            self.db, self._uid, self.password,
+            model, method, args, kwargs or {}
+        )
+
+    def stats(self) -> dict:
+        """Return a snapshot of the session and its connection pool."""
+        return {
+            "authenticated": bool(self._uid),
+            "transport": self.transport.name,
+            **self.transport.stats(),
+        }
+
+    def close(self):
+        self.transport.close()
@@ -0,0 +1,214 @@
+import gzip
+import http.client
+import itertools
+import time
+import xmlrpc.client
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+import serialization
+from session_pool import ACCESS_DENIED_FAULT_CODE, ConnectionPool
+
+# Errors raised when a kept-alive connection was closed by the server while idle
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+
+class _TransportOptions:
+    """Socket timeout and response statistics for xmlrpc.client transports."""
+
+    timeout: Optional[float] = None
+    # (wire size in bytes, seconds spent reading and parsing) of the last response
+    last_response = (0, 0.0)
+
+    def make_connection(self, host):
+        conn = super().make_connection(host)
+        conn.timeout = self.timeout
+        return conn
+
+    def parse_response(self, response):
+        start = time.perf_counter()
+        result = super().parse_response(response)
+        self.last_response = (int(response.getheader("Content-Length") or 0), time.perf_counter() - start)
+        return result
+
+
+class _TimeoutTransport(_TransportOptions, xmlrpc.client.Transport):
+    """XML-RPC transport whose HTTP connections carry a socket timeout."""
+
+
+class _SafeTimeoutTransport(_TransportOptions, xmlrpc.client.SafeTransport):
+    pass
+
+
+class _XmlRpcConnection:
+    """ServerProxy wrapper with a close() method the pool can call."""
+
+    def __init__(self, url: str, timeout: Optional[float]):
+        transport = _SafeTimeoutTransport() if url.startswith("https") else _TimeoutTransport()
+        transport.timeout = timeout
+        self.transport = transport
+        self.proxy = xmlrpc.client.ServerProxy(url, transport=transport)
+
+    def close(self):
+        self.proxy("close")()
+
+
+class XmlRpcTransport:
+    """Odoo's /xmlrpc/2 endpoints over pooled keep-alive ServerProxy objects."""
+
+    name = "xmlrpc"
+
+    def __init__(self, url: str, pool_size: int = 8, idle_timeout: float = 60.0,
+                 max_lifetime: float = 600.0, timeout: Optional[float] = None, metrics: Any = None):
+        self.url = (url or "").rstrip("/")
+        self.timeout = timeout
+        self.metrics = metrics
+        self.pool = ConnectionPool(
+            lambda: _XmlRpcConnection(f"{self.url}/xmlrpc/2/object", timeout),
+            pool_size, idle_timeout, max_lifetime
+        )
+
+    def authenticate(self, db: str, login: str, password: str) -> Any:
+        common = _XmlRpcConnection(f"{self.url}/xmlrpc/2/common", self.timeout)
+        try:
+            return common.proxy.authenticate(db, login, password, {})
+        finally:
+            common.close()
+
+    def execute_kw(self, db: str, uid: int, password: str, model: str, method: str,
+                   args: list, kwargs: dict) -> Any:
+        pooled = self.pool.acquire()
+        try:
+            result = pooled.conn.proxy.execute_kw(db, uid, password, model, method, args, kwargs)
+        except xmlrpc.client.Fault:
+            # Application-level error: the connection itself is still healthy
+            self.pool.release(pooled)
+            raise
+        except Exception:
+            self.pool.discard(pooled)
+            raise
+        # Read before releasing: once back in the pool another thread may reuse the connection
+        size, seconds = pooled.conn.transport.last_response
+        self.pool.release(pooled)
+        if self.metrics is not None:
+            self.metrics.record_decode(model, method, size, seconds)
+        return result
+
+    def stats(self) -> dict:
+        return self.pool.stats()
+
+    def close(self):
+        self.pool.close()
+
+
+class JsonRpcTransport:
+    """Odoo's /jsonrpc endpoint over pooled HTTP/1.1 keep-alive connections.
+
+    Responses are requested gzip-compressed. Odoo errors are raised as
+    xmlrpc.client.Fault so callers handle both transports the same way.
+    """
+
+    name = "jsonrpc"
+
+    def __init__(self, url: str, pool_size: int = 8, idle_timeout: float = 60.0,
+                 max_lifetime: float = 600.0, timeout: Optional[float] = None, metrics: Any = None):
+        parts = urlsplit((url or "").rstrip("/"))
+        self._https = parts.scheme == "https"
+        self._host = parts.netloc
+        self._path = f"{parts.path}/jsonrpc"
+        self.timeout = timeout
+        self.metrics = metrics
+        self._ids = itertools.count(1)
+        self.pool = ConnectionPool(self._connect, pool_size, idle_timeout, max_lifetime)
+        self.bytes_received = 0
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self._https:
+            return http.client.HTTPSConnection(self._host, timeout=self.timeout)
+        return http.client.HTTPConnection(self._host, timeout=self.timeout)
+
+    def _post(self, conn: http.client.HTTPConnection, body: bytes) -> tuple:
+        conn.request("POST", self._path, body=body, headers={
+            "Content-Type": "application/json",
+            "Accept-Encoding": "gzip",
+        })
+        response = conn.getresponse()
+        data = response.read()
+        if response.status != 200:
+            raise http.client.HTTPException(f"HTTP {response.status} {response.reason} from {self._path}")
+        self.bytes_received += len(data)
+        return data, response.getheader("Content-Encoding") == "gzip"
+
+    def call(self, service: str, method: str, *args: Any) -> Any:
+        """Call service.method and return the result, decoded from JSON."""
+        result, _, _ = self._call(service, method, *args)
+        return result
+
+    def _call(self, service: str, method: str, *args: Any) -> tuple:
+        """Like call(), also returning the response's wire size and decode time."""
+        body = serialization.dumps({
+            "jsonrpc": "2.0",
+            "method": "call",
+            "params": {"service": service, "method": method, "args": list(args)},
+            "id": next(self._ids),
+        }).encode()
+        pooled = self.pool.acquire()
+        try:
+            try:
+                data, gzipped = self._post(pooled.conn, body)
+            except _STALE_CONNECTION_ERRORS:
+                # The server dropped the idle keep-alive connection; retry once on a new one
+                pooled.conn.close()
+                data, gzipped = self._post(pooled.conn, body)
+        except Exception:
+            self.pool.discard(pooled)
+            raise
+        self.pool.release(pooled)
+
+        size, start = len(data), time.perf_counter()
+        reply = serialization.loads(gzip.decompress(data) if gzipped else data)
+        error = reply.get("error")
+        if error:
+            raise _fault_from_error(error)
+        return reply.get("result"), size, time.perf_counter() - start
+
+    def authenticate(self, db: str, login: str, password: str) -> Any:
+        return self.call("common", "authenticate", db, login, password, {})
+
+    def execute_kw(self, db: str, uid: int, password: str, model: str, method: str,
+                   args: list, kwargs: dict) -> Any:
+        result, size, seconds = self._call("object", "execute_kw", db, uid, password, model, method, args, kwargs)
+        if self.metrics is not None:
+            self.metrics.record_decode(model, method, size, seconds)
+        return result
+
+    def stats(self) -> dict:
+        return {**self.pool.stats(), "bytes_received": self.bytes_received}
+
+    def close(self):
+        self.pool.close()
+
+
+def _fault_from_error(error: dict) -> xmlrpc.client.Fault:
+    """Map an Odoo JSON-RPC error object to the equivalent XML-RPC fault."""
+    data = error.get("data") or {}
+    name = data.get("name", "")
+    message = data.get("message") or error.get("message", "Odoo error")
+    if name.endswith("AccessDenied"):
+        return xmlrpc.client.Fault(ACCESS_DENIED_FAULT_CODE, message)
+    return xmlrpc.client.Fault(error.get("code", 1), f"{name}: {message}" if name else message)
+
+
+TRANSPORTS = {
+    XmlRpcTransport.name: XmlRpcTransport,
+    JsonRpcTransport.name: JsonRpcTransport,
+}
+
+
+def make_transport(name: str, url: str, **options: Any):
+    """Build the transport selected by name ('xmlrpc' or 'jsonrpc')."""
+    try:
+        transport_class = TRANSPORTS[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown Odoo transport: {name} (expected one of {', '.join(TRANSPORTS)})")
+    return transport_class(url, **options)
@@ -0,0 +1,44 @@
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "odoo_mcp_server"))
+
+from fake_odoo import fake_odoo_env, start_fake_odoo  # noqa: E402
+
+MIRRORED_MODELS = "product.template"
+
+
+@pytest.fixture(scope="session")
+def fake_odoo():
+    """A fake Odoo shared by the session; main.py reads its settings once, at import."""
+    httpd, url = start_fake_odoo(records=50, image_size=64)
+    os.environ.update(fake_odoo_env(url))
+    os.environ["ODOO_MIRROR_MODELS"] = MIRRORED_MODELS
+    os.environ["ODOO_MIRROR_PATH"] = os.path.join(tempfile.mkdtemp(), "mirror.sqlite3")
+    yield httpd.odoo
+    httpd.shutdown()
+
+
+@pytest.fixture(scope="session")
+def odoo_main(fake_odoo):
+    import main
+
+    return main
+
+
+@pytest.fixture
+def server(odoo_main):
+    """A fresh server with cold caches; call its coroutines inside one asyncio.run()."""
+    return odoo_main.OdooMCPServer()
+
+
+@pytest.fixture
+def unique_name():
+    """A record name no other test uses, to find this test's records in the shared fake Odoo."""
+    return f"Test {uuid.uuid4().hex[:8]}"
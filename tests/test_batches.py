@@ -0,0 +1,36 @@
+import asyncio
+
+
+def test_write_batch_applies_conflicting_updates_in_order(server, fake_odoo):
+    updates = [
+        {"ids": [1], "values": {"name": "A"}},
+        {"ids": [1], "values": {"name": "B"}},
+        {"ids": [1, 2], "values": {"name": "A"}},
+        {"ids": [3], "values": {"name": "B"}},
+    ]
+    result = asyncio.run(server._write_batch("res.partner", updates))
+    assert result["errors"] == []
+    assert fake_odoo.data["res.partner"][1]["name"] == "A"
+    assert fake_odoo.data["res.partner"][2]["name"] == "A"
+    assert fake_odoo.data["res.partner"][3]["name"] == "B"
+    # {1: A} then {1: B} then {1, 2: A} cannot merge; {3: B} joins the B group
+    assert result["merged_groups"] == 3
+
+
+def test_create_batch_retries_items_only_after_an_odoo_fault(server, fake_odoo, unique_name):
+    result = asyncio.run(server._create_batch("res.partner", [{"name": unique_name}, {"bogus": 1}]))
+    assert result["ids"][0] and result["ids"][1] is None
+    assert result["errors"] == [{"index": 1, "error": result["errors"][0]["error"]}]
+
+
+def test_create_batch_never_retries_after_a_transport_error(server, fake_odoo, unique_name):
+    async def scenario():
+        await server._test_connection()
+        fake_odoo.fail_requests = 1
+        return await server._create_batch("res.partner", [{"name": unique_name}, {"name": unique_name}])
+
+    result = asyncio.run(scenario())
+    fake_odoo.fail_requests = 0
+    assert [error["outcome"] for error in result["errors"]] == ["unknown", "unknown"]
+    assert result["ids"] == [None, None]
+    assert not [r for r in fake_odoo.data["res.partner"].values() if r.get("name") == unique_name]
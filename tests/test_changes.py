@@ -0,0 +1,35 @@
+import asyncio
+import json
+
+
+def test_changes_pages_through_records_written_in_one_second(server, fake_odoo, unique_name):
+    # Odoo keeps microseconds, read() returns whole seconds: the feed must neither repeat nor stall
+    async def scenario():
+        created = await server._create_batch("res.partner", [{"name": f"{unique_name} {i}"} for i in range(5)])
+        since = min(fake_odoo.data["res.partner"][rid]["write_date"] for rid in created["ids"])[:19]
+        pages, token = [], None
+        for _ in range(10):
+            page = await server._fetch_changes("res.partner", token=token, since=since,
+                                               domain=[["name", "like", unique_name]], fields=["name"], limit=2)
+            pages.append([record["id"] for record in page["records"]])
+            token = page["next_token"]
+            if not page["has_more"]:
+                break
+        return created["ids"], pages
+
+    ids, pages = asyncio.run(scenario())
+    assert pages == [sorted(ids)[:2], sorted(ids)[2:4], sorted(ids)[4:]]
+
+
+def test_changes_resource_reports_only_writes_after_its_first_read(server, unique_name):
+    async def scenario():
+        first = json.loads(await server._read_changes_resource("res.partner"))
+        unchanged = json.loads(await server._read_changes_resource("res.partner"))
+        created = await server._create_batch("res.partner", [{"name": unique_name}])
+        changed = json.loads(await server._read_changes_resource("res.partner"))
+        return first, unchanged, created["ids"], changed
+
+    first, unchanged, ids, changed = asyncio.run(scenario())
+    assert first["message"] == "Watching res.partner for changes"
+    assert unchanged["records"] == [], unchanged["message"]
+    assert [record["id"] for record in changed["records"]] == ids
@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+
+from domain import (FALSE_LEAF, TRUE_LEAF, DomainError, compile_domain, is_false_domain, parse_model_fields,
+                    second_domain, watermark_domain)
+
+FIELDS = {
+    "name": {"type": "char"},
+    "ref": {"type": "char"},
+    "state": {"type": "selection"},
+    "amount": {"type": "float"},
+    "partner_id": {"type": "many2one", "relation": "res.partner"},
+    "tag_ids": {"type": "many2many", "relation": "res.partner.category"},
+}
+
+
+def test_tuples_and_operator_aliases_normalize():
+    assert compile_domain([("name", "==", "A"), ("state", "<>", "done"), ("ref", "ILIKE", "x")]) == [
+        ["name", "=", "A"], ["ref", "ilike", "x"], ["state", "!=", "done"],
+    ]
+
+
+def test_equivalent_domains_compile_identically():
+    first = compile_domain([["state", "=", "sale"], ["amount", ">", 10]])
+    assert compile_domain([["amount", ">", 10], ["state", "=", "sale"], ["state", "=", "sale"]]) == first
+    assert compile_domain(["&", ["amount", ">", 10], ["state", "=", "sale"]]) == first
+
+
+def test_in_folding():
+    assert compile_domain([["state", "in", ["sale"]]]) == [["state", "=", "sale"]]
+    assert compile_domain([["state", "not in", ["sale"]]]) == [["state", "!=", "sale"]]
+    assert compile_domain([["id", "in", [3, 1, 3]]]) == [["id", "in", [1, 3]]]
+    assert compile_domain([["id", "in", 7]]) == [["id", "=", 7]]
+
+
+def test_empty_in_folds_to_constants():
+    assert is_false_domain(compile_domain([["id", "in", []]]))
+    assert is_false_domain(compile_domain([["state", "=", "sale"], ["id", "in", []]]))
+    assert compile_domain([["id", "not in", []]]) == []
+    assert compile_domain(["|", ["id", "in", []], ["state", "=", "sale"]]) == [["state", "=", "sale"]]
+    assert compile_domain(["|", ["id", "not in", []], ["state", "=", "sale"]]) == []
+
+
+def test_optional_equality():
+    assert compile_domain([["partner_id", "=?", False], ["state", "=", "sale"]]) == [["state", "=", "sale"]]
+    assert compile_domain([["partner_id", "=?", None]]) == []
+    assert compile_domain([["partner_id", "=?", 7]]) == [["partner_id", "=", 7]]
+
+
+def test_constant_leaves():
+    assert compile_domain([TRUE_LEAF]) == []
+    assert compile_domain([FALSE_LEAF]) == [FALSE_LEAF]
+    assert compile_domain(["|", TRUE_LEAF, ["state", "=", "sale"]]) == []
+    assert compile_domain(["|", FALSE_LEAF, ["state", "=", "sale"]]) == [["state", "=", "sale"]]
+    assert compile_domain(["!", FALSE_LEAF]) == []
+
+
+def test_negation_is_pushed_into_terms():
+    assert compile_domain(["!", ["state", "=", "done"]]) == [["state", "!=", "done"]]
+    assert compile_domain(["!", ["amount", "<", 5]]) == [["amount", ">=", 5]]
+    assert compile_domain(["!", ["name", "ilike", "x"]]) == [["name", "not ilike", "x"]]
+    assert compile_domain(["!", "!", ["state", "=", "done"]]) == [["state", "=", "done"]]
+
+
+def test_negation_follows_de_morgan():
+    assert compile_domain(["!", "&", ["state", "=", "done"], ["amount", ">", 5]]) == [
+        "|", ["amount", "<=", 5], ["state", "!=", "done"],
+    ]
+    assert compile_domain(["!", "|", ["state", "=", "done"], ["amount", ">", 5]]) == [
+        ["amount", "<=", 5], ["state", "!=", "done"],
+    ]
+
+
+def test_operators_without_negation_keep_the_bang():
+    assert compile_domain(["!", ["name", "=like", "A%"]]) == ["!", ["name", "=like", "A%"]]
+    assert compile_domain(["!", ["partner_id", "child_of", 1]]) == ["!", ["partner_id", "child_of", 1]]
+
+
+def test_nested_or_is_flattened():
+    assert compile_domain(["|", ["state", "=", "a"], "|", ["state", "=", "b"], ["state", "=", "a"]]) == [
+        "|", ["state", "=", "a"], ["state", "=", "b"],
+    ]
+
+
+def test_prefix_rewrite():
+    assert compile_domain([["ref", "ilike", "P00"]], prefix_fields={"ref"}) == [["ref", "=ilike", "P00%"]]
+    # Patterns, empty values and other fields are left alone
+    assert compile_domain([["ref", "ilike", "P%1"]], prefix_fields={"ref"}) == [["ref", "ilike", "P%1"]]
+    assert compile_domain([["ref", "ilike", ""]], prefix_fields={"ref"}) == [["ref", "ilike", ""]]
+    assert compile_domain([["name", "ilike", "P00"]], prefix_fields={"ref"}) == [["name", "ilike", "P00"]]
+    assert compile_domain([["ref", "like", "P00"]], prefix_fields={"ref"}) == [["ref", "like", "P00"]]
+
+
+def test_fields_are_checked_against_the_model():
+    assert compile_domain([["id", "=", 1], ["partner_id.name", "ilike", "a"]], "sale.order", FIELDS)
+    assert compile_domain([["tag_ids", "any", [["name", "=", "x"]]]], "sale.order", FIELDS)
+    with pytest.raises(DomainError, match="did you mean state"):
+        compile_domain([["stat", "=", "sale"]], "sale.order", FIELDS)
+    with pytest.raises(DomainError, match="Cannot follow 'name.x'"):
+        compile_domain([["name.x", "=", 1]], "sale.order", FIELDS)
+    with pytest.raises(DomainError, match="needs a relational field"):
+        compile_domain([["name", "any", []]], "sale.order", FIELDS)
+
+
+@pytest.mark.parametrize("domain, message", [
+    ("state = sale", "must be a list"),
+    ([["state", "="]], "Invalid domain term"),
+    (["&", ["state", "=", "a"]], "ends before"),
+    (["!"], "ends before"),
+    ([["state", "equals", "a"]], "Invalid operator"),
+    ([[1, "=", "a"]], "Invalid field name"),
+])
+def test_malformed_domains(domain, message):
+    with pytest.raises(DomainError, match=message):
+        compile_domain(domain)
+
+
+def test_watermark_domain():
+    assert watermark_domain("2024-01-01 10:00:00", []) == [["write_date", ">=", "2024-01-01 10:00:00"]]
+    assert watermark_domain("2024-12-31 23:59:59", [4, 7]) == [
+        "|", ["write_date", ">=", "2025-01-01 00:00:00"],
+        "&", ["write_date", ">=", "2024-12-31 23:59:59"], ["id", "not in", [4, 7]],
+    ]
+
+
+def test_second_domain():
+    assert second_domain("2024-12-31 23:59:59") == [
+        ["write_date", ">=", "2024-12-31 23:59:59"], ["write_date", "<", "2025-01-01 00:00:00"],
+    ]
+
+
+def test_parse_model_fields():
+    assert parse_model_fields("res.partner:ref, product.template:default_code,res.partner:vat,") == {
+        "res.partner": {"ref", "vat"}, "product.template": {"default_code"},
+    }
+    assert parse_model_fields("") == {}
+
+
+def test_search_rejects_a_false_domain_without_calling_odoo(server, fake_odoo):
+    async def scenario():
+        await server._search_records("res.partner", [], ["name"], 1)
+        before = fake_odoo.rpc_count
+        result = await server._search_records("res.partner", [["id", "in", []]], ["name"], 10)
+        return result, fake_odoo.rpc_count - before
+
+    result, rpcs = asyncio.run(scenario())
+    assert result["records"] == [] and result["next_cursor"] is None
+    assert rpcs == 0
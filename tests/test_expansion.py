@@ -0,0 +1,16 @@
+import asyncio
+
+
+def test_read_expands_relations_in_one_read_per_model(server, fake_odoo):
+    async def scenario():
+        await server._test_connection()
+        reads = fake_odoo.calls.get("res.partner.read", 0)
+        result = await server._read_records("sale.order", [1, 2, 3], ["name", "partner_id"],
+                                            expand={"partner_id": ["name"]})
+        return result, fake_odoo.calls.get("res.partner.read", 0) - reads
+
+    result, partner_reads = asyncio.run(scenario())
+    assert [record["partner_id"]["name"] for record in result["records"]] == [
+        fake_odoo.data["res.partner"][fake_odoo.data["sale.order"][rid]["partner_id"]]["name"] for rid in (1, 2, 3)
+    ]
+    assert partner_reads == 1
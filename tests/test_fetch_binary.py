@@ -0,0 +1,13 @@
+import asyncio
+
+
+def test_fetch_binary_needs_an_attachment_or_a_field(server, tmp_path):
+    async def scenario():
+        missing = await server._fetch_binary("product.template", None, None, str(tmp_path / "a"))
+        written = await server._fetch_binary("product.template", 1, "image_1920", str(tmp_path / "b"))
+        return missing, written
+
+    missing, written = asyncio.run(scenario())
+    assert missing == {"error": "Give either attachment_id or all of model, id and field"}
+    assert written["size"] == 64
+    assert (tmp_path / "b").stat().st_size == 64
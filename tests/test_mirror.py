@@ -0,0 +1,27 @@
+import asyncio
+
+
+def test_mirror_pages_in_the_same_order_as_odoo(server):
+    async def scenario():
+        remote = await server._search_records("product.template", [], ["name"], 10, offset=5)
+        local = await server._search_records("product.template", [], ["name"], 10, offset=5, max_staleness=3600)
+        by_name = await server._search_records("product.template", [], ["name"], 5, order="name desc",
+                                               max_staleness=3600)
+        remote_by_name = await server._search_records("product.template", [], ["name"], 5, order="name desc")
+        return remote, local, by_name, remote_by_name
+
+    remote, local, by_name, remote_by_name = asyncio.run(scenario())
+    assert "mirror_age" in local and "mirror_age" not in remote
+    assert local["records"] == remote["records"]
+    assert by_name["records"] == remote_by_name["records"]
+
+
+def test_mirror_defers_to_odoo_without_a_known_default_order(server):
+    async def scenario():
+        await server.mirror.sync("product.template")
+        server.mirror._orders["product.template"] = None
+        return await server._search_records("product.template", [], ["name"], 3, max_staleness=3600)
+
+    result = asyncio.run(scenario())
+    assert "mirror_age" not in result
+    assert [record["id"] for record in result["records"]] == [1, 2, 3]
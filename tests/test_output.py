@@ -0,0 +1,18 @@
+import json
+
+from mcp import types
+
+
+def test_structured_content_carries_the_whole_result(server, monkeypatch):
+    monkeypatch.setattr(server, "_client_supports_structured_content", lambda: True)
+    content, structured = server._tool_output({"records": [{"id": 1, "name": False}]}, compact=True)
+    assert structured == {"records": [{"id": 1}]}
+    assert json.loads(content[0].text) == structured
+
+
+def test_inline_export_parts_are_never_hidden_behind_structured_content(server, monkeypatch):
+    monkeypatch.setattr(server, "_client_supports_structured_content", lambda: True)
+    chunk = types.TextContent(type="text", text='{"id": 1}\n')
+    content = server._tool_output({"message": "Exported 1 records", "count": 1}, extra_content=[chunk])
+    assert isinstance(content, list)
+    assert content[1] is chunk
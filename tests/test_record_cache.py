@@ -0,0 +1,17 @@
+import asyncio
+
+
+def test_write_batch_evicts_cached_records_even_when_the_write_fails(server, fake_odoo):
+    async def scenario():
+        cached = await server._read_records("res.partner", [5], ["name"])
+        # Odoo commits the write but every response is lost
+        fake_odoo.data["res.partner"][5]["name"] = "Committed"
+        fake_odoo.fail_requests = 2
+        written = await server._write_batch("res.partner", [{"ids": [5], "values": {"name": "Committed"}}])
+        fake_odoo.fail_requests = 0
+        return cached, written, await server._read_records("res.partner", [5], ["name"])
+
+    cached, written, reread = asyncio.run(scenario())
+    assert cached["records"][0]["name"] != "Committed"
+    assert written["errors"] and written["errors"][0]["index"] == 0
+    assert reread["records"][0]["name"] == "Committed"
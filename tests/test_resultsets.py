@@ -0,0 +1,179 @@
+import asyncio
+from collections import defaultdict
+
+import pytest
+
+import resultsets
+from resultsets import ResultSet, ResultSetError, ResultSetStore
+
+
+RECORDS = [
+    {"id": 1, "name": "100% Cotton", "partner_id": [7, "Azure Interior"], "amount": 10.0,
+     "date": "2024-01-31 23:00:00", "tag_ids": [1, 2]},
+    {"id": 2, "name": "a.b_c", "partner_id": [8, "Deco Addict"], "amount": 5.0,
+     "date": "2024-02-01 08:00:00", "tag_ids": []},
+    {"id": 3, "name": "aXb-c", "partner_id": False, "amount": False,
+     "date": "2024-04-01 00:00:00", "tag_ids": [2]},
+    {"id": 4, "name": False, "partner_id": [7, "Azure Interior"], "amount": 2.5,
+     "date": False, "tag_ids": [3]},
+]
+
+
+@pytest.fixture
+def result_set():
+    return ResultSet("sale.order", RECORDS, "default")
+
+
+def ids(result_set, where, order=None):
+    return [result_set.value("id", index) for index in resultsets.select(result_set, where, order)]
+
+
+@pytest.mark.parametrize("where, expected", [
+    ([["name", "=like", "a.b_c"]], [2]),
+    ([["name", "=like", "a_b%"]], [2, 3]),
+    ([["name", "=ilike", "AXB%"]], [3]),
+    ([["name", "=like", "100%"]], [1]),
+    ([["name", "like", "%"]], [1]),
+    ([["name", "ilike", "A.B"]], [2]),
+    ([["name", "not ilike", "a"]], [1, 4]),
+    ([["name", "=", False]], [4]),
+    ([["name", "!=", False]], [1, 2, 3]),
+    ([["amount", ">", 4]], [1, 2]),
+    ([["partner_id", "=", 7]], [1, 4]),
+    ([["partner_id", "in", [8, False]]], [2, 3]),
+    ([["partner_id", "not in", [7]]], [2, 3]),
+    ([["partner_id", "ilike", "azure"]], [1, 4]),
+    ([["tag_ids", "=", 2]], [1, 3]),
+    ([["tag_ids", "in", [3]]], [4]),
+    (["|", ["id", "=", 1], ["amount", "=", False]], [1, 3]),
+    (["!", ["partner_id", "=", 7], ["id", "<", 3]], [2]),
+    ([], [1, 2, 3, 4]),
+])
+def test_select_filters_like_odoo(result_set, where, expected):
+    assert ids(result_set, where) == expected
+
+
+@pytest.mark.parametrize("where, message", [
+    ({"name": "x"}, "domain list"),
+    ([["name", "~", "x"]], "Unsupported operator"),
+    ([["name", "in", "x"]], "needs a list"),
+    ([["name", "like", 3]], "needs a text"),
+    ([["missing", "=", 1]], "Unknown field"),
+    (["|", ["id", "=", 1]], "needs two terms"),
+])
+def test_select_rejects_invalid_domains(result_set, where, message):
+    with pytest.raises(ResultSetError, match=message):
+        resultsets.select(result_set, where, None)
+
+
+def test_select_sorts_empty_values_last_ascending_and_first_descending(result_set):
+    assert ids(result_set, [], "amount") == [4, 2, 1, 3]
+    assert ids(result_set, [], "amount desc") == [3, 1, 2, 4]
+    assert ids(result_set, [], "name desc, id") == [4, 3, 2, 1]
+    assert ids(result_set, [], "partner_id desc, id desc") == [3, 2, 4, 1]
+    with pytest.raises(ResultSetError, match="Invalid order"):
+        resultsets.select(result_set, [], "amount sideways")
+
+
+def test_rows_rejoin_many2one_pairs(result_set):
+    assert result_set.many2one == {"partner_id"}
+    assert result_set.rows([0, 2], ["partner_id", "tag_ids"]) == [
+        {"partner_id": [7, "Azure Interior"], "tag_ids": [1, 2]},
+        {"partner_id": False, "tag_ids": [2]},
+    ]
+
+
+@pytest.mark.parametrize("granularity, labels", [
+    ("hour", ["2024-01-31 23:00", "2024-02-01 08:00", "2024-04-01 00:00", False]),
+    ("day", ["2024-01-31", "2024-02-01", "2024-04-01", False]),
+    ("week", ["2024-W05", "2024-W14", False]),
+    ("month", ["2024-01", "2024-02", "2024-04", False]),
+    ("quarter", ["2024-Q1", "2024-Q2", False]),
+    ("year", ["2024", False]),
+])
+def test_group_by_date_granularity(result_set, granularity, labels):
+    columns, rows = resultsets.group(result_set, list(range(result_set.count)), [f"date:{granularity}"], [], None)
+    assert columns == [f"date:{granularity}", "count"]
+    assert [row[0] for row in rows] == labels
+    assert sum(row[1] for row in rows) == 4
+
+
+def test_period_uses_iso_weeks_across_the_year_end(result_set):
+    assert resultsets._period("2024-12-30", "week") == "2025-W01"
+    assert resultsets._period("2021-01-03 10:00:00", "week") == "2020-W53"
+    with pytest.raises(ResultSetError, match="Unknown granularity"):
+        resultsets.group(result_set, [0], ["date:decade"], [], None)
+
+
+def test_group_labels_many2one_and_aggregates(result_set):
+    indices = list(range(result_set.count))
+    columns, rows = resultsets.group(result_set, indices, ["partner_id"],
+                                     ["amount:sum", "amount:avg", "amount:count", "tag_ids:bool_or"], None)
+    assert columns == ["partner_id", "count", "amount:sum", "amount:avg", "amount:count", "tag_ids:bool_or"]
+    # Many2one groups sort by display name, the empty group last
+    assert rows == [
+        [[7, "Azure Interior"], 2, 12.5, 6.25, 2, True],
+        [[8, "Deco Addict"], 1, 5.0, 5.0, 1, False],
+        [False, 1, False, False, 0, True],
+    ]
+    _columns, by_total = resultsets.group(result_set, indices, ["partner_id"], ["amount:sum"], "count desc, amount:sum")
+    # Ties on count fall back to the sum, where the empty group's False sorts last
+    assert [row[0] for row in by_total] == [[7, "Azure Interior"], [8, "Deco Addict"], False]
+    with pytest.raises(ResultSetError, match="Cannot order groups"):
+        resultsets.group(result_set, indices, ["partner_id"], [], "amount")
+    with pytest.raises(ResultSetError, match="non-numeric"):
+        resultsets.group(result_set, indices, ["partner_id"], ["name:sum"], None)
+
+
+def _sized(size):
+    result_set = ResultSet("res.partner", [{"id": 1}], "default")
+    result_set.size = size
+    return result_set
+
+
+def test_store_evicts_least_recently_used_sets_within_budget():
+    store = ResultSetStore(budget=100)
+    first, second = store.add(_sized(40)), store.add(_sized(40))
+    store.get(first)
+    third = store.add(_sized(40))
+    assert store.stats() == {"sets": 2, "size_bytes": 80, "budget_bytes": 100, "evictions": 1}
+    assert store.get(first) and store.get(third)
+    with pytest.raises(ResultSetError, match="may have been evicted"):
+        store.get(second)
+    assert store.drop(first) and not store.drop(first)
+    assert store.stats()["size_bytes"] == 40
+
+
+def test_store_refuses_a_set_larger_than_the_budget():
+    store = ResultSetStore(budget=100)
+    kept = store.add(_sized(60))
+    with pytest.raises(ResultSetError, match="exceeds"):
+        store.add(_sized(101))
+    assert store.get(kept) and store.stats()["evictions"] == 0
+
+
+def test_equal_strings_share_one_object():
+    result_set = ResultSet("m", [{"state": "".join(["sa", "le"])} for _ in range(3)], "default")
+    column = result_set.column("state")
+    assert column[0] is column[1] is column[2]
+
+
+def test_stored_search_groups_like_odoo(server, fake_odoo):
+    async def scenario():
+        stored = await server._search_records("sale.order", [], ["partner_id", "amount_total"], 0, store=True)
+        handle = stored["resultset"]["handle"]
+        grouped = await server._query_resultset(handle, groupby=["partner_id"], aggregates=["amount_total:sum"],
+                                                limit=0)
+        dropped = await server._query_resultset(handle, drop=True)
+        return stored, grouped, dropped, await server._query_resultset(handle)
+
+    stored, grouped, dropped, missing = asyncio.run(scenario())
+    assert "records" not in stored and stored["resultset"]["count"] == 50
+    totals = defaultdict(float)
+    for record in fake_odoo.data["sale.order"].values():
+        totals[record["partner_id"]] += record["amount_total"]
+    assert {row[0][0]: round(row[2], 2) for row in grouped["rows"]} == {
+        partner: round(total, 2) for partner, total in totals.items()
+    }
+    assert dropped["message"].startswith("Dropped")
+    assert "may have been evicted" in missing["error"]
@@ -0,0 +1,17 @@
+import asyncio
+
+
+def test_search_cursor_pages_through_every_record(server):
+    async def scenario():
+        everything = await server._search_records("sale.order", [], ["name"], 0, order="id")
+        pages, cursor = [], None
+        while True:
+            page = await server._search_records("sale.order", [], ["name"], 20, order="id", cursor=cursor)
+            pages += [record["id"] for record in page["records"]]
+            cursor = page["next_cursor"]
+            if not cursor:
+                return [record["id"] for record in everything["records"]], pages
+
+    expected, paged = asyncio.run(scenario())
+    assert paged == expected
+    assert len(expected) == 50